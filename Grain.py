@@ -13,10 +13,11 @@ The new class is about the grains
 
 import numpy as np
 import math
-import random
 
 #Own  functions and classes
 import Owntools
+import Owntools.Geometry
+import Owntools.PFtoDEM_Multi
 
 #-------------------------------------------------------------------------------
 #Class
@@ -24,6 +25,11 @@ import Owntools
 
 class Grain:
 
+    #the attributes are fixed, no __dict__ is created for a grain
+    __slots__ = ('id', 'center', 'center_init', 'r_min', 'r_max', 'r_mean', 'l_r', 'l_theta_r', 'l_border', 'l_border_init',
+                 'surface', 'y', 'nu', 'etai_shape', 'etai_window_M', 'etai_window_lc',
+                 'area_sphericity', 'diameter_sphericity', 'circle_ratio_sphericity', 'perimeter_sphericity', 'width_to_length_ratio_sphericity')
+
     #---------------------------------------------------------------------------
 
     def __init__(self,id,radius,center,dict_material,dict_sample):
@@ -38,35 +44,21 @@ class Grain:
                 a sample dictionnary (a dictionnary)
             Output :
                 a grain (a grain)
+                    the vertices of the border are saved in one array l_border (a n+1 x 2 numpy array, the first vertex is repeated at the end)
         '''
         self.id = id
         self.center = center
-        L_r = []
-        L_theta_r = []
-        L_border = []
-        L_border_x = []
-        L_border_y = []
-        for i in range(dict_sample['grain_discretisation']):
-            theta = 2*math.pi*i/dict_sample['grain_discretisation']
-            L_r.append(radius)
-            L_theta_r.append(theta)
-            L_border.append(np.array([center[0]+radius*math.cos(theta),center[1]+radius*math.sin(theta)]))
-            L_border_x.append(center[0]+radius*math.cos(theta))
-            L_border_y.append(center[1]+radius*math.sin(theta))
-        L_border.append(L_border[0])
-        L_border_x.append(L_border_x[0])
-        L_border_y.append(L_border_y[0])
+        L_theta_r = 2*math.pi*np.arange(dict_sample['grain_discretisation'])/dict_sample['grain_discretisation']
+        L_border = np.column_stack((center[0]+radius*np.cos(L_theta_r),center[1]+radius*np.sin(L_theta_r)))
+        L_border = np.concatenate((L_border,L_border[:1]))
         #save description
         self.r_mean = radius
-        self.l_r = L_r
+        self.l_r = np.full(len(L_theta_r),float(radius))
         self.l_theta_r = L_theta_r
         self.l_border = L_border
-        self.l_border_x = L_border_x
-        self.l_border_y = L_border_y
         #save initial
         self.center_init = center.copy()
-        self.l_border_x_init = L_border_x.copy()
-        self.l_border_y_init = L_border_y.copy()
+        self.l_border_init = L_border.copy()
 
         self.y = dict_material['Y']
         self.nu = dict_material['nu']
@@ -75,6 +67,56 @@ class Grain:
 
     #---------------------------------------------------------------------------
 
+    @property
+    def l_border_x(self):
+        '''
+        Give the coordinate x of the grain vertices.
+
+            Input :
+                itself (a grain)
+            Output :
+                the coordinate x of the vertices (a view of l_border, a n+1 numpy array)
+        '''
+        return self.l_border[:,0]
+
+    @property
+    def l_border_y(self):
+        '''
+        Give the coordinate y of the grain vertices.
+
+            Input :
+                itself (a grain)
+            Output :
+                the coordinate y of the vertices (a view of l_border, a n+1 numpy array)
+        '''
+        return self.l_border[:,1]
+
+    @property
+    def l_border_x_init(self):
+        '''
+        Give the initial coordinate x of the grain vertices.
+
+            Input :
+                itself (a grain)
+            Output :
+                the initial coordinate x of the vertices (a view of l_border_init, a n+1 numpy array)
+        '''
+        return self.l_border_init[:,0]
+
+    @property
+    def l_border_y_init(self):
+        '''
+        Give the initial coordinate y of the grain vertices.
+
+            Input :
+                itself (a grain)
+            Output :
+                the initial coordinate y of the vertices (a view of l_border_init, a n+1 numpy array)
+        '''
+        return self.l_border_init[:,1]
+
+    #---------------------------------------------------------------------------
+
     def build_etai_M(self,dict_material,dict_sample):
         '''
         Build the phase field for one grain.
@@ -86,10 +128,10 @@ class Grain:
                 a material dictionnary (a dictionnary)
                 a sample dictionnary (a dictionnary)
             Output :
-                Nothing but the grain gets a new attribute (a n_y x n_x numpy array)
+                Nothing but the grain gets a new phase field (a window, see set_etai_window())
         '''
         #initilization
-        self.etai_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
+        self.etai_shape = (len(dict_sample['y_L']),len(dict_sample['x_L']))
 
         #extract a spatial zone
         x_min = min(self.l_border_x)-dict_material['w']
@@ -111,21 +153,145 @@ class Grain:
         i_y_max = list(y_L_search_max).index(min(y_L_search_max))
 
 
-        for l in range(i_y_min,i_y_max+1):
-            for c in range(i_x_min,i_x_max+1):
-                y = dict_sample['y_L'][-1-l]
-                x = dict_sample['x_L'][c]
-                p = np.array([x,y])
-                r = np.linalg.norm(self.center - p)
-                #look for the radius on this direction
-                if p[1]>self.center[1]:
-                    theta = math.acos((p[0]-self.center[0])/np.linalg.norm(self.center-p))
-                else :
-                    theta= 2*math.pi - math.acos((p[0]-self.center[0])/np.linalg.norm(self.center-p))
-                L_theta_R_i = list(abs(np.array(self.l_theta_r)-theta))
-                R = self.l_r[L_theta_R_i.index(min(L_theta_R_i))]
-                #build etai_M
-                self.etai_M[l][c] = Owntools.Cosine_Profile(R,r,dict_material['w'])
+        #coordinates of the nodes of this part (the line l of etai_M is at y_L[-1-l])
+        x_M, y_M = np.meshgrid(np.array(dict_sample['x_L'])[i_x_min:i_x_max+1], np.array(dict_sample['y_L'])[::-1][i_y_min:i_y_max+1])
+        #polar coordinates
+        r_M = np.hypot(x_M-self.center[0], y_M-self.center[1])
+        theta_M = np.arctan2(y_M-self.center[1], x_M-self.center[0])
+
+        #look for the radius on each direction
+        R_M = self.radius_at_theta(theta_M)
+
+        #build etai_M, only on this part
+        self.set_etai_window(Owntools.Cosine_Profile_M(R_M,r_M,dict_material['w']), (i_y_min, i_x_min))
+
+    #---------------------------------------------------------------------------
+
+    def radius_at_theta(self,theta):
+        '''
+        Compute the radius of the grain in some directions.
+
+        The radius is interpolated linearly (and periodically) in the uniform angle table l_r, l_theta_r = 2*pi*i/n.
+        The cost does not depend on the size of the table.
+
+            Input :
+                itself (a grain)
+                the angles of the directions (a float or a numpy array)
+            Output :
+                the radius of the grain in these directions (a float or a numpy array, same shape)
+        '''
+        n = len(self.l_r)
+        u = np.asarray(theta)/(2*math.pi)*n
+        i_left = np.floor(u)
+        f = u - i_left
+        i_left = i_left.astype(int) % n
+        return (1-f)*self.l_r[i_left] + f*self.l_r[(i_left+1) % n]
+
+    #---------------------------------------------------------------------------
+
+    def set_etai_window(self,window_M,lc_window):
+        '''
+        Save the phase field of the grain on a window of the mesh.
+
+        The phase field is 0 outside the window. The part of the window outside the mesh is removed.
+        The window is reduced to the nodes where the phase field is not 0, plus a margin of one node.
+
+            Input :
+                itself (a grain)
+                the phase field on the window (a numpy array, the line l is at y_L[-1-l-lc_window[0]] as etai_M)
+                the index of the line and of the column of the first node of the window in the mesh (a tuple of int)
+            Output :
+                Nothing but the grain gets updated attributes
+                    etai_window_M : the phase field on the window (a numpy array)
+                    etai_window_lc : the index of the line and of the column of the first node of the window (a tuple of int)
+        '''
+        #remove the part outside the mesh
+        l_min = max(lc_window[0], 0)
+        l_max = max(min(lc_window[0]+window_M.shape[0], self.etai_shape[0]), l_min)
+        c_min = max(lc_window[1], 0)
+        c_max = max(min(lc_window[1]+window_M.shape[1], self.etai_shape[1]), c_min)
+        window_M = window_M[l_min-lc_window[0]:l_max-lc_window[0], c_min-lc_window[1]:c_max-lc_window[1]]
+
+        #look for the nodes not 0
+        L_l = np.flatnonzero(np.any(window_M != 0, axis=1))
+        L_c = np.flatnonzero(np.any(window_M != 0, axis=0))
+        if len(L_l) == 0:
+            self.etai_window_M = np.zeros((0,0))
+            self.etai_window_lc = (0,0)
+            return
+
+        #reduce the window to these nodes plus a margin (in the mesh)
+        l_start = max(l_min+L_l[0]-1, 0)
+        l_end = min(l_min+L_l[-1]+2, self.etai_shape[0])
+        c_start = max(c_min+L_c[0]-1, 0)
+        c_end = min(c_min+L_c[-1]+2, self.etai_shape[1])
+        self.etai_window_M = np.zeros((l_end-l_start, c_end-c_start))
+        self.etai_window_M[l_min+L_l[0]-l_start:l_min+L_l[-1]+1-l_start, c_min+L_c[0]-c_start:c_min+L_c[-1]+1-c_start] = \
+            window_M[L_l[0]:L_l[-1]+1, L_c[0]:L_c[-1]+1]
+        self.etai_window_lc = (l_start, c_start)
+
+    #---------------------------------------------------------------------------
+
+    def etai_box(self):
+        '''
+        Give the window of the phase field in the mesh.
+
+            Input :
+                itself (a grain)
+            Output :
+                the first line, the last line + 1, the first column and the last column + 1 of the window (a tuple of int)
+        '''
+        return (self.etai_window_lc[0], self.etai_window_lc[0]+self.etai_window_M.shape[0],
+                self.etai_window_lc[1], self.etai_window_lc[1]+self.etai_window_M.shape[1])
+
+    #---------------------------------------------------------------------------
+
+    def etai_on_box(self,box):
+        '''
+        Extract the phase field on a part of the window.
+
+            Input :
+                itself (a grain)
+                the first line, the last line + 1, the first column and the last column + 1 of the part (a tuple of int, inside the window)
+            Output :
+                the phase field on the part (a view of the window, a numpy array)
+        '''
+        return self.etai_window_M[box[0]-self.etai_window_lc[0]:box[1]-self.etai_window_lc[0],
+                                  box[2]-self.etai_window_lc[1]:box[3]-self.etai_window_lc[1]]
+
+    #---------------------------------------------------------------------------
+
+    def expand_etai_M(self):
+        '''
+        Expand the phase field of the grain on the mesh.
+
+        A new array of the size of the mesh is built at each call, it must be used only when the full map is needed (write, plot).
+        The phase field must be read with etai_box() and etai_on_box() else.
+
+            Input :
+                itself (a grain)
+            Output :
+                the phase field (a n_y x n_x numpy array, the line l is at y_L[-1-l])
+        '''
+        etai_M = np.zeros(self.etai_shape)
+        l_min, l_max, c_min, c_max = self.etai_box()
+        etai_M[l_min:l_max, c_min:c_max] = self.etai_window_M
+        return etai_M
+
+    #---------------------------------------------------------------------------
+
+    def set_etai_M(self,etai_M):
+        '''
+        Save the phase field of the grain given on the mesh.
+
+            Input :
+                itself (a grain)
+                the phase field (a n_y x n_x numpy array, the line l is at y_L[-1-l])
+            Output :
+                Nothing but the grain gets an updated phase field (a window, see set_etai_window())
+        '''
+        self.etai_shape = np.shape(etai_M)
+        self.set_etai_window(np.array(etai_M, dtype=float), (0,0))
 
     #---------------------------------------------------------------------------
 
@@ -133,12 +299,12 @@ class Grain:
       '''
       Searching limits of the grain
 
-      Not best method but first approach
-      We iterate on y constant, we look for a value under and over 0.5
-      If both conditions are verified, there is a limit at this y
-      Same with iteration on x constant
+      The iso-contour 0.5 of the phase field is extracted with a marching squares algorithm (already ordered and closed).
+      Then, the vertices are distributed uniformly along the perimeter, the number of vertices is grain_discretisation.
 
-      Once the border of the grain is defined, a Monte Carlo method is used to computed some geometrical properties.
+      Once the border of the grain is defined, the surface and the center of mass are computed.
+      The method is defined by method_surface_center : shoelace (exact) or monte_carlo.
+      The radius of the vertices is resampled on a uniform angle table, see radius_at_theta().
 
         Input :
             itself (a grain)
@@ -148,13 +314,11 @@ class Grain:
                 r_min : the minimum radius of the grain (a float)
                 r_max : the maximum radius of the grain (a float)
                 r_mean : the mean radius of the grain (a float)
-                l_r : a list of radius of the grain, work with l_theta_r (a list)
-                l_theta_r : a list of angle to see the distribution of the radius of the grain, work with l_r (a list)
+                l_r : the radius of the grain, work with l_theta_r (a n numpy array)
+                l_theta_r : the uniform angles 2*pi*i/n to see the distribution of the radius of the grain, work with l_r (a n numpy array)
                 surface : the surface of the grain (a float)
                 center : the coordinate of the grain center (a 2 x 1 numpy array)
-                l_border_x : the list of the coordinate x of the grain vertices (a list)
-                l_border_y : the list of the coordinate y of the grain vertices (a list)
-                l_border : the list of the coordinate [x,y] of the grain vertices (a list)
+                l_border : the coordinate [x,y] of the grain vertices (a n+1 x 2 numpy array)
       '''
       #-------------------------------------------------------------------------
       #load data needed
@@ -163,162 +327,74 @@ class Grain:
       y_L = dict_sample['y_L']
       #-------------------------------------------------------------------------
 
-      L_border_old = []
-      for y_i in range(len(y_L)):
-          L_extract_x = self.etai_M[y_i][:]
-          if id == 1:
-              L_extract_x = list(L_extract_x)
-              L_extract_x.reverse()
-          if max(L_extract_x)>0.5 and min(L_extract_x)<0.5:
-              y_intersect = y_L[len(y_L)-1-y_i]
-              for x_i in range(len(x_L)-1):
-                  if (L_extract_x[x_i]-0.5)*(L_extract_x[x_i+1]-0.5)<0:
-                      x_intersect = (0.5-L_extract_x[x_i])/(L_extract_x[x_i+1]-L_extract_x[x_i])*\
-                                  (x_L[x_i+1]-x_L[x_i]) + x_L[x_i]
-                      L_border_old.append(np.array([x_intersect,y_intersect]))
-
-      for x_i in range(len(x_L)):
-          L_extract_y = []
-          for y_i in range(len(y_L)):
-              L_extract_y.append(self.etai_M[y_i][x_i])
-          if max(L_extract_y)>0.5 and min(L_extract_y)<0.5:
-              x_intersect = x_L[x_i]
-              for y_i in range(len(y_L)-1):
-                  if (L_extract_y[y_i]-0.5)*(L_extract_y[y_i+1]-0.5)<0:
-                      y_intersect = (0.5-L_extract_y[y_i])/(L_extract_y[y_i+1]-L_extract_y[y_i])*\
-                                  (y_L[len(y_L)-1-y_i-1]-y_L[len(y_L)-1-y_i]) + y_L[len(y_L)-1-y_i]
-                      L_border_old.append(np.array([x_intersect,y_intersect]))
-
-      #Adaptating
-      L_id_used = [0]
-      L_border = [L_border_old[0]]
-      HighValue = 100000000 #Large
-
-      current_node = L_border_old[0]
-      for j in range(1,len(L_border_old)):
-          L_d = list(np.zeros(len(L_border_old)))
-          for i in range(0,len(L_border_old)):
-              node = L_border_old[i]
-              if  i not in L_id_used:
-                  d = np.linalg.norm(node - current_node)
-                  L_d[i] = d
-              else :
-                  L_d[i] = HighValue #Value need to be larger than potential distance between node
-
-          index_nearest_node = L_d.index(min(L_d))
-          nearest_node = L_border_old[index_nearest_node]
-          current_node = nearest_node
-          L_border.append(nearest_node)
-          L_id_used.append(index_nearest_node)
-
-      #Correcting
-      L_d_final = []
-      for i in range(len(L_border)-1):
-          L_d_final.append(np.linalg.norm(L_border[i+1] - L_border[i]))
-
-      #look for really far points, we assume the first point is accurate
-      d_final_mean = np.mean(L_d_final)
-      while np.max(L_d_final) > 5 * d_final_mean : #5 here is an user choixe value
-          i_error = L_d_final.index(np.max(L_d_final))+1
-          simulation_report.write('Point '+str(L_border[i_error])+' is deleted because it is detected as an error\n')
-          L_border.pop(i_error)
-          L_id_used.pop(i_error)
-          L_d_final = []
-          for i in range(len(L_border)-1):
-              L_d_final.append(np.linalg.norm(L_border[i+1] - L_border[i]))
+      #extract the iso-contour 0.5 with a marching squares algorithm, only on the window of the phase field
+      l_min, l_max, c_min, c_max = self.etai_box()
+      L_contour = []
+      if min(self.etai_window_M.shape) >= 2:
+          L_contour = Owntools.Geometry.Marching_Squares(self.etai_window_M, x_L[c_min:c_max], y_L[len(y_L)-l_max:len(y_L)-l_min], 0.5)
+      #no contour if the grain is dissolved (or if its window is empty), the geometry can not be computed
+      if len(L_contour) == 0:
+          raise ValueError('Grain '+str(self.id)+' : no iso-contour 0.5 of the phase field, the grain is dissolved or out of the mesh!')
+      #the grain is the longest contour, the others are noise
+      L_border = L_contour[np.argmax([len(contour) for contour in L_contour])]
+      if not np.array_equal(L_border[0], L_border[-1]):
+          L_border = np.concatenate((L_border, L_border[:1]))
 
       #-------------------------------------------------------------------------------
       #Reduce the number of nodes for a grain
       #-------------------------------------------------------------------------------
 
-      Perimeter = 0
-      for i_p in range(len(L_border)-1):
-          Perimeter = Perimeter + np.linalg.norm(L_border[i_p+1]-L_border[i_p])
-      Perimeter = Perimeter + np.linalg.norm(L_border[-1]-L_border[0])
-      distance_min = Perimeter/n
-      L_border_adapted = [L_border[0]]
-      for p in L_border[1:]:
-          distance = np.linalg.norm(p-L_border_adapted[-1])
-          if distance >= distance_min:
-              L_border_adapted.append(p)
-      L_border = L_border_adapted
-      L_border.append(L_border[0])
+      L_border = Owntools.Geometry.Resample_Polygon(L_border, n)
       self.l_border = L_border
 
       #-------------------------------------------------------------------------------
       #Searching Surface, Center of mass and Inertia.
-      #Monte Carlo Method
-      #A box is defined, we take a random point and we look if it is inside or outside the grain
-      #Properties are the statistic times the box properties
+      #shoelace : exact formula for the polygon
+      #monte_carlo : a box is defined, we take a random point and we look if it is inside or outside the grain
+      #              Properties are the statistic times the box properties
       #-------------------------------------------------------------------------------
 
-      min_max_defined = False
-      for p in L_border[:-1] :
-          if not min_max_defined:
-              box_min_x = p[0]
-              box_max_x = p[0]
-              box_min_y = p[1]
-              box_max_y = p[1]
-              min_max_defined = True
-          else:
-              if p[0] < box_min_x:
-                  box_min_x = p[0]
-              elif p[0] > box_max_x:
-                  box_max_x = p[0]
-              if p[1] < box_min_y:
-                  box_min_y = p[1]
-              elif p[1] > box_max_y:
-                  box_max_y = p[1]
-
-      N_MonteCarlo = 3000 #The larger it is, the more accurate it is
       sigma = 1
-      M_Mass = 0
-      M_Center_Mass = np.array([0,0])
+      if dict_sample['method_surface_center'] == 'shoelace':
+          Mass, Center_Mass = Owntools.Geometry.Polygon_Area_Center(L_border)
+          Mass = sigma*Mass
+
+      elif dict_sample['method_surface_center'] == 'monte_carlo':
+          box_min_x, box_min_y = np.min(L_border, axis = 0)
+          box_max_x, box_max_y = np.max(L_border, axis = 0)
 
-      for i in range(N_MonteCarlo):
-          P = np.array([random.uniform(box_min_x,box_max_x),random.uniform(box_min_y,box_max_y)])
-          if self.P_is_inside(P):
-              M_Mass = M_Mass + sigma
-              M_Center_Mass = M_Center_Mass + sigma*P
+          N_MonteCarlo = 3000 #The larger it is, the more accurate it is
+          L_P = np.column_stack((np.random.uniform(box_min_x,box_max_x,N_MonteCarlo),np.random.uniform(box_min_y,box_max_y,N_MonteCarlo)))
+          L_P_inside = L_P[self.P_is_inside_many(L_P)]
+          M_Mass = sigma*len(L_P_inside)
+          M_Center_Mass = sigma*np.sum(L_P_inside, axis = 0)
 
-      Mass = (box_max_x-box_min_x)*(box_max_y-box_min_y)/N_MonteCarlo*M_Mass
-      Center_Mass = (box_max_x-box_min_x)*(box_max_y-box_min_y)/N_MonteCarlo*M_Center_Mass/Mass
+          Mass = (box_max_x-box_min_x)*(box_max_y-box_min_y)/N_MonteCarlo*M_Mass
+          Center_Mass = (box_max_x-box_min_x)*(box_max_y-box_min_y)/N_MonteCarlo*M_Center_Mass/Mass
 
       #-------------------------------------------------------------------------------
       #Updating the grain geometry and properties
       #-------------------------------------------------------------------------------
 
-      L_R = []
-      L_theta_R = []
-      L_border_x = []
-      L_border_y = []
-      for p in L_border[:-1]:
-          L_R.append(np.linalg.norm(p-Center_Mass))
-          L_border_x.append(p[0])
-          L_border_y.append(p[1])
-          if (p-Center_Mass)[1] > 0:
-              theta = math.acos((p-Center_Mass)[0]/np.linalg.norm(p-Center_Mass))
-          else :
-              theta = 2*math.pi - math.acos((p-Center_Mass)[0]/np.linalg.norm(p-Center_Mass))
-          L_theta_R.append(theta)
-      L_border_x.append(L_border_x[0])
-      L_border_y.append(L_border_y[0])
-      #reorganize lists
-      L_R.reverse()
-      L_theta_R.reverse()
-      i_min_theta = L_theta_R.index(min(L_theta_R))
-      L_R = L_R[i_min_theta:]+L_R[:i_min_theta]
-      L_theta_R = L_theta_R[i_min_theta:]+L_theta_R[:i_min_theta]
+      L_u = L_border[:-1]-Center_Mass
+      L_R = np.linalg.norm(L_u, axis = 1)
+      L_theta_R = np.arccos(L_u[:,0]/L_R)
+      L_theta_R = np.where(L_u[:,1] > 0, L_theta_R, 2*math.pi - L_theta_R)
+      #reorganize lists by increasing angle
+      L_i_sorted = np.argsort(L_theta_R)
+      L_R = L_R[L_i_sorted]
+      L_theta_R = L_theta_R[L_i_sorted]
+      #resample the radius on a uniform angle table (periodic linear interpolation)
+      L_theta_table = 2*math.pi*np.arange(n)/n
+      L_R_table = np.interp(L_theta_table, L_theta_R, L_R, period = 2*math.pi)
 
       self.r_min = np.min(L_R)
       self.r_max = np.max(L_R)
       self.r_mean = np.mean(L_R)
-      self.l_r = L_R
-      self.l_theta_r = L_theta_R
+      self.l_r = L_R_table
+      self.l_theta_r = L_theta_table
       self.surface = Mass/sigma
       self.center = Center_Mass
-      self.l_border_x = L_border_x
-      self.l_border_y = L_border_y
 
     #-------------------------------------------------------------------------------
 
@@ -348,6 +424,21 @@ class Grain:
 
     #-------------------------------------------------------------------------------
 
+    def P_is_inside_many(self,L_P):
+      '''Determine if several points are inside of a grain
+
+      This is the vectorized version of P_is_inside(), all the points are treated together.
+
+          Input :
+              itself (a grain)
+              the points (a N x 2 numpy array)
+          Output :
+              True or False, depending on the fact that each point is inside the grain or not (a N numpy array of bool)
+      '''
+      return Owntools.Geometry.Points_Inside_Polygon(L_P, self.l_border)
+
+    #-------------------------------------------------------------------------------
+
     def Compute_sphericity(self, dict_algorithm):
       '''Compute sphericity of the particle with five parameters.
 
@@ -360,80 +451,18 @@ class Grain:
           Output :
               Nothing, but the grain gets updated attributes (five floats)
       '''
-      #Find the minimum circumscribing circle
-      #look for the two farthest and nearest points
-      MaxDistance = 0
-      for i_p in range(0,len(self.l_border)-2):
-          for j_p in range(i_p+1,len(self.l_border)-1):
-              Distance = np.linalg.norm(self.l_border[i_p]-self.l_border[j_p])
-              if Distance > MaxDistance :
-                  ij_farthest = (i_p,j_p)
-                  MaxDistance = Distance
-
-      #Trial circle
-      center_circumscribing = (self.l_border[ij_farthest[0]]+self.l_border[ij_farthest[1]])/2
-      radius_circumscribing = MaxDistance/2
-      Circumscribing_Found = True
-      Max_outside_distance = radius_circumscribing
-      for i_p in range(len(self.l_border)-1):
-          #there is a margin here because of the numerical approximation
-          if np.linalg.norm(self.l_border[i_p]-center_circumscribing) > (1+dict_algorithm['sphericity_margin'])*radius_circumscribing and i_p not in ij_farthest: #vertex outside the trial circle
-            Circumscribing_Found = False
-            if np.linalg.norm(self.l_border[i_p]-center_circumscribing) > Max_outside_distance:
-                k_outside_farthest = i_p
-                Max_outside_distance = np.linalg.norm(self.l_border[i_p]-center_circumscribing)
-      #The trial guess does not work
-      if not Circumscribing_Found:
-          L_ijk_circumscribing = [ij_farthest[0],ij_farthest[1],k_outside_farthest]
-          center_circumscribing, radius_circumscribing = FindCircleFromThreePoints(self.l_border[L_ijk_circumscribing[0]],self.l_border[L_ijk_circumscribing[1]],self.l_border[L_ijk_circumscribing[2]])
-          Circumscribing_Found = True
-          for i_p in range(len(self.l_border)-1):
-              #there is 1% margin here because of the numerical approximation
-              if np.linalg.norm(self.l_border[i_p]-center_circumscribing) > (1+dict_algorithm['sphericity_margin'])*radius_circumscribing and i_p not in L_ijk_circumscribing: #vertex outside the circle computed
-                Circumscribing_Found = False
-          #see article for other case
-          if not Circumscribing_Found:
-              raise ValueError('This algorithm is not developped for this case...')
-
-      #look for length and width
-      length = MaxDistance
-      u_maxDistance = (self.l_border[ij_farthest[0]]-self.l_border[ij_farthest[1]])/np.linalg.norm(self.l_border[ij_farthest[0]]-self.l_border[ij_farthest[1]])
-      v_maxDistance = np.array([u_maxDistance[1], -u_maxDistance[0]])
-      MaxWidth = 0
-      for i_p in range(0,len(self.l_border)-2):
-        for j_p in range(i_p+1,len(self.l_border)-1):
-            Distance = abs(np.dot(self.l_border[i_p]-self.l_border[j_p],v_maxDistance))
-            if Distance > MaxWidth :
-                ij_width = (i_p,j_p)
-                MaxWidth = Distance
-      width = MaxWidth
-
-      #look for maximum inscribed circle
-      #discretisation of the grain
-      l_x_inscribing = np.linspace(min(self.l_border_x),max(self.l_border_x),dict_algorithm['n_spatial_inscribing'])
-      l_y_inscribing = np.linspace(min(self.l_border_y),max(self.l_border_y),dict_algorithm['n_spatial_inscribing'])
-      #creation of an Euclidean distance map to the nearest boundary vertex
-      map_inscribing = np.zeros((dict_algorithm['n_spatial_inscribing'],dict_algorithm['n_spatial_inscribing']))
-      #compute the map
-      for i_x in range(dict_algorithm['n_spatial_inscribing']):
-          for i_y in range(dict_algorithm['n_spatial_inscribing']):
-              p = np.array([l_x_inscribing[i_x], l_y_inscribing[-1-i_y]])
-              #work only if the point is inside the grain
-              if self.P_is_inside(p):
-                  #look for the nearest vertex
-                  MinDistance = None
-                  for q in self.l_border[:-1]:
-                      Distance = np.linalg.norm(p-q)
-                      if MinDistance == None or Distance < MinDistance:
-                          MinDistance = Distance
-                  map_inscribing[-1-i_y][i_x] = MinDistance
-              else :
-                  map_inscribing[-1-i_y][i_x] = 0
-      #look for the peak of the map
-      index_max = np.argmax(map_inscribing)
-      l = index_max//dict_algorithm['n_spatial_inscribing']
-      c = index_max%dict_algorithm['n_spatial_inscribing']
-      radius_inscribing = map_inscribing[l][c]
+      #convex hull of the grain, the circumscribing circle, the length and the width depend only on it
+      L_hull = Owntools.Geometry.Convex_Hull(self.l_border[:-1])
+
+      #Find the minimum circumscribing circle (Welzl algorithm)
+      center_circumscribing, radius_circumscribing = Owntools.Geometry.Minimum_Enclosing_Circle(L_hull)
+
+      #look for length and width with the rotating calipers
+      #the length is the diameter of the hull and the width is its minimum width
+      length, ij_farthest, width = Owntools.Geometry.Rotating_Calipers(L_hull)
+
+      #look for maximum inscribed circle, from a distance transform refined near the best node
+      radius_inscribing = Owntools.Geometry.Maximum_Inscribed_Circle(self.l_border, dict_algorithm['n_spatial_inscribing'])[1]
 
       #Area Sphericity
       SurfaceParticle = self.surface
@@ -454,9 +483,7 @@ class Grain:
 
       #Perimeter Sphericity
       PerimeterSameAreaParticle = 2*math.sqrt(self.surface*math.pi)
-      PerimeterParticle = 0
-      for i in range(len(self.l_border)-1):
-          PerimeterParticle = PerimeterParticle + np.linalg.norm(self.l_border[i+1]-self.l_border[i])
+      PerimeterParticle = np.sum(np.linalg.norm(np.diff(self.l_border, axis = 0), axis = 1))
       PerimeterSphericity = PerimeterSameAreaParticle / PerimeterParticle
       self.perimeter_sphericity = PerimeterSphericity
 
@@ -466,94 +493,18 @@ class Grain:
 
     #---------------------------------------------------------------------------
 
-    def PFtoDEM_Multi(self,FileToRead,dict_algorithm,dict_sample):
+    def PFtoDEM_Multi(self,dict_data,dict_sample):
         '''
-        Read file from MOOSE simulation to reconstruct the phase field of the grain.
+        Reconstruct the phase field of the grain from the data of MOOSE simulation.
 
             Input :
                 itself (a grain)
-                the name of the file to read (a string)
-                an algorithm dictionnary (a dictionnary)
+                the data read by Owntools.PFtoDEM_Multi.Read_vtu_Multi(), with the field etai (a dictionnary)
                 a sample dictionnary (a dictionnary)
             Output :
-                Nothing but the grain gets an updated attribute (a n_y x n_x numpy array)
+                Nothing but the grain gets an updated phase field (a window, see set_etai_window())
         '''
-        #--------------------------------------------------------------------------
-        #Global parameters
-        #---------------------------------------------------------------------------
-
-        self.etai_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
-
-        id_L = None
-        eta_selector_len = len('        <DataArray type="Float64" Name="etai')
-        end_len = len('        </DataArray>')
-        XYZ_selector_len = len('        <DataArray type="Float64" Name="Points"')
-        data_jump_len = len('          ')
-
-        for i_proc in range(dict_algorithm['np_proc']):
-
-            L_Work = [[], #X
-                      [], #Y
-                      []] #etai
-
-        #---------------------------------------------------------------------------
-        #Reading file
-        #---------------------------------------------------------------------------
-
-            f = open(f'{FileToRead}_{i_proc}.vtu','r')
-            data = f.read()
-            f.close
-            lines = data.splitlines()
-
-            #iterations on line
-            for line in lines:
-
-                if line[0:eta_selector_len] == '        <DataArray type="Float64" Name="eta'+str(self.id):
-                    id_L = 2
-
-                elif line[0:XYZ_selector_len] == '        <DataArray type="Float64" Name="Points"':
-                    id_L = 0
-
-                elif (line[0:end_len] == '        </DataArray>' or  line[0:len('          <InformationKey')] == '          <InformationKey') and id_L != None:
-                    id_L = None
-
-                elif line[0:data_jump_len] == '          ' and id_L == 2: #Read etai
-                    line = line[data_jump_len:]
-                    c_start = 0
-                    for c_i in range(0,len(line)):
-                        if line[c_i]==' ':
-                            c_end = c_i
-                            L_Work[id_L].append(float(line[c_start:c_end]))
-                            c_start = c_i+1
-                    L_Work[id_L].append(float(line[c_start:]))
-
-                elif line[0:data_jump_len] == '          ' and id_L == 0: #Read [X, Y, Z]
-                    line = line[data_jump_len:]
-                    XYZ_temp = []
-                    c_start = 0
-                    for c_i in range(0,len(line)):
-                        if line[c_i]==' ':
-                            c_end = c_i
-                            XYZ_temp.append(float(line[c_start:c_end]))
-                            if len(XYZ_temp)==3:
-                                L_Work[0].append(XYZ_temp[0])
-                                L_Work[1].append(XYZ_temp[1])
-                                XYZ_temp = []
-                            c_start = c_i+1
-                    XYZ_temp.append(float(line[c_start:]))
-                    L_Work[0].append(XYZ_temp[0])
-                    L_Work[1].append(XYZ_temp[1])
-
-            #Adaptating data and update of etai_M
-            for i in range(len(L_Work[0])):
-                #Interpolation method
-                L_dy = []
-                for y_i in dict_sample['y_L'] :
-                    L_dy.append(abs(y_i - L_Work[1][i]))
-                L_dx = []
-                for x_i in dict_sample['x_L'] :
-                    L_dx.append(abs(x_i - L_Work[0][i]))
-                self.etai_M[-1-list(L_dy).index(min(L_dy))][list(L_dx).index(min(L_dx))] = L_Work[2][i]
+        self.set_etai_M(Owntools.PFtoDEM_Multi.Field_on_mesh(dict_data,'eta'+str(self.id),dict_sample))
 
     #---------------------------------------------------------------------------
 
@@ -573,10 +524,7 @@ class Grain:
                 Nothing but the grain gets an updated attribute (a n_y x n_x numpy array)
         '''
         self.center = self.center + displacement
-        for i in range(len(self.l_border)):
-            self.l_border[i] = self.l_border[i] + displacement
-            self.l_border_x[i] = self.l_border_x[i] + displacement[0]
-            self.l_border_y[i] = self.l_border_y[i] + displacement[1]
+        self.l_border += displacement
         self.build_etai_M(dict_material,dict_sample)
 
     #---------------------------------------------------------------------------
@@ -586,51 +534,62 @@ class Grain:
         Move the grain by updating the phase field of the grain.
 
         An interpolation on the phase field is done. The mass conservation is better than with move_grain_rebuild().
+        The window is translated in place along x and y by the remainders with Owntools.Shift_Field(), the integer parts move the window in the mesh.
+        The only work array is the buffer of Owntools.Get_buffer(), it has the size of the window and is not saved with the sample.
+        The remainder goes to the next node, the window must end with two nodes equal to 0 along each axis moved (to keep its margin).
+        Else, the window is enlarged once with some nodes in advance, the next moves are done in place.
 
             Input :
                 itself (a grain)
                 the displacement asked (a 2 x 1 numpy array)
                 a sample dictionnary (a dictionnary)
             Output :
-                Nothing but the grain gets an updated attribute (a n_y x n_x numpy array)
+                Nothing but the grain gets an updated phase field (a window, see set_etai_window())
         '''
         self.center = self.center + displacement
-        for i in range(len(self.l_border)):
-            self.l_border[i] = self.l_border[i] + displacement
-            self.l_border_x[i] = self.l_border_x[i] + displacement[0]
-            self.l_border_y[i] = self.l_border_y[i] + displacement[1]
+        self.l_border += displacement
+        if self.etai_window_M.size == 0:
+            return
 
-        #displacement over x
+        #the shifts in number of nodes (the columns go in the +x direction, the lines go in the -y direction)
         dx = dict_sample['x_L'][1]-dict_sample['x_L'][0]
-        n_dx_disp_x = int(abs(displacement[0])//dx)
-        disp_x_remainder = abs(displacement[0])%dx
-        etai_M_old = self.etai_M.copy()
-
-        if np.sign(displacement[0]) > 0 : # +x direction
-            #dx*n_dx_disp_x translation
-            if n_dx_disp_x > 0:
-                for l in range(len(dict_sample['y_L'])):
-                    self.etai_M[l][:n_dx_disp_x] = 0 #no information to translate so put equal to 0
-                    self.etai_M[l][n_dx_disp_x:] = etai_M_old[l][:-n_dx_disp_x]
-            #disp_x_remainder translation
-            etai_M_old = self.etai_M.copy()
-            for l in range(len(dict_sample['y_L'])):
-                for c in range(1,len(dict_sample['x_L'])):
-                    self.etai_M[l][c] = (etai_M_old[l][c]*(dx-disp_x_remainder) + etai_M_old[l][c-1]*disp_x_remainder)/dx
-                self.etai_M[l][0] = 0 #no information to translate so put equal to 0
-
-        else : # -x direction
-            #dx*n_dx_disp_x translation
-            if n_dx_disp_x > 0:
-                for l in range(len(dict_sample['y_L'])):
-                    self.etai_M[l][-n_dx_disp_x:] = 0 #no information to translate so put equal to 0
-                    self.etai_M[l][:-n_dx_disp_x] = etai_M_old[l][n_dx_disp_x:]
-            #disp_x_remainder translation
-            etai_M_old = self.etai_M.copy()
-            for l in range(len(dict_sample['y_L'])):
-                for c in range(len(dict_sample['x_L'])-1):
-                    self.etai_M[l][c] = (etai_M_old[l][c]*(dx-disp_x_remainder) + etai_M_old[l][c+1]*disp_x_remainder)/dx
-                self.etai_M[l][0] = 0 #no information to translate so put equal to 0
+        dy = dict_sample['y_L'][1]-dict_sample['y_L'][0]
+        L_shift = [-displacement[1]/dy, displacement[0]/dx]
+        L_n_shift = [math.floor(shift) for shift in L_shift]
+
+        #enlarge the window if the last nodes are not 0 (a quarter of the window is added, in the mesh)
+        L_grow = [0, 0]
+        for axis in [0, 1]:
+            n = self.etai_window_M.shape[axis]
+            L_last = self.etai_window_M[n-2:] if axis == 0 else self.etai_window_M[:,n-2:]
+            if L_shift[axis] != L_n_shift[axis] and L_last.any():
+                L_grow[axis] = min(max(n//4, 2), self.etai_shape[axis]-self.etai_window_lc[axis]-n)
+        if L_grow != [0, 0]:
+            n_l, n_c = self.etai_window_M.shape
+            window_M = np.zeros((n_l+L_grow[0], n_c+L_grow[1]))
+            window_M[:n_l,:n_c] = self.etai_window_M
+            self.etai_window_M = window_M
+
+        #translate the window by the remainders, in place
+        window_M = self.etai_window_M
+        buffer_M = Owntools.Get_buffer('shift_etai_window_M', window_M.shape)
+        for axis in [1, 0]:
+            if L_shift[axis] != L_n_shift[axis]:
+                Owntools.Shift_Field(window_M, L_shift[axis]-L_n_shift[axis], axis, buffer_M)
+
+        #move the window by the integer parts, the part outside the mesh is removed (a view of the window)
+        l_start = self.etai_window_lc[0]+L_n_shift[0]
+        c_start = self.etai_window_lc[1]+L_n_shift[1]
+        l_min = max(l_start, 0)
+        l_max = min(l_start+window_M.shape[0], self.etai_shape[0])
+        c_min = max(c_start, 0)
+        c_max = min(c_start+window_M.shape[1], self.etai_shape[1])
+        if l_max <= l_min or c_max <= c_min:
+            self.etai_window_M = np.zeros((0,0))
+            self.etai_window_lc = (0,0)
+            return
+        self.etai_window_M = window_M[l_min-l_start:l_max-l_start, c_min-c_start:c_max-c_start]
+        self.etai_window_lc = (l_min, c_min)
 
 #-------------------------------------------------------------------------------
 #Functions
@@ -683,104 +642,3 @@ def Apply_overlap_target(dict_material,dict_sample,dict_sollicitation,dict_track
     #move grains to apply target overlap
     dict_sample['L_g'][0].move_grain_interpolation(np.array([ delta_overlap/2,0]),dict_sample)
     dict_sample['L_g'][1].move_grain_interpolation(np.array([-delta_overlap/2,0]),dict_sample)
-
-#-------------------------------------------------------------------------------
-
-def FindCircleFromThreePoints(P1,P2,P3):
-    '''
-    Compute the circumscribing circle of a triangle defined by three points.
-
-    https://www.geeksforgeeks.org/program-find-circumcenter-triangle-2/
-
-        Input :
-            three points (a 2 x 1 numpy array)
-        Output :
-            a center (a 2 x 1 numpy array)
-            a radius (a float)
-    '''
-    # Line P1P2 is represented as ax + by = c and line P2P3 is represented as ex + fy = g
-    a, b, c = lineFromPoints(P1, P2)
-    e, f, g = lineFromPoints(P2, P3)
-
-    # Converting lines P1P2 and P2P3 to perpendicular bisectors.
-    #After this, L : ax + by = c and M : ex + fy = g
-    a, b, c = perpendicularBisectorFromLine(P1, P2, a, b, c)
-    e, f, g = perpendicularBisectorFromLine(P2, P3, e, f, g)
-
-    # The point of intersection of L and M gives the circumcenter
-    circumcenter = lineLineIntersection(a, b, c, e, f, g)
-
-    if np.linalg.norm(circumcenter - np.array([10**9,10**9])) == 0:
-        raise ValueError('The given points do not form a triangle and are collinear...')
-    else :
-        #compute the radius
-        radius = max([np.linalg.norm(P1-circumcenter), np.linalg.norm(P2-circumcenter), np.linalg.norm(P3-circumcenter)])
-
-    return circumcenter, radius
-
-#-------------------------------------------------------------------------------
-
-def lineFromPoints(P, Q):
-    '''
-    Function to find the line given two points
-
-    Used in FindCircleFromThreePoints().
-    The equation is c = ax + by.
-    https://www.geeksforgeeks.org/program-find-circumcenter-triangle-2/
-
-        Input :
-            two points (a 2 x 1 numpy array)
-        Output :
-            three characteristic of the line (three floats)
-    '''
-    a = Q[1] - P[1]
-    b = P[0] - Q[0]
-    c = a * (P[0]) + b * (P[1])
-    return a, b, c
-
-#-------------------------------------------------------------------------------
-
-def perpendicularBisectorFromLine(P, Q, a, b, c):
-    '''
-    Function which converts the input line to its perpendicular bisector.
-
-    Used in FindCircleFromThreePoints().
-    The equation is c = ax + by.
-    https://www.geeksforgeeks.org/program-find-circumcenter-triangle-2/
-
-        Input :
-            two points (a 2 x 1 numpy array)
-            three characteristic of the line (three floats)
-        Output :
-            three characteristic of the perpendicular bisector (three floats)
-    '''
-    mid_point = [(P[0] + Q[0])//2, (P[1] + Q[1])//2]
-    # c = -bx + ay
-    c = -b * (mid_point[0]) + a * (mid_point[1])
-    temp = a
-    a = -b
-    b = temp
-    return a, b, c
-
-#-------------------------------------------------------------------------------
-
-def lineLineIntersection(a1, b1, c1, a2, b2, c2):
-    '''
-    Returns the intersection point of two lines.
-
-    Used in FindCircleFromThreePoints().
-    https://www.geeksforgeeks.org/program-find-circumcenter-triangle-2/
-
-        Input :
-            six characteristics of the line 1 and 2 (six floats)
-        Output :
-            the intersection point (a 2 x 1 numpy array)
-    '''
-    determinant = a1 * b2 - a2 * b1
-    if (determinant == 0):
-        # The lines are parallel.
-        return np.array([10**9,10**9])
-    else:
-        x = (b2 * c1 - b1 * c2)//determinant
-        y = (a1 * c2 - a2 * c1)//determinant
-        return np.array([x, y])
@@ -11,67 +11,67 @@ This file contains the different functions used to compute parameters or variabl
 #-------------------------------------------------------------------------------
 
 import numpy as np
-import math
-import random
-from scipy.ndimage import binary_dilation
+from scipy.ndimage import binary_dilation, maximum_filter1d
+
+import Owntools.Geometry
+
+#state of the incremental update of the solute diffusion coefficient map (see Compute_kc_dil()), it is not saved with the sample
+dict_kc_dil = {}
 
 #-------------------------------------------------------------------------------
 
 def Compute_S_int(dict_sample):
     '''
-    Searching Surface,
-    Monte Carlo Method
-    A box is defined, we take a random point and we look if it is inside or outside the grain
-    Properties are the statistic times the box properties
+    Compute the intersection surface between the two grains.
 
+    The border of the first grain is clipped by the convex hull of the border of the second grain (see Owntools.Geometry.Polygon_Intersection()).
+    The surface of the intersection polygon is computed with the shoelace formula, it is exact if the second grain is convex.
 
         Input :
             a sample dictionnary (a dict)
         Output :
-            Nothing but the dictionnary gets an updated value for the intersection surface (a float)
+            Nothing but the dictionnary gets an updated value for the intersection surface (a float) and for the intersection polygon (a m x 2 numpy array, closed, empty if the grains are not in contact)
     '''
-    #Defining the limit
-    box_min_x = min(dict_sample['L_g'][1].l_border_x)
-    box_max_x = max(dict_sample['L_g'][0].l_border_x)
-    box_min_y = min(dict_sample['L_g'][0].l_border_y)
-    box_max_y = max(dict_sample['L_g'][0].l_border_y)
-
-    #Compute the intersection surface
-    N_MonteCarlo = 5000 #The larger it is, the more accurate it is
-    sigma = 1
-    M_Mass = 0
-
-    for i in range(N_MonteCarlo):
-        P = np.array([random.uniform(box_min_x,box_max_x),random.uniform(box_min_y,box_max_y)])
-        if dict_sample['L_g'][0].P_is_inside(P) and dict_sample['L_g'][1].P_is_inside(P):
-            M_Mass = M_Mass + sigma
-
-    Mass = (box_max_x-box_min_x)*(box_max_y-box_min_y)/N_MonteCarlo*M_Mass
-    Surface = Mass/sigma
+    #clip the first grain by the second one
+    L_hull = Owntools.Geometry.Convex_Hull(dict_sample['L_g'][1].l_border[:-1])
+    L_P_int = Owntools.Geometry.Polygon_Intersection(dict_sample['L_g'][0].l_border, L_hull)
+    Surface = 0
+    if len(L_P_int) > 0:
+        Surface = Owntools.Geometry.Polygon_Area_Center(L_P_int)[0]
 
     #Update element in dictionnary
     dict_sample['S_int'] = Surface
+    dict_sample['L_P_int'] = L_P_int
 
 #-------------------------------------------------------------------------------
 
-def Compute_sum_min_etai(dict_sample, dict_sollicitation):
+def Compute_sum_min_etai_Emec(dict_sample, dict_sollicitation):
     '''
-    Compute the sum over the sample of the minimum of etai.
+    Compute the sum over the sample of the minimum of etai and the mechanical energy field in one pass.
 
-    This variable is used for Compute_Emec().
+    The minimum of etai is computed once, directly in the mechanical energy map, then summed and scaled in place.
 
         Input :
             a sample dictionnary (a dict)
+            a sollicitation dictionnary (a dict)
         Output :
-            Nothing but the dictionnary gets an updated value (a float)
+            Nothing but the dictionnary gets an updated value for the sum (a float) and for the mechanical energy map (a nx x ny numpy array, updated in place)
             If it is the first call of the function, dictionnaries gets new value (2 floats)
     '''
-    #Initialisation
+    #the map is reused if it has the size of the mesh
+    shape = (len(dict_sample['y_L']),len(dict_sample['x_L']))
+    if 'Emec_M' not in dict_sample.keys() or dict_sample['Emec_M'].shape != shape:
+        dict_sample['Emec_M'] = np.zeros(shape)
+    Emec_M = dict_sample['Emec_M']
+    Emec_M.fill(0)
+
+    #the minimum is not 0 only on the intersection of the windows of the phase fields
+    box = Box_intersection(dict_sample['L_g'][0].etai_box(),dict_sample['L_g'][1].etai_box())
     sum_min_etai = 0
-    #compute the sum over the sample of the minimum of etai
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-            sum_min_etai = sum_min_etai + min(dict_sample['L_g'][0].etai_M[-1-l][c],dict_sample['L_g'][1].etai_M[-1-l][c])
+    if box != None:
+        Emec_box_M = Emec_M[box[0]:box[1],box[2]:box[3]]
+        np.minimum(dict_sample['L_g'][0].etai_on_box(box),dict_sample['L_g'][1].etai_on_box(box),out=Emec_box_M)
+        sum_min_etai = np.sum(Emec_box_M)
 
     #Update element in dictionnary
     dict_sample['sum_min_etai'] = sum_min_etai
@@ -80,28 +80,9 @@ def Compute_sum_min_etai(dict_sample, dict_sollicitation):
         dict_sample['sum_min_etai0'] = sum_min_etai
         dict_sollicitation['alpha'] = 0.2*sum_min_etai
 
-#-------------------------------------------------------------------------------
-
-def Compute_Emec(dict_sample, dict_sollicitation):
-    '''
-    Compute the mechanical energy field in the sample.
-
-        Input :
-            a sample dictionnary (a dict)
-        Output :
-            Nothing but the dictionnary gets an updated value for the mechanical energy map (a nx x ny numpy array)
-    '''
-    #Initialisation
-    Emec_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
-    #compute the variable e_mec
-    e_mec = dict_sollicitation['alpha']/dict_sample['sum_min_etai']
-    #compute the distribution of the mechanical energy
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-            Emec_M[-1-l][c] = e_mec*min(dict_sample['L_g'][0].etai_M[-1-l][c],dict_sample['L_g'][1].etai_M[-1-l][c])
-
-    #Update element in dictionnary
-    dict_sample['Emec_M'] = Emec_M
+    #compute the variable e_mec and the distribution of the mechanical energy
+    if sum_min_etai > 0:
+        Emec_box_M *= dict_sollicitation['alpha']/sum_min_etai
 
 #-------------------------------------------------------------------------------
 
@@ -118,6 +99,11 @@ def Compute_kc_dil(dict_algorithm, dict_material, dict_sample):
 
     The diffusion map is built on the Boolean map. If the variable is True, the diffusion is kc, else 0.
 
+    The Boolean map is kept in the module (dict_kc_dil, not saved with the sample) with a reference to the diffusion map of the sample.
+    At the next call with the same diffusion map (else, after a reload of the sample for example, the whole map is computed),
+    the Boolean map is computed only on the windows of the phase fields (True outside),
+    and the diffusion map is updated only on the box where the Boolean map changes, enlarged by the size of the structural element.
+
         Input :
             an algorithm dictionnary (a dict)
             a material dictionnary (a dict)
@@ -125,32 +111,47 @@ def Compute_kc_dil(dict_algorithm, dict_material, dict_sample):
         Output :
             Nothing but the dictionnary gets an updated value for the solute diffusion coefficient map (a nx x ny numpy array)
     '''
-    #Initialisation
-    on_off_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))), dtype = bool)
-
-    #compute the on off map
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-            #at the contact
-            if dict_sample['L_g'][0].etai_M[-1-l][c] > 0.5 and dict_sample['L_g'][1].etai_M[-1-l][c] > 0.5:
-                on_off_M[-l-1][c] = True
-            #in the pore space
-            elif dict_sample['L_g'][0].etai_M[-1-l][c] < 0.5 and dict_sample['L_g'][1].etai_M[-1-l][c] < 0.5:
-                on_off_M[-l-1][c] = True
-
-    #dilatation
-    struct_element = dict_algorithm['struct_element']
-    dilated_M = binary_dilation(on_off_M, struct_element)
-
-    #compute the map of the solute diffusion coefficient
-    kc_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-            if dilated_M[-1-l][c] :
-                kc_M[-1-l][c] = dict_material['kappa_c']
-
-    #Update element in dictionnary
-    dict_sample['kc_M'] = kc_M
+    struct_element = np.asarray(dict_algorithm['struct_element'], dtype = bool)
+    kappa_c = float(dict_material['kappa_c'])
+    shape = (len(dict_sample['y_L']),len(dict_sample['x_L']))
+
+    #the Boolean map is True outside the windows of the phase fields (in the pore zone)
+    box, on_off_box_M = On_off_box(dict_sample)
+
+    #first call, new configuration or other map (sample reloaded), the whole map is computed
+    if len(dict_kc_dil) == 0 or dict_kc_dil['shape'] != shape or dict_kc_dil['kappa_c'] != kappa_c or \
+       not np.array_equal(dict_kc_dil['struct_element'], struct_element) or dict_sample.get('kc_M') is not dict_kc_dil['kc_M']:
+        on_off_M = np.ones(shape, dtype = bool)
+        on_off_M[box[0]:box[1],box[2]:box[3]] = on_off_box_M
+        kc_M = np.where(Binary_dilation(on_off_M, struct_element), kappa_c, 0)
+        dict_kc_dil.clear()
+        dict_kc_dil.update({'shape' : shape, 'kappa_c' : kappa_c, 'struct_element' : struct_element.copy(),
+                            'on_off_M' : on_off_M, 'kc_M' : kc_M, 'box' : box})
+        dict_sample['kc_M'] = kc_M
+        return
+
+    #the Boolean map changes only on the windows of the phase fields, the previous ones and the new ones
+    on_off_M = dict_kc_dil['on_off_M']
+    box_old = dict_kc_dil['box']
+    box_change = (min(box[0],box_old[0]), max(box[1],box_old[1]), min(box[2],box_old[2]), max(box[3],box_old[3]))
+    on_off_change_M = np.ones((box_change[1]-box_change[0],box_change[3]-box_change[2]), dtype = bool)
+    on_off_change_M[box[0]-box_change[0]:box[1]-box_change[0],box[2]-box_change[2]:box[3]-box_change[2]] = on_off_box_M
+    L_lc_change = np.argwhere(on_off_change_M != on_off_M[box_change[0]:box_change[1],box_change[2]:box_change[3]])
+    on_off_M[box_change[0]:box_change[1],box_change[2]:box_change[3]] = on_off_change_M
+    dict_kc_dil['box'] = box
+    if len(L_lc_change) == 0:
+        return
+
+    #the diffusion map changes on the box of the changes enlarged by the structural element
+    n_l, n_c = struct_element.shape
+    l_min, c_min = np.min(L_lc_change, axis = 0) + (box_change[0], box_change[2])
+    l_max, c_max = np.max(L_lc_change, axis = 0) + (box_change[0], box_change[2]) + 1
+    box_kc = (max(l_min-n_l,0), min(l_max+n_l,shape[0]), max(c_min-n_c,0), min(c_max+n_c,shape[1]))
+    #the dilation on this box needs the Boolean map on the box enlarged by the structural element
+    box_dil = (max(box_kc[0]-n_l,0), min(box_kc[1]+n_l,shape[0]), max(box_kc[2]-n_c,0), min(box_kc[3]+n_c,shape[1]))
+    dilated_M = Binary_dilation(on_off_M[box_dil[0]:box_dil[1],box_dil[2]:box_dil[3]], struct_element)
+    dilated_M = dilated_M[box_kc[0]-box_dil[0]:box_kc[1]-box_dil[0],box_kc[2]-box_dil[2]:box_kc[3]-box_dil[2]]
+    dict_kc_dil['kc_M'][box_kc[0]:box_kc[1],box_kc[2]:box_kc[3]] = np.where(dilated_M, kappa_c, 0)
 
 #-------------------------------------------------------------------------------
 
@@ -174,46 +175,22 @@ def Compute_kc_wfd(dict_material, dict_sample):
         Output :
             Nothing but the dictionnary gets an updated value for the solute diffusion coefficient map (a nx x ny numpy array)
     '''
-    #Initialisation
-    on_off_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))), dtype = bool)
-
     #compute the on off map
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-            #at the contact
-            if dict_sample['L_g'][0].etai_M[-1-l][c] > 0.5 and dict_sample['L_g'][1].etai_M[-1-l][c] > 0.5:
-                on_off_M[-l-1][c] = True
-            #in the pore space
-            elif dict_sample['L_g'][0].etai_M[-1-l][c] < 0.5 and dict_sample['L_g'][1].etai_M[-1-l][c] < 0.5:
-                on_off_M[-l-1][c] = True
-
-    #look for nodes delimiting the wfd
-    c = 0
-    search_limits_wfd = True
-    search_first = True
-    while search_limits_wfd :
-        if search_first and dict_sample['x_L'][c] > -dict_material['width_wfd']/2:
-            c_start = c - 1
-            search_first = False
-        elif dict_sample['x_L'][c] > dict_material['width_wfd']/2:
-            c_end = c
-            search_limits_wfd = False
-        c = c + 1
-
-    #force diffusion in the wter film diffusion
-    for c in range(c_start,c_end+1):
-        for l in range(len(dict_sample['y_L'])):
-            on_off_M[-l-1][c] = True
+    on_off_M = On_off_map(dict_sample)
 
-    #compute the map of the solute diffusion coefficient
-    kc_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-            if dilated_M[-1-l][c] :
-                kc_M[-1-l][c] = dict_material['kappa_c']
+    #look for nodes delimiting the wfd, the last node before -width_wfd/2 and the first node after width_wfd/2
+    c_start = max(np.searchsorted(dict_sample['x_L'], -dict_material['width_wfd']/2, side = 'right') - 1, 0)
+    c_end = np.searchsorted(dict_sample['x_L'], dict_material['width_wfd']/2, side = 'right')
+    #the film contains at least the nearest column of x = 0 (film thinner than the mesh)
+    c_nearest = int(np.argmin(np.abs(dict_sample['x_L'])))
+    c_start = min(c_start, c_nearest)
+    c_end = max(c_end, c_nearest)
 
-    #Update element in dictionnary
-    dict_sample['kc_M'] = kc_M
+    #force diffusion in the water film diffusion
+    on_off_M[:, c_start:c_end+1] = True
+
+    #compute the map of the solute diffusion coefficient
+    dict_sample['kc_M'] = np.where(on_off_M, float(dict_material['kappa_c']), 0)
 
 #-------------------------------------------------------------------------------
 
@@ -234,39 +211,108 @@ def Compute_kc_int(dict_material, dict_sample):
         Output :
             Nothing but the dictionnary gets an updated value for the solute diffusion coefficient map (a nx x ny numpy array)
     '''
-    #Initialisation
-    kc_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
-
-    #compute the distribution of the solute diffusion coefficient
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-            #at the contact
-            if dict_sample['L_g'][0].etai_M[-1-l][c] > 0.5 and dict_sample['L_g'][1].etai_M[-1-l][c] > 0.5:
-                kc_M[-l-1][c] = dict_material['kappa_c']
-            #inside g1 and not g2
-            elif dict_sample['L_g'][0].etai_M[-1-l][c] > 0.5 and dict_sample['L_g'][1].etai_M[-1-l][c] < 0.5:
-                P = np.array([dict_sample['x_L'][c], dict_sample['y_L'][-1-l]])
-                Distance = np.linalg.norm(P - dict_sample['L_g'][0].center)
-                #exponential decrease
-                kappa_c_trans = dict_material['kappa_c']*math.exp(-(dict_sample['L_g'][0].r_mean-Distance)/(dict_sample['L_g'][0].r_mean/dict_material['tau_kappa_c']))
-                kc_M[-l-1][c] = kappa_c_trans
-            #inside g2 and not g1
-            elif dict_sample['L_g'][0].etai_M[-1-l][c] < 0.5 and dict_sample['L_g'][1].etai_M[-1-l][c] > 0.5:
-                #compute the distance to g1
-                P = np.array([dict_sample['x_L'][c], dict_sample['y_L'][-1-l]])
-                Distance = np.linalg.norm(P - dict_sample['L_g'][1].center)
-                #exponential decrease
-                kappa_c_trans = dict_material['kappa_c']*math.exp(-(dict_sample['L_g'][1].r_mean-Distance)/(dict_sample['L_g'][1].r_mean/dict_material['tau_kappa_c']))
-                kc_M[-l-1][c] = kappa_c_trans
-            #outside
-            else :
-                kc_M[-l-1][c] = dict_material['kappa_c']
+    #at the contact, in the pore space and on the interfaces
+    kc_M = np.full((len(dict_sample['y_L']),len(dict_sample['x_L'])), float(dict_material['kappa_c']))
+
+    #inside a grain and not the other, only on the window of the grain (eta_i = 0 outside)
+    for grain, grain_other in [(dict_sample['L_g'][0], dict_sample['L_g'][1]), (dict_sample['L_g'][1], dict_sample['L_g'][0])]:
+        box = grain.etai_box()
+        mask_M = (grain.etai_on_box(box) > 0.5) & (Etai_on_box(grain_other, box) < 0.5)
+        #the coordinates of the nodes of the window, the line l is at y_L[-1-l]
+        x_M = np.asarray(dict_sample['x_L'], dtype = float)[np.newaxis,box[2]:box[3]]
+        y_M = np.asarray(dict_sample['y_L'], dtype = float)[::-1][box[0]:box[1],np.newaxis]
+        #exponential decrease with the distance to the center of the grain
+        Distance_M = np.hypot(x_M - grain.center[0], y_M - grain.center[1])
+        kc_box_M = kc_M[box[0]:box[1],box[2]:box[3]]
+        kc_box_M[mask_M] = dict_material['kappa_c']*np.exp(-(grain.r_mean-Distance_M[mask_M])/(grain.r_mean/dict_material['tau_kappa_c']))
 
     #Update element in dictionnary
     dict_sample['kc_M'] = kc_M
 
 #-------------------------------------------------------------------------------
 
+def On_off_map(dict_sample):
+    '''
+    Compute the Boolean map used to build the solute diffusion coefficient map.
+
+    The variable is True if eta_i and eta_j are greater than 0.5 (in the contact zone) or lower than 0.5 (in the pore zone).
+    The map is computed on the windows of the phase fields (see On_off_box()), it is True elsewhere.
+
+        Input :
+            a sample dictionnary (a dict)
+        Output :
+            the on off map (a ny x nx numpy array of bool)
+    '''
+    box, on_off_box_M = On_off_box(dict_sample)
+    on_off_M = np.ones((len(dict_sample['y_L']),len(dict_sample['x_L'])), dtype = bool)
+    on_off_M[box[0]:box[1],box[2]:box[3]] = on_off_box_M
+    return on_off_M
+
+#-------------------------------------------------------------------------------
+
+def On_off_box(dict_sample):
+    '''
+    Compute the Boolean map used to build the solute diffusion coefficient map, on the windows of the phase fields.
+
+    The box is the smallest box containing the windows of the phase fields, outside of it eta_i and eta_j are 0 (the map is True).
+
+        Input :
+            a sample dictionnary (a dict)
+        Output :
+            the first line, the last line + 1, the first column and the last column + 1 of the box (a tuple of int)
+            the on off map on the box (a numpy array of bool)
+    '''
+    L_box = [grain.etai_box() for grain in dict_sample['L_g']]
+    box = (min([box_i[0] for box_i in L_box]), max([box_i[1] for box_i in L_box]), min([box_i[2] for box_i in L_box]), max([box_i[3] for box_i in L_box]))
+    eta1_box_M = Etai_on_box(dict_sample['L_g'][0], box)
+    eta2_box_M = Etai_on_box(dict_sample['L_g'][1], box)
+    return box, ((eta1_box_M > 0.5) & (eta2_box_M > 0.5)) | ((eta1_box_M < 0.5) & (eta2_box_M < 0.5))
+
+#-------------------------------------------------------------------------------
+
+def Etai_on_box(grain, box):
+    '''
+    Extract the phase field of a grain on a part of the mesh.
+
+    Contrary to Grain.etai_on_box(), the part can go outside the window of the phase field (the phase field is 0 there).
+
+        Input :
+            a grain (a grain)
+            the first line, the last line + 1, the first column and the last column + 1 of the part (a tuple of int)
+        Output :
+            the phase field on the part (a numpy array)
+    '''
+    etai_M = np.zeros((box[1]-box[0],box[3]-box[2]))
+    box_window = Box_intersection(grain.etai_box(), box)
+    if box_window != None:
+        etai_M[box_window[0]-box[0]:box_window[1]-box[0],box_window[2]-box[2]:box_window[3]-box[2]] = grain.etai_on_box(box_window)
+    return etai_M
+
+#-------------------------------------------------------------------------------
+
+def Binary_dilation(on_off_M, struct_element):
+    '''
+    Dilate a Boolean map, as scipy.ndimage.binary_dilation().
+
+    If the structural element is a rectangle full of True, the dilation is separable : a maximum filter is applied on the lines then on the columns.
+    The cost of those filters does not depend on the size of the structural element.
+    The origins are shifted for even sizes to give the same result as scipy.ndimage.binary_dilation().
+
+        Input :
+            the map (a ny x nx numpy array of bool)
+            the structural element (a 2D numpy array of bool)
+        Output :
+            the dilated map (a ny x nx numpy array of bool)
+    '''
+    struct_element = np.asarray(struct_element, dtype = bool)
+    if struct_element.ndim != 2 or not np.all(struct_element):
+        return binary_dilation(on_off_M, struct_element)
+    n_l, n_c = struct_element.shape
+    dilated_M = maximum_filter1d(on_off_M, n_l, axis = 0, origin = n_l%2-1)
+    return maximum_filter1d(dilated_M, n_c, axis = 1, origin = n_c%2-1)
+
+#-------------------------------------------------------------------------------
+
 def Compute_sum_c(dict_sample):
     '''
     Compute the quantity of the solute.
@@ -295,93 +341,95 @@ def Compute_sum_eta(dict_sample):
         Output :
             Nothing but the dictionnary gets an updated value for the intersection surface (a float)
     '''
+    #the phase field is 0 outside its window
     sum_eta = 0
     for grain in dict_sample['L_g']:
-        for l in range(len(dict_sample['y_L'])):
-            for c in range(len(dict_sample['x_L'])):
-                sum_eta = sum_eta + grain.etai_M[l][c]
+        sum_eta = sum_eta + np.sum(grain.etai_window_M)
 
     #update element in dict
     dict_sample['sum_eta'] = sum_eta
 
 #-------------------------------------------------------------------------------
 
-def Compute_Ed_abs_node_contact(dict_sample, dict_sollicitation):
+def Compute_sum_Ed(dict_sample, dict_sollicitation):
     '''
-    Compute the absolute total energy in the sample.
-
-    This energy is related to the deformation during the phase-field step.
+    Compute the sums of the total energy in the sample, on all the sample and on the contact zone (eta_i and eta_j > 0.5).
 
-    Only absolute total energy in the contact zone (eta_i and eta_j > 0.5) is considered for the sum.
-    The sum obtained is divided by the number of nodes in the contact zone.
+    The energy is Ed = Ed_mec - Ed_che with Ed_che = chi*c*(h(eta_1)+h(eta_2)) and h(eta) = 3*eta^2-2*eta^3.
+    The maps are computed once and shared by all the sums. h is computed only on the windows of the phase fields.
+    The maps are stored in work arrays given by Owntools.Get_buffer(), they are reused at the next calls and not saved with the sample.
 
         Input :
             a sample dictionnary (a dict)
+            a sollicitation dictionnary (a dict)
         Output :
-            Nothing but the dictionnary gets an updated value for energy inside the sample (three floats)
+            Nothing but the dictionnary gets updated values for energy inside the sample (8 floats and an int)
     '''
+    #the work arrays have the size of the mesh
+    shape = (len(dict_sample['y_L']),len(dict_sample['x_L']))
+    Ed_che_M = Owntools.Get_buffer('Ed_che_M', shape)
+    Ed_M = Owntools.Get_buffer('Ed_M', shape)
+    contact_M = Owntools.Get_buffer('contact_M', shape, dtype = bool)
+
+    #h(eta_1)+h(eta_2), not 0 only on the windows of the phase fields
+    Ed_che_M.fill(0)
+    for grain in dict_sample['L_g']:
+        box = grain.etai_box()
+        etai_box_M = grain.etai_on_box(box)
+        h_box_M = Ed_M[box[0]:box[1],box[2]:box[3]]
+        np.multiply(etai_box_M, -2, out = h_box_M)
+        h_box_M += 3
+        h_box_M *= etai_box_M
+        h_box_M *= etai_box_M
+        Ed_che_M[box[0]:box[1],box[2]:box[3]] += h_box_M
+
+    #Ed_che and Ed
+    Ed_che_M *= dict_sample['solute_M']
+    Ed_che_M *= dict_sollicitation['chi']
+    np.subtract(dict_sample['Emec_M'], Ed_che_M, out = Ed_M)
+    sum_Ed_mec = np.sum(dict_sample['Emec_M'])
+    sum_Ed_che = np.sum(Ed_che_M)
+    sum_ed = np.sum(Ed_M)
+    #the buffer of Ed_che is reused for the positive part of Ed
+    np.maximum(Ed_M, 0, out = Ed_che_M)
+    sum_ed_plus = np.sum(Ed_che_M)
+    sum_ed_minus = sum_ed_plus - sum_ed
+
+    #the contact zone is inside the intersection of the windows of the phase fields
+    box = Box_intersection(dict_sample['L_g'][0].etai_box(),dict_sample['L_g'][1].etai_box())
     sum_ed_abs = 0
     n_node = 0
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-            if dict_sample['L_g'][0].etai_M[-1-l][c] > 0.5 and dict_sample['L_g'][1].etai_M[-1-l][c] > 0.5:
-                #Emec
-                Ed_mec = dict_sample['Emec_M'][-1-l][c]
-                #Eche
-                Ed_che = dict_sollicitation['chi']*dict_sample['solute_M'][-1-l][c]*(3*dict_sample['L_g'][0].etai_M[-1-l][c]**2-2*dict_sample['L_g'][0].etai_M[-1-l][c]**3+\
-                                                                                     3*dict_sample['L_g'][1].etai_M[-1-l][c]**2-2*dict_sample['L_g'][1].etai_M[-1-l][c]**3)
-                #Ed
-                Ed = Ed_mec - Ed_che
-                #sum
-                sum_ed_abs = sum_ed_abs + abs(Ed)
-                n_node = n_node + 1
+    if box != None:
+        contact_box_M = contact_M[box[0]:box[1],box[2]:box[3]]
+        work_box_M = Ed_che_M[box[0]:box[1],box[2]:box[3]]
+        np.minimum(dict_sample['L_g'][0].etai_on_box(box),dict_sample['L_g'][1].etai_on_box(box),out = work_box_M)
+        np.greater(work_box_M, 0.5, out = contact_box_M)
+        np.abs(Ed_M[box[0]:box[1],box[2]:box[3]], out = work_box_M)
+        sum_ed_abs = np.sum(work_box_M, where = contact_box_M)
+        n_node = np.count_nonzero(contact_box_M)
 
     #update elements in dict
+    dict_sample['sum_ed'] = sum_ed
+    dict_sample['sum_Ed_mec'] = sum_Ed_mec
+    dict_sample['sum_Ed_che'] = sum_Ed_che
+    dict_sample['sum_ed_plus'] = sum_ed_plus
+    dict_sample['sum_ed_minus'] = sum_ed_minus
     dict_sample['sum_ed_abs'] = sum_ed_abs
     dict_sample['n_node'] = n_node
-    dict_sample['sum_ed_abs_node'] = sum_ed_abs/n_node
+    dict_sample['sum_ed_abs_node'] = sum_ed_abs/n_node if n_node > 0 else 0
 
 #-------------------------------------------------------------------------------
 
-def Compute_sum_Ed_plus_minus(dict_sample, dict_sollicitation):
+def Box_intersection(box1, box2):
     '''
-    Compute the total energy in the sample. This energy is divided in a plus term and a minus term.
+    Compute the intersection of two windows of the mesh.
 
         Input :
-            a sample dictionnary (a dict)
+            two windows, the first line, the last line + 1, the first column and the last column + 1 (two tuples of int)
         Output :
-            Nothing but the dictionnary gets an updated value for energy inside the sample (three floats)
+            the intersection, same format (a tuple of int) or None if the windows do not intersect
     '''
-    sum_ed_plus = 0
-    sum_ed_minus = 0
-    sum_ed = 0
-    sum_Ed_mec = 0
-    sum_Ed_che = 0
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-
-            #Emec
-            Ed_mec = dict_sample['Emec_M'][-1-l][c]
-
-            #Eche
-            Ed_che = dict_sollicitation['chi']*dict_sample['solute_M'][-1-l][c]*(3*dict_sample['L_g'][0].etai_M[-1-l][c]**2-2*dict_sample['L_g'][0].etai_M[-1-l][c]**3+\
-                                                                                 3*dict_sample['L_g'][1].etai_M[-1-l][c]**2-2*dict_sample['L_g'][1].etai_M[-1-l][c]**3)
-
-            #Ed
-            Ed = Ed_mec - Ed_che
-
-            #sum actualisation
-            sum_ed = sum_ed + Ed
-            sum_Ed_mec = sum_Ed_mec + Ed_mec
-            sum_Ed_che = sum_Ed_che + Ed_che
-            if Ed > 0 :
-                sum_ed_plus = sum_ed_plus + Ed
-            else :
-                sum_ed_minus = sum_ed_minus - Ed
-
-    #update elements in dict
-    dict_sample['sum_ed'] = sum_ed
-    dict_sample['sum_Ed_mec'] = sum_Ed_mec
-    dict_sample['sum_Ed_che'] = sum_Ed_che
-    dict_sample['sum_ed_plus'] = sum_ed_plus
-    dict_sample['sum_ed_minus'] = sum_ed_minus
+    box = (max(box1[0],box2[0]), min(box1[1],box2[1]), max(box1[2],box2[2]), min(box1[3],box2[3]))
+    if box[0] >= box[1] or box[2] >= box[3]:
+        return None
+    return box
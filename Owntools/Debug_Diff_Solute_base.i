@@ -94,8 +94,12 @@
 
 [Outputs]
   execute_on = 'timestep_end'
-  exodus = true
+  [./exodus]
+    type = Exodus
+    file_base =
+  [../]
   [./other]
     type = VTK
+    file_base =
   [../]
 []
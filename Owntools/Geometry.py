@@ -0,0 +1,544 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This file contains the different functions used to study the geometry of the grains in the simulation.
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import numpy as np
+import random
+from scipy.ndimage import distance_transform_edt
+from scipy.optimize import linprog
+
+#-------------------------------------------------------------------------------
+#Marching squares
+#-------------------------------------------------------------------------------
+
+# Segments built in a cell for each case of the marching squares.
+# The case is TL*8 + TR*4 + BR*2 + BL*1 where a corner is 1 if its value is over the level.
+# The edges of a cell are 0 top, 1 right, 2 bottom and 3 left.
+# The segments are oriented (from edge, to edge) so that the inside is on the left (counterclockwise contour).
+# The saddle cases 5 and 10 are given for a center under the level.
+L_segments_case = [[],               #0
+                   [(2,3)],          #1
+                   [(1,2)],          #2
+                   [(1,3)],          #3
+                   [(0,1)],          #4
+                   [(0,1),(2,3)],    #5
+                   [(0,2)],          #6
+                   [(0,3)],          #7
+                   [(3,0)],          #8
+                   [(2,0)],          #9
+                   [(3,0),(1,2)],    #10
+                   [(1,0)],          #11
+                   [(3,1)],          #12
+                   [(2,1)],          #13
+                   [(3,2)],          #14
+                   []]               #15
+# Segments of the saddle cases 5 and 10 for a center over the level (the zones over the level are connected).
+Dict_segments_saddle = {5 : [(0,3),(2,1)],
+                        10 : [(1,0),(3,2)]}
+
+#-------------------------------------------------------------------------------
+
+def Marching_Squares(M, x_L, y_L, level):
+    '''
+    Extract the iso-contours of a field with a marching squares algorithm.
+
+    The crossing points are linearly interpolated on the edges of the mesh.
+    The segments of each cell are oriented, the contours are then followed edge by edge.
+    The cost is proportional to the number of nodes.
+
+        Input :
+            a field (a n_y x n_x numpy array, the line l is at y_L[-1-l] as etai_M)
+            the coordinates of the columns (a n_x numpy array)
+            the coordinates of the lines (a n_y numpy array)
+            the level of the iso-contour (a float)
+        Output :
+            a list of contours (a list of k x 2 numpy array)
+            A contour is closed (the first vertex is repeated at the end) except if it reaches the border of the mesh.
+            Closed contours are counterclockwise around the zone over the level.
+    '''
+    M = np.asarray(M, dtype = float)
+    x_L = np.asarray(x_L, dtype = float)
+    y_L = np.asarray(y_L, dtype = float)[::-1] #y of the lines of M
+    n_y, n_x = M.shape
+    B = M > level
+
+    #id of the edges : horizontal edge (l,c)-(l,c+1) then vertical edge (l,c)-(l+1,c)
+    n_h = n_y*(n_x-1)
+    id_h = np.arange(n_h).reshape(n_y, n_x-1)
+    id_v = n_h + np.arange((n_y-1)*n_x).reshape(n_y-1, n_x)
+
+    #crossing points on the edges
+    edge_x = np.zeros(n_h+(n_y-1)*n_x)
+    edge_y = np.zeros(n_h+(n_y-1)*n_x)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        t_h = (level-M[:,:-1])/(M[:,1:]-M[:,:-1])
+        t_v = (level-M[:-1,:])/(M[1:,:]-M[:-1,:])
+    edge_x[:n_h] = (x_L[:-1] + t_h*(x_L[1:]-x_L[:-1])).flatten()
+    edge_y[:n_h] = np.repeat(y_L, n_x-1)
+    edge_x[n_h:] = np.tile(x_L, n_y-1)
+    edge_y[n_h:] = (y_L[:-1,None] + t_v*(y_L[1:,None]-y_L[:-1,None])).flatten()
+
+    #case of the cells
+    case_M = 8*B[:-1,:-1] + 4*B[:-1,1:] + 2*B[1:,1:] + 1*B[1:,:-1]
+    center_over_M = (M[:-1,:-1]+M[:-1,1:]+M[1:,1:]+M[1:,:-1])/4 > level
+    L_edges_cell = [id_h[:-1,:], id_v[:,1:], id_h[1:,:], id_v[:,:-1]] #top, right, bottom, left
+
+    #next edge on the contours
+    next_edge = -np.ones(len(edge_x), dtype = int)
+    for case in range(1, 15):
+        mask_M = case_M == case
+        if case in [5, 10]:
+            #saddle, the zones over the level are connected if the center is over the level
+            for segment in Dict_segments_saddle[case]:
+                next_edge[L_edges_cell[segment[0]][mask_M & center_over_M]] = L_edges_cell[segment[1]][mask_M & center_over_M]
+            mask_M = mask_M & ~center_over_M
+        for segment in L_segments_case[case]:
+            next_edge[L_edges_cell[segment[0]][mask_M]] = L_edges_cell[segment[1]][mask_M]
+
+    #follow the contours
+    L_contour = []
+    is_target = np.zeros(len(edge_x), dtype = bool)
+    is_target[next_edge[next_edge >= 0]] = True
+    visited = np.zeros(len(edge_x), dtype = bool)
+    #open contours start on an edge which is not a target, then closed contours
+    L_start = list(np.flatnonzero((next_edge >= 0) & ~is_target)) + list(np.flatnonzero(next_edge >= 0))
+    for start in L_start:
+        if visited[start]:
+            continue
+        L_id = [start]
+        visited[start] = True
+        current = next_edge[start]
+        while current >= 0 and not visited[current]:
+            L_id.append(current)
+            visited[current] = True
+            current = next_edge[current]
+        if current == start:
+            L_id.append(start)
+        L_contour.append(np.column_stack((edge_x[L_id], edge_y[L_id])))
+    return L_contour
+
+#-------------------------------------------------------------------------------
+
+def Resample_Polygon(L_border, n):
+    '''
+    Resample a closed polygon with vertices uniformly distributed along the perimeter.
+
+        Input :
+            a closed polygon (a k x 2 numpy array, the first vertex is repeated at the end)
+            the number of vertices wanted (an integer)
+        Output :
+            the resampled closed polygon (a (n+1) x 2 numpy array, the first vertex is repeated at the end)
+    '''
+    L_border = np.asarray(L_border, dtype = float)
+    L_s = np.concatenate(([0], np.cumsum(np.linalg.norm(np.diff(L_border, axis = 0), axis = 1))))
+    L_s_new = np.linspace(0, L_s[-1], n+1)
+    L_border_new = np.column_stack((np.interp(L_s_new, L_s, L_border[:,0]), np.interp(L_s_new, L_s, L_border[:,1])))
+    L_border_new[-1] = L_border_new[0]
+    return L_border_new
+
+#-------------------------------------------------------------------------------
+#Polygon properties
+#-------------------------------------------------------------------------------
+
+def Points_Inside_Polygon(L_P, L_border):
+    '''
+    Determine if several points are inside of a closed polygon.
+
+    A crossing number is computed (see Franklin 1994) : a slide on constant y is done from each point.
+    Every time a border is crossed, the point switches between in and out.
+    The loop is done on the edges, all the points are treated together.
+
+        Input :
+            the points (a N x 2 numpy array)
+            a closed polygon (a k x 2 numpy array or a list of 2 x 1 numpy array, the first vertex is repeated at the end)
+        Output :
+            True or False, depending on the fact that each point is inside the polygon or not (a N numpy array of bool)
+    '''
+    L_P = np.asarray(L_P, dtype = float).reshape(-1, 2)
+    L_border = np.asarray(L_border, dtype = float)
+    counter = np.zeros(len(L_P), dtype = int)
+    for i in range(len(L_border)-1):
+        x_i, y_i = L_border[i]
+        x_j, y_j = L_border[i+1]
+        #horizontal edges are never crossed
+        if y_i == y_j:
+            continue
+        #consider only points if the coordinates frame the y-coordinate of the point
+        mask = (y_i-L_P[:,1])*(y_j-L_P[:,1]) < 0
+        x_border = x_i + (x_j-x_i)*(L_P[:,1]-y_i)/(y_j-y_i)
+        counter = counter + (mask & (x_border > L_P[:,0]))
+    return counter % 2 == 1
+
+#-------------------------------------------------------------------------------
+
+def Polygon_Area_Center(L_border):
+    '''
+    Compute the area and the center of mass of a closed polygon with the shoelace formula.
+
+    The result is exact for the polygon and the cost is proportional to the number of vertices.
+
+        Input :
+            a closed polygon (a k x 2 numpy array or a list of 2 x 1 numpy array, the first vertex is repeated at the end)
+        Output :
+            the area of the polygon (a float)
+            the center of mass of the polygon (a 2 x 1 numpy array)
+    '''
+    L_border = np.asarray(L_border, dtype = float)
+    x_i, y_i = L_border[:-1,0], L_border[:-1,1]
+    x_j, y_j = L_border[1:,0], L_border[1:,1]
+    L_cross = x_i*y_j - x_j*y_i
+    #signed area, positive if the polygon is counterclockwise
+    Area = 0.5*np.sum(L_cross)
+    Center = np.array([np.sum((x_i+x_j)*L_cross), np.sum((y_i+y_j)*L_cross)])/(6*Area)
+    return abs(Area), Center
+
+#-------------------------------------------------------------------------------
+
+def Polygon_Intersection(L_border, L_hull):
+    '''
+    Compute the intersection of a closed polygon with a convex polygon with the Sutherland-Hodgman algorithm.
+
+    The polygon is clipped successively by the half planes of the edges of the convex polygon.
+    The loop is done on the edges of the convex polygon, all the vertices of the polygon are treated together.
+    The result is exact if the polygon does not go in and out of the convex polygon several times (two convex polygons for example).
+
+        Input :
+            a closed polygon (a k x 2 numpy array or a list of 2 x 1 numpy array, the first vertex is repeated at the end)
+            a convex polygon, counterclockwise and not closed (a h x 2 numpy array, as given by Convex_Hull())
+        Output :
+            the intersection, closed (a m x 2 numpy array, the first vertex is repeated at the end, empty if there is no intersection)
+    '''
+    L_P = np.asarray(L_border, dtype = float)[:-1]
+    L_hull = np.asarray(L_hull, dtype = float)
+    L_A = L_hull
+    L_B = np.roll(L_hull, -1, axis = 0)
+    #the edges with the whole polygon on their left do not clip it (neither the clipped polygons, which are inside it)
+    M_side = (L_B[:,0:1]-L_A[:,0:1])*(L_P[:,1]-L_A[:,1:2]) - (L_B[:,1:2]-L_A[:,1:2])*(L_P[:,0]-L_A[:,0:1])
+    for i in np.where(np.any(M_side < 0, axis = 1))[0]:
+        if len(L_P) == 0:
+            break
+        A = L_A[i]
+        B = L_B[i]
+        #the vertices on the left of the edge AB are inside
+        L_side = (B[0]-A[0])*(L_P[:,1]-A[1]) - (B[1]-A[1])*(L_P[:,0]-A[0])
+        L_side_next = np.roll(L_side, -1)
+        L_inside = L_side >= 0
+        L_cross = L_inside != (L_side_next >= 0)
+        #intersection of the edges of the polygon crossing the line AB
+        L_t = np.zeros(len(L_P))
+        L_t[L_cross] = L_side[L_cross]/(L_side[L_cross]-L_side_next[L_cross])
+        L_I = L_P + L_t[:,None]*(np.roll(L_P, -1, axis = 0)-L_P)
+        #each vertex gives itself if it is inside and the intersection if the next edge crosses the line
+        L_P = np.stack((L_P, L_I), axis = 1)[np.column_stack((L_inside, L_cross))]
+    if len(L_P) < 3:
+        return np.zeros((0, 2))
+    return np.vstack((L_P, L_P[0]))
+
+#-------------------------------------------------------------------------------
+#Convex hull
+#-------------------------------------------------------------------------------
+
+def Convex_Hull(L_P):
+    '''
+    Compute the convex hull of a set of points with the monotone chain algorithm (Andrew 1979).
+
+    The cost is O(n log(n)) because of the sort of the points.
+
+        Input :
+            the points (a n x 2 numpy array or a list of 2 x 1 numpy array)
+        Output :
+            the vertices of the convex hull, counterclockwise and not closed (a h x 2 numpy array)
+    '''
+    L_P = np.unique(np.asarray(L_P, dtype = float).reshape(-1, 2), axis = 0) #sorted by x then y
+    if len(L_P) < 3:
+        return L_P
+
+    def cross(O, A, B):
+        return (A[0]-O[0])*(B[1]-O[1]) - (A[1]-O[1])*(B[0]-O[0])
+
+    L_lower = []
+    for P in L_P:
+        while len(L_lower) >= 2 and cross(L_lower[-2], L_lower[-1], P) <= 0:
+            L_lower.pop()
+        L_lower.append(P)
+    L_upper = []
+    for P in L_P[::-1]:
+        while len(L_upper) >= 2 and cross(L_upper[-2], L_upper[-1], P) <= 0:
+            L_upper.pop()
+        L_upper.append(P)
+    return np.array(L_lower[:-1] + L_upper[:-1])
+
+#-------------------------------------------------------------------------------
+
+def Rotating_Calipers(L_hull):
+    '''
+    Compute the diameter and the minimum width of a convex polygon with the rotating calipers (Shamos 1978).
+
+    For each edge of the hull, the antipodal vertex is followed. The cost is O(h).
+
+        Input :
+            the vertices of a convex hull, counterclockwise and not closed (a h x 2 numpy array)
+        Output :
+            the diameter, the largest distance between two vertices (a float)
+            the indices of the two vertices at the diameter (a tuple of two integers)
+            the minimum width, the smallest distance between two parallel supporting lines (a float)
+    '''
+    L_hull = np.asarray(L_hull, dtype = float)
+    n = len(L_hull)
+    if n == 1:
+        return 0, (0, 0), 0
+    if n == 2:
+        return np.linalg.norm(L_hull[1]-L_hull[0]), (0, 1), 0
+
+    def area(i, j, k):
+        #twice the area of the triangle (i, j, k)
+        A, B, C = L_hull[i], L_hull[j], L_hull[k]
+        return abs((B[0]-A[0])*(C[1]-A[1]) - (B[1]-A[1])*(C[0]-A[0]))
+
+    diameter = 0
+    ij_diameter = (0, 0)
+    width_min = None
+    j = 1
+    for i in range(n):
+        i_next = (i+1)%n
+        #antipodal vertex of the edge (i, i+1)
+        while area(i, i_next, (j+1)%n) > area(i, i_next, j):
+            j = (j+1)%n
+        #width in the normal direction of the edge
+        width = area(i, i_next, j)/np.linalg.norm(L_hull[i_next]-L_hull[i])
+        if width_min == None or width < width_min:
+            width_min = width
+        #the diameter is reached on an antipodal pair
+        for i_p in [i, i_next]:
+            distance = np.linalg.norm(L_hull[i_p]-L_hull[j])
+            if distance > diameter:
+                diameter = distance
+                ij_diameter = (i_p, j)
+    return diameter, ij_diameter, width_min
+
+#-------------------------------------------------------------------------------
+#Minimum enclosing circle
+#-------------------------------------------------------------------------------
+
+def Circle_From_Two_Points(P1, P2):
+    '''
+    Compute the smallest circle through two points.
+
+        Input :
+            two points (a 2 x 1 numpy array)
+        Output :
+            a center (a 2 x 1 numpy array)
+            a radius (a float)
+    '''
+    center = (P1+P2)/2
+    return center, np.linalg.norm(P1-center)
+
+#-------------------------------------------------------------------------------
+
+def Circle_From_Three_Points(P1, P2, P3):
+    '''
+    Compute the circumscribing circle of a triangle defined by three points.
+
+    If the points are collinear, the circle built on the two farthest points is returned.
+
+        Input :
+            three points (a 2 x 1 numpy array)
+        Output :
+            a center (a 2 x 1 numpy array)
+            a radius (a float)
+    '''
+    b = P2-P1
+    c = P3-P1
+    d = 2*(b[0]*c[1]-b[1]*c[0])
+    if abs(d) <= 1e-12*(np.dot(b,b)+np.dot(c,c)):
+        #collinear points
+        L_circle = [Circle_From_Two_Points(P1, P2), Circle_From_Two_Points(P1, P3), Circle_From_Two_Points(P2, P3)]
+        return max(L_circle, key = lambda circle : circle[1])
+    center = P1 + np.array([c[1]*np.dot(b,b)-b[1]*np.dot(c,c), b[0]*np.dot(c,c)-c[0]*np.dot(b,b)])/d
+    return center, np.linalg.norm(P1-center)
+
+#-------------------------------------------------------------------------------
+
+def Minimum_Enclosing_Circle(L_P, seed = 0):
+    '''
+    Compute the minimum circle containing a set of points with the Welzl algorithm (Welzl 1991).
+
+    The iterative version is used : the points are shuffled and the circle is updated when a point is outside.
+    The expected cost is O(n) and the result is exact, there is no failing case.
+    A copy of the points is shuffled with a local random generator, the result is reproducible and the points given are not modified.
+
+        Input :
+            the points (a n x 2 numpy array or a list of 2 x 1 numpy array)
+            the seed of the shuffle (an int, optional)
+        Output :
+            a center (a 2 x 1 numpy array)
+            a radius (a float)
+    '''
+    L_P = [np.asarray(P, dtype = float) for P in L_P]
+    random.Random(seed).shuffle(L_P)
+    tolerance = 1 + 1e-10 #numerical approximation
+
+    def is_inside(center, radius, P):
+        return np.linalg.norm(P-center) <= radius*tolerance
+
+    center, radius = L_P[0], 0
+    for i in range(1, len(L_P)):
+        if is_inside(center, radius, L_P[i]):
+            continue
+        #L_P[i] is on the circle
+        center, radius = L_P[i], 0
+        for j in range(i):
+            if is_inside(center, radius, L_P[j]):
+                continue
+            #L_P[i] and L_P[j] are on the circle
+            center, radius = Circle_From_Two_Points(L_P[i], L_P[j])
+            for k in range(j):
+                if not is_inside(center, radius, L_P[k]):
+                    #L_P[i], L_P[j] and L_P[k] are on the circle
+                    center, radius = Circle_From_Three_Points(L_P[i], L_P[j], L_P[k])
+    return center, radius
+
+#-------------------------------------------------------------------------------
+#Maximum inscribed circle
+#-------------------------------------------------------------------------------
+
+def Distance_To_Edges(L_P, L_border):
+    '''
+    Compute the distance of several points to each edge of a closed polygon.
+
+    The distance to each edge (a segment) is computed, all the points and all the edges are treated together.
+
+        Input :
+            the points (a N x 2 numpy array)
+            a closed polygon (a k x 2 numpy array or a list of 2 x 1 numpy array, the first vertex is repeated at the end)
+        Output :
+            the distance of each point to each edge (a N x k-1 numpy array)
+    '''
+    L_P = np.asarray(L_P, dtype = float).reshape(-1, 2)
+    L_border = np.asarray(L_border, dtype = float)
+    L_A = L_border[:-1]
+    L_AB = L_border[1:] - L_A
+    L_norm2 = np.maximum(np.sum(L_AB**2, axis = 1), 1e-300)
+    #projection of the points on the edges, limited to the segments
+    M_AP_x = L_P[:,0:1] - L_A[:,0]
+    M_AP_y = L_P[:,1:2] - L_A[:,1]
+    M_t = np.clip((M_AP_x*L_AB[:,0] + M_AP_y*L_AB[:,1])/L_norm2, 0, 1)
+    return np.sqrt((M_AP_x - M_t*L_AB[:,0])**2 + (M_AP_y - M_t*L_AB[:,1])**2)
+
+#-------------------------------------------------------------------------------
+
+def Distance_To_Border(L_P, L_border):
+    '''
+    Compute the distance of several points to the border of a closed polygon.
+
+        Input :
+            the points (a N x 2 numpy array)
+            a closed polygon (a k x 2 numpy array or a list of 2 x 1 numpy array, the first vertex is repeated at the end)
+        Output :
+            the distance of each point to the border (a N numpy array)
+    '''
+    return np.min(Distance_To_Edges(L_P, L_border), axis = 1)
+
+#-------------------------------------------------------------------------------
+
+def Rasterize_Polygon(L_border, x_L, y_L):
+    '''
+    Determine the nodes of a grid inside of a closed polygon.
+
+    A scanline is done on each line of the grid : the crossings with the edges are sorted and counted on the left of each node (see Points_Inside_Polygon()).
+    The cost is n_y x k for the crossings and n_y x n_x x log(k) for the counts, the nodes are not tested against all the edges.
+
+        Input :
+            a closed polygon (a k x 2 numpy array or a list of 2 x 1 numpy array, the first vertex is repeated at the end)
+            the coordinates of the columns and of the lines of the grid (two increasing numpy arrays)
+        Output :
+            True or False, depending on the fact that each node is inside the polygon or not (a n_y x n_x numpy array of bool, the line l is at y_L[l])
+    '''
+    L_border = np.asarray(L_border, dtype = float)
+    x_L = np.asarray(x_L, dtype = float)
+    y_L = np.asarray(y_L, dtype = float)
+    L_A = L_border[:-1]
+    L_B = L_border[1:]
+    #crossings of the lines with the edges (the horizontal edges are never crossed)
+    M_cross = (L_A[:,1]-y_L[:,np.newaxis])*(L_B[:,1]-y_L[:,np.newaxis]) < 0
+    L_dy = np.where(L_A[:,1] != L_B[:,1], L_B[:,1]-L_A[:,1], 1)
+    M_x = L_A[:,0] + (L_B[:,0]-L_A[:,0])*(y_L[:,np.newaxis]-L_A[:,1])/L_dy
+    #the crossings are sorted line by line in one array, the lines are separated by an offset
+    x_min = min(np.min(L_border[:,0]), x_L[0])
+    width = max(np.max(L_border[:,0]), x_L[-1]) - x_min + 1
+    M_x = np.sort(np.where(M_cross, M_x - x_min, width), axis = 1) + 2*width*np.arange(len(y_L))[:,np.newaxis]
+    M_count = np.searchsorted(M_x.ravel(), (x_L - x_min) + 2*width*np.arange(len(y_L))[:,np.newaxis]) - M_x.shape[1]*np.arange(len(y_L))[:,np.newaxis]
+    return M_count % 2 == 1
+
+#-------------------------------------------------------------------------------
+
+def Maximum_Inscribed_Circle(L_border, n_spatial, tolerance = 1e-9):
+    '''
+    Compute the maximum circle inscribed in a closed polygon.
+
+    The center of this circle is the point inside the polygon the farthest from the border.
+    The polygon is rasterized on a grid of n_spatial x n_spatial nodes in its box (see Rasterize_Polygon()) and a Euclidean distance transform gives the best node.
+    Then, the center is refined with the edges near the best node : the radius r is maximized under r <= distance to the line of each edge (a linear program),
+    in a box around the current center (two cells at first). The radius is checked with the exact distance to the border.
+    The box is enlarged while the solution reaches it and reduced if the radius is not improved.
+    The result is exact if the polygon is convex. Else, the edges are replaced by their lines near the center, the radius found is a lower bound.
+    If the polygon has several maxima of close radius (less than a cell), the grid can select the wrong one.
+
+        Input :
+            a closed polygon (a k x 2 numpy array or a list of 2 x 1 numpy array, the first vertex is repeated at the end)
+            the number of nodes of the grid in one direction (an int)
+            the relative tolerance on the radius (a float, optional)
+        Output :
+            a center (a 2 x 1 numpy array)
+            a radius (a float)
+    '''
+    L_border = np.asarray(L_border, dtype = float)
+    P_min = np.min(L_border, axis = 0)
+    P_max = np.max(L_border, axis = 0)
+
+    #distance transform of the rasterized polygon (the nodes are the centers of the cells)
+    L_h = (P_max - P_min)/n_spatial
+    x_L = P_min[0] + (np.arange(n_spatial)+0.5)*L_h[0]
+    y_L = P_min[1] + (np.arange(n_spatial)+0.5)*L_h[1]
+    inside_M = Rasterize_Polygon(L_border, x_L, y_L)
+    if inside_M.any():
+        distance_M = distance_transform_edt(np.pad(inside_M, 1), sampling = (L_h[1], L_h[0]))[1:-1,1:-1]
+        l, c = np.unravel_index(np.argmax(distance_M), distance_M.shape)
+        center = np.array([x_L[c], y_L[l]])
+    else :
+        center = np.mean(L_border[:-1], axis = 0)
+    radius = Distance_To_Border(center, L_border)[0]
+
+    #refinement with the edges near the center
+    L_A = L_border[:-1]
+    L_AB = L_border[1:] - L_A
+    #the normals go outside the polygon (on the right of the edges if it is counterclockwise) : L_n.p + r <= L_n.A inside
+    orientation = np.sign(np.sum(L_A[:,0]*L_border[1:,1] - L_border[1:,0]*L_A[:,1]))
+    L_n = orientation*np.column_stack((L_AB[:,1], -L_AB[:,0]))/np.maximum(np.linalg.norm(L_AB, axis = 1), 1e-300)[:,np.newaxis]
+    #trust region : the box is enlarged if the solution reaches it, reduced if the radius is not improved
+    size = 2*np.max(L_h)
+    while size > tolerance*np.max(P_max - P_min):
+        L_near = np.flatnonzero(Distance_To_Edges(center, L_border)[0] <= radius + 2*size)
+        result = linprog([0, 0, -1], A_ub = np.column_stack((L_n[L_near], np.ones(len(L_near)))), b_ub = np.sum(L_n[L_near]*L_A[L_near], axis = 1),
+                         bounds = [(center[0]-size, center[0]+size), (center[1]-size, center[1]+size), (0, None)], method = 'highs')
+        if result.status != 0 or result.x[2] <= radius*(1+tolerance):
+            break
+        center_new = result.x[:2]
+        radius_new = Distance_To_Border(center_new, L_border)[0]
+        if radius_new > radius*(1+tolerance) and Points_Inside_Polygon(center_new, L_border)[0]:
+            reach_box = np.max(np.abs(center_new - center)) > size*(1-1e-9)
+            center, radius = center_new, radius_new
+            if not reach_box:
+                break
+            size = 2*size
+        else :
+            size = size/2
+    return center, radius
@@ -11,188 +11,500 @@ This file contains the different functions used to translate phase field data in
 #-------------------------------------------------------------------------------
 
 import numpy as np
+import os
+import base64
+import zlib
+import scipy.io
+from concurrent.futures import ProcessPoolExecutor
+#netCDF4 is needed to read the exodus files in netCDF-4 (the default format of MOOSE)
+try :
+    import netCDF4
+except ImportError :
+    netCDF4 = None
+
+#pool of processes reading the files from MOOSE simulation (see Get_pool())
+dict_pool = {'pool' : None, 'n_worker' : 0}
+
+#numpy types of the types of the .vtu files (little endian)
+dict_vtk_type = {'Int8' : '<i1', 'UInt8' : '<u1', 'Int16' : '<i2', 'UInt16' : '<u2', 'Int32' : '<i4', 'UInt32' : '<u4',
+                 'Int64' : '<i8', 'UInt64' : '<u8', 'Float32' : '<f4', 'Float64' : '<f8'}
 
 #-------------------------------------------------------------------------------
 
-def solute_PFtoDEM_Multi(FileToRead,dict_algorithm,dict_sample):
+def Read_vtu_Multi(FileToRead,L_field,dict_algorithm,dict_sample):
     '''
-    Read file from MOOSE simulation to reconstruct the phase field of the solute.
+    Read files from MOOSE simulation (one per processor) and extract some fields.
+
+    The files are listed in the .pvtu index (np_proc files are assumed if it does not exist).
+    They are parsed by Read_vtu_piece(), in parallel in the pool of processes given by Get_pool() if dict_algorithm['n_proc_read'] > 1.
+    The nearest node of the mesh of each point is given by Node_index_map(), the coordinates of the points are read only if this map is not known.
 
         Input :
-            the name of the file to read (a string)
+            the name of the file to read, without .pvtu or _i_proc.vtu (a string)
+            the names of the fields to extract (a list of string)
             an algorithm dictionnary (a dictionnary)
             a sample dictionnary (a dictionnary)
+        Output :
+            a dictionnary with the line and the column of the nearest node of the points (keys 'L_l' and 'L_c', two n numpy arrays)
+            and the value of the fields at the points (key : the name of the field, a n numpy array)
+    '''
+    L_piece = Pieces_pvtu(FileToRead,dict_algorithm)
+
+    #number of points of the maps known
+    L_n_points_map = []
+    for i_proc in range(len(L_piece)):
+        L_l, L_c = Node_index_map(i_proc,None,None,dict_sample)
+        if L_l is None:
+            L_n_points_map.append(None)
+        else :
+            L_n_points_map.append(len(L_l))
+
+    #parse the files
+    n_worker = min(dict_algorithm['n_proc_read'], len(L_piece))
+    if n_worker > 1:
+        L_result = list(Get_pool(n_worker).map(Read_vtu_piece, L_piece, [L_field]*len(L_piece), L_n_points_map))
+    else :
+        L_result = [Read_vtu_piece(L_piece[i_proc], L_field, L_n_points_map[i_proc]) for i_proc in range(len(L_piece))]
+
+    #gather the processors
+    dict_L_data = {'L_l' : [], 'L_c' : []}
+    for name in L_field:
+        dict_L_data[name] = []
+    for i_proc in range(len(L_piece)):
+        n_points, dict_L_piece = L_result[i_proc]
+        if 'Points' in dict_L_piece:
+            L_l, L_c = Node_index_map(i_proc,n_points,dict_L_piece['Points'],dict_sample)
+        else :
+            L_l, L_c = Node_index_map(i_proc,n_points,None,dict_sample)
+        dict_L_data['L_l'].append(L_l)
+        dict_L_data['L_c'].append(L_c)
+        for name in L_field:
+            dict_L_data[name].append(dict_L_piece[name])
+    dict_data = {}
+    for name in dict_L_data:
+        dict_data[name] = np.concatenate(dict_L_data[name])
+
+    return dict_data
+
+#-------------------------------------------------------------------------------
+
+def Pieces_pvtu(FileToRead,dict_algorithm):
+    '''
+    List the files (one per processor) of an output from MOOSE simulation.
+
+    The files are given by the .pvtu index, np_proc files are assumed if it does not exist.
+
+        Input :
+            the name of the file to read, without .pvtu or _i_proc.vtu (a string)
+            an algorithm dictionnary (a dictionnary)
+        Output :
+            the names of the files, ordered by processor (a list of string)
+    '''
+    if not os.path.exists(FileToRead+'.pvtu'):
+        return [f'{FileToRead}_{i_proc}.vtu' for i_proc in range(dict_algorithm['np_proc'])]
+    f = open(FileToRead+'.pvtu','r')
+    data = f.read()
+    f.close()
+    #the sources are given relatively to the .pvtu
+    L_piece = []
+    for source in data.split('<Piece Source="')[1:]:
+        L_piece.append(os.path.join(os.path.dirname(FileToRead), source.split('"')[0]))
+    return L_piece
+
+#-------------------------------------------------------------------------------
+
+def Read_vtu_piece(FileToRead,L_field,n_points_map):
+    '''
+    Read one file from MOOSE simulation and extract some fields.
+
+    All the fields asked are extracted in one pass.
+    The data can be written in ascii, in binary (inline, base64) or appended (base64 or raw), the binary data are decoded by Decode_vtu_binary().
+    The coordinates of the points are read too if the number of points is not the one of the map known.
+    This function is called by the processes of the pool, only numpy arrays are sent back.
+
+        Input :
+            the name of the file to read (a string)
+            the names of the fields to extract (a list of string)
+            the number of points of the map of this file (an int or None if it is not known)
+        Output :
+            the number of points in the file (an int or None if it is not given)
+            the value of the fields at the points (a dictionnary of n numpy arrays, and the key 'Points' with a n x 3 numpy array if the coordinates are read)
+    '''
+    f = open(FileToRead,'rb')
+    data = f.read()
+    f.close()
+
+    #the appended data are not decoded as text (they can be raw)
+    i_appended = data.find(b'<AppendedData')
+    if i_appended == -1:
+        text = data.decode()
+        appended = None
+    else :
+        text = data[:i_appended].decode()
+        encoding = Read_attribute(data[i_appended:data.find(b'>',i_appended)].decode(),'encoding')
+        #the appended data start after the character _
+        appended = data[data.find(b'_',i_appended)+1:]
+        if encoding == 'raw':
+            appended = memoryview(appended)
+
+    #format of the binary data
+    tag_file = text[text.find('<VTKFile'):text.find('>',text.find('<VTKFile'))]
+    header_type = Read_attribute(tag_file,'header_type')
+    if header_type is None:
+        header_type = 'UInt32'
+    compressor = Read_attribute(tag_file,'compressor')
+
+    i_number = text.find('NumberOfPoints="')
+    n_points = None
+    if i_number != -1:
+        n_points = int(text[i_number+len('NumberOfPoints="'):text.find('"',i_number+len('NumberOfPoints="'))])
+    L_name_read = L_field
+    if n_points_map is None or n_points_map != n_points:
+        L_name_read = L_field + ['Points']
+
+    #iterations on the data arrays
+    dict_L_piece = {}
+    i_array = text.find('<DataArray')
+    while i_array != -1:
+        i_content = text.find('>',i_array)
+        tag_array = text[i_array:i_content]
+        name = Read_attribute(tag_array,'Name')
+        i_next = text.find('<DataArray',i_content)
+        if name in L_name_read:
+            format_array = Read_attribute(tag_array,'format')
+            #the content stops at the end of the array or at the information keys
+            content = text[i_content+1:text.find('<',i_content+1)]
+            if format_array == 'ascii':
+                L_value = Parse_DataArray(content)
+            elif format_array == 'binary':
+                L_value = Decode_vtu_binary(content.strip().encode(),Read_attribute(tag_array,'type'),header_type,compressor)
+            else :
+                offset = int(Read_attribute(tag_array,'offset'))
+                L_value = Decode_vtu_binary(appended[offset:],Read_attribute(tag_array,'type'),header_type,compressor,encoding=='raw')
+            n_component = Read_attribute(tag_array,'NumberOfComponents')
+            if n_component is not None:
+                L_value = L_value.reshape(-1,int(n_component))
+            dict_L_piece[name] = L_value
+        i_array = i_next
+
+    if n_points is None:
+        n_points = len(dict_L_piece['Points'])
+
+    return n_points, dict_L_piece
+
+#-------------------------------------------------------------------------------
+
+def Parse_DataArray(content):
+    '''
+    Convert the content of a data array written in ascii in a .vtu file.
+
+    The whole content is converted in one call of np.fromstring(), without work per value in Python.
+
+        Input :
+            the content of the data array, values separated by spaces and line breaks (a string)
+        Output :
+            the values (a n numpy array)
+    '''
+    #np.fromstring() gives [-1] if there are only blanks
+    if content.strip() == '':
+        return np.zeros(0)
+    return np.fromstring(content, sep=' ')
+
+#-------------------------------------------------------------------------------
+
+def Read_attribute(tag,attribute):
+    '''
+    Read the value of an attribute in a xml tag.
+
+        Input :
+            the tag (a string)
+            the name of the attribute (a string)
+        Output :
+            the value of the attribute (a string or None if the attribute is not in the tag)
+    '''
+    L_split = tag.split(' '+attribute+'="')
+    if len(L_split) == 1:
+        return None
+    return L_split[1].split('"')[0]
+
+#-------------------------------------------------------------------------------
+
+def Decode_vtu_binary(data,vtk_type,header_type,compressor,raw=False):
+    '''
+    Decode a data array written in binary in a .vtu file.
+
+    The data are a header (the number of bytes, or the sizes of the blocks if they are compressed with zlib) and the values.
+    In base64, the header and the values can be encoded together or separately.
+    The values are converted with np.frombuffer(), without work per value.
+
+        Input :
+            the data, can be followed by other data (bytes, base64 or raw)
+            the type of the values (a string, as Float64)
+            the type of the header (a string, as UInt32)
+            the compressor (a string or None if the data are not compressed)
+            a boolean to indicate the data are raw (a bool)
+        Output :
+            the values (a n numpy array, read only)
+    '''
+    dtype = np.dtype(dict_vtk_type[vtk_type])
+    dtype_header = np.dtype(dict_vtk_type[header_type])
+    n_header = dtype_header.itemsize
+
+    if compressor is None:
+        if raw:
+            n_bytes = int(np.frombuffer(data[:n_header], dtype_header)[0])
+            return np.frombuffer(data[n_header:n_header+n_bytes], dtype)
+        n_char = Number_base64_char(n_header)
+        n_bytes = int(np.frombuffer(base64.b64decode(data[:n_char])[:n_header], dtype_header)[0])
+        if data[n_char-1:n_char] == b'=':
+            #the header is encoded alone
+            return np.frombuffer(base64.b64decode(data[n_char:n_char+Number_base64_char(n_bytes)])[:n_bytes], dtype)
+        return np.frombuffer(base64.b64decode(data[:Number_base64_char(n_header+n_bytes)])[n_header:n_header+n_bytes], dtype)
+
+    #header of the compressed data : number of blocks, size of a block, size of the last block, size of the compressed blocks
+    if raw:
+        n_block = int(np.frombuffer(data[:n_header], dtype_header)[0])
+        L_size = np.frombuffer(data[3*n_header:(3+n_block)*n_header], dtype_header)
+        data = data[(3+n_block)*n_header:]
+    else :
+        n_block = int(np.frombuffer(base64.b64decode(data[:Number_base64_char(n_header)])[:n_header], dtype_header)[0])
+        n_char = Number_base64_char((3+n_block)*n_header)
+        L_size = np.frombuffer(base64.b64decode(data[:n_char])[3*n_header:(3+n_block)*n_header], dtype_header)
+        data = base64.b64decode(data[n_char:n_char+Number_base64_char(int(np.sum(L_size)))])
+    L_offset = np.concatenate(([0], np.cumsum(L_size))).astype(int)
+    data = b''.join([zlib.decompress(data[L_offset[i]:L_offset[i+1]]) for i in range(n_block)])
+    return np.frombuffer(data, dtype)
+
+#-------------------------------------------------------------------------------
+
+def Number_base64_char(n_bytes):
+    '''
+    Give the number of characters used to encode some bytes in base64.
+
+        Input :
+            the number of bytes (an int)
+        Output :
+            the number of characters (an int)
+    '''
+    return 4*((n_bytes+2)//3)
+
+#-------------------------------------------------------------------------------
+
+def Get_pool(n_worker):
+    '''
+    Give the pool of processes used to read the files from MOOSE simulation.
+
+    The pool is created at the first call and reused at the next iterations, it is created again only if the number of workers changes.
+
+        Input :
+            the number of workers (an int)
+        Output :
+            the pool of processes (a ProcessPoolExecutor)
+    '''
+    if dict_pool['pool'] is None or dict_pool['n_worker'] != n_worker:
+        Close_pool()
+        dict_pool['pool'] = ProcessPoolExecutor(max_workers = n_worker)
+        dict_pool['n_worker'] = n_worker
+    return dict_pool['pool']
+
+#-------------------------------------------------------------------------------
+
+def Close_pool():
+    '''
+    Shut down the pool of processes used to read the files from MOOSE simulation.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the pool is closed
+    '''
+    if dict_pool['pool'] is not None:
+        dict_pool['pool'].shutdown()
+        dict_pool['pool'] = None
+        dict_pool['n_worker'] = 0
+
+#-------------------------------------------------------------------------------
+
+def Read_exodus(FileToRead,L_field,i_step,dict_sample):
+    '''
+    Read the exodus file from MOOSE simulation and extract some fields at one time step.
+
+    Only the time step asked is read, the file is memory-mapped (netCDF classic) or opened with netCDF4 (netCDF-4, optional dependency).
+    The nodal variables are read directly, the elemental variables (as the material properties) are averaged on the nodes of the elements.
+    The nearest node of the mesh of each point is given by Node_index_map() (key 'exodus'), the coordinates of the points are read only if this map is not known.
+
+        Input :
+            the name of the file to read, with .e (a string)
+            the names of the fields to extract (a list of string)
+            the index of the time step (an int, -1 for the last step)
+            a sample dictionnary (a dictionnary)
+        Output :
+            a dictionnary with the line and the column of the nearest node of the points (keys 'L_l' and 'L_c', two n numpy arrays)
+            and the value of the fields at the points (key : the name of the field, a n numpy array)
+    '''
+    f = open(FileToRead,'rb')
+    signature = f.read(3)
+    f.close()
+    if signature == b'CDF':
+        exodus = scipy.io.netcdf_file(FileToRead,'r',mmap=True)
+    else :
+        if netCDF4 is None:
+            raise ImportError('The file '+FileToRead+' is in netCDF-4, the package netCDF4 is needed to read it (or set read_exodus = False in User.py to read vtk files)!')
+        exodus = netCDF4.Dataset(FileToRead,'r')
+    dict_variable = exodus.variables
+
+    n_points = dict_variable['coordx'].shape[0]
+    L_l, L_c = Node_index_map('exodus',n_points,None,dict_sample)
+    if L_l is None:
+        L_XYZ = np.zeros((n_points,3))
+        L_XYZ[:,0] = dict_variable['coordx'][:]
+        L_XYZ[:,1] = dict_variable['coordy'][:]
+        L_l, L_c = Node_index_map('exodus',n_points,L_XYZ,dict_sample)
+    dict_data = {'L_l' : L_l, 'L_c' : L_c}
+
+    #names of the variables
+    L_name_nod = []
+    if 'name_nod_var' in dict_variable:
+        L_name_nod = Read_exodus_names(dict_variable['name_nod_var'][:])
+    L_name_elem = []
+    if 'name_elem_var' in dict_variable:
+        L_name_elem = Read_exodus_names(dict_variable['name_elem_var'][:])
+
+    for name in L_field:
+        if name in L_name_nod:
+            dict_data[name] = np.array(dict_variable['vals_nod_var'+str(L_name_nod.index(name)+1)][i_step], dtype=float)
+        else :
+            #average of the elements around the nodes, on all the blocks
+            L_sum = np.zeros(n_points)
+            L_n = np.zeros(n_points)
+            i_block = 1
+            while 'connect'+str(i_block) in dict_variable:
+                connect = np.array(dict_variable['connect'+str(i_block)][:], dtype=int) - 1
+                L_value = np.array(dict_variable['vals_elem_var'+str(L_name_elem.index(name)+1)+'eb'+str(i_block)][i_step], dtype=float)
+                L_sum = L_sum + np.bincount(connect.flatten(), weights=np.repeat(L_value, connect.shape[1]), minlength=n_points)
+                L_n = L_n + np.bincount(connect.flatten(), minlength=n_points)
+                i_block = i_block + 1
+            dict_data[name] = L_sum/np.maximum(L_n,1)
+
+    #the arrays read are copied, the file can be closed
+    dict_variable = None
+    exodus.close()
+
+    return dict_data
+
+#-------------------------------------------------------------------------------
+
+def Read_exodus_names(L_char):
+    '''
+    Convert the names of the variables of an exodus file.
+
+        Input :
+            the names (a n_name x len_name numpy array of characters)
+        Output :
+            the names (a list of string)
+    '''
+    L_name = []
+    for name in L_char:
+        L_name.append(np.array(name).tobytes().decode().rstrip('\x00').strip())
+    return L_name
+
+#-------------------------------------------------------------------------------
+
+def Node_index(L_X,L_Y,dict_sample):
+    '''
+    Look for the nearest node of the mesh of some points.
+
+    The mesh is uniform, the index is computed directly from the coordinates (the first nearest node is taken).
+
+        Input :
+            the coordinates x and y of the points (two numpy arrays)
+            a sample dictionnary (a dictionnary)
+        Output :
+            the line and the column of the nearest node (two numpy arrays, the line l is at y_L[-1-l])
+    '''
+    L_i = []
+    for L_P, L_Mesh in [(L_X, dict_sample['x_L']), (L_Y, dict_sample['y_L'])]:
+        u = (L_P-L_Mesh[0])/(L_Mesh[1]-L_Mesh[0])
+        L_i.append(np.clip(np.ceil(u-0.5), 0, len(L_Mesh)-1).astype(int))
+    return len(dict_sample['y_L'])-1-L_i[1], L_i[0]
+
+#-------------------------------------------------------------------------------
+
+def Node_index_map(i_proc,n_points,L_XYZ,dict_sample):
+    '''
+    Give the nearest node of the mesh of the points of one file from MOOSE simulation.
+
+    The mesh and its partition do not change during the simulation, the map is computed once per file (processor).
+    It is saved in the sample dictionnary (then in the save files), with the mesh used.
+
+        Input :
+            the index of the processor (an int, or 'exodus' for the exodus file)
+            the number of points in the file (an int or None if it is not checked)
+            the coordinates of the points (a n x 3 numpy array or None if they are not read)
+            a sample dictionnary (a dictionnary)
+        Output :
+            the line and the column of the nearest node of the points (two numpy arrays)
+            or None, None if the map is not known and the coordinates are not given
+    '''
+    #the map is reset if the mesh changes
+    mesh = (dict_sample['x_L'][0], dict_sample['x_L'][-1], len(dict_sample['x_L']), dict_sample['y_L'][0], dict_sample['y_L'][-1], len(dict_sample['y_L']))
+    if 'dict_node_index' not in dict_sample or dict_sample['dict_node_index']['mesh'] != mesh:
+        dict_sample['dict_node_index'] = {'mesh' : mesh}
+    dict_node_index = dict_sample['dict_node_index']
+
+    #the map is known
+    if L_XYZ is None:
+        if i_proc in dict_node_index and (n_points is None or len(dict_node_index[i_proc][0]) == n_points):
+            return dict_node_index[i_proc]
+        return None, None
+
+    #compute the map
+    dict_node_index[i_proc] = Node_index(L_XYZ[:,0],L_XYZ[:,1],dict_sample)
+    return dict_node_index[i_proc]
+
+#-------------------------------------------------------------------------------
+
+def Field_on_mesh(dict_data,field,dict_sample):
+    '''
+    Project a field read in files from MOOSE simulation on the mesh.
+
+        Input :
+            the data read by Read_vtu_Multi() (a dictionnary)
+            the name of the field (a string)
+            a sample dictionnary (a dictionnary)
+        Output :
+            the field on the mesh (a n_y x n_x numpy array)
+    '''
+    field_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
+    field_M[dict_data['L_l'], dict_data['L_c']] = dict_data[field]
+    return field_M
+
+#-------------------------------------------------------------------------------
+
+def solute_PFtoDEM_Multi(dict_data,dict_sample):
+    '''
+    Reconstruct the phase field of the solute from the data of MOOSE simulation.
+
+        Input :
+            the data read by Read_vtu_Multi(), with the field c (a dictionnary)
+            a sample dictionnary (a dictionnary)
         Output :
             Nothing but the sample dictionnary gets an updated attribute (a n_y x n_x numpy array)
     '''
-    #---------------------------------------------------------------------------
-    #Global parameters
-    #---------------------------------------------------------------------------
-
-    dict_sample['solute_M'] = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
-
-    id_L = None
-    c_selector_len = len('        <DataArray type="Float64" Name="c')
-    end_len = len('        </DataArray>')
-    XYZ_selector_len = len('        <DataArray type="Float64" Name="Points"')
-    data_jump_len = len('          ')
-
-    for i_proc in range(dict_algorithm['np_proc']):
-
-        L_Work = [[], #X
-                  [], #Y
-                  []] #c
-
-    #---------------------------------------------------------------------------
-    #Reading file
-    #---------------------------------------------------------------------------
-
-        f = open(f'{FileToRead}_{i_proc}.vtu','r')
-        data = f.read()
-        f.close()
-        lines = data.splitlines()
-
-        #iterations on line
-        for line in lines:
-
-            if line[0:c_selector_len] == '        <DataArray type="Float64" Name="c':
-                id_L = 2
-
-            elif line[0:XYZ_selector_len] == '        <DataArray type="Float64" Name="Points"':
-                id_L = 0
-
-            elif (line[0:end_len] == '        </DataArray>' or  line[0:len('          <InformationKey')] == '          <InformationKey') and id_L != None:
-                id_L = None
-
-            elif line[0:data_jump_len] == '          ' and id_L == 2: #Read c
-                line = line[data_jump_len:]
-                c_start = 0
-                for c_i in range(0,len(line)):
-                    if line[c_i]==' ':
-                        c_end = c_i
-                        L_Work[id_L].append(float(line[c_start:c_end]))
-                        c_start = c_i+1
-                L_Work[id_L].append(float(line[c_start:]))
-
-            elif line[0:data_jump_len] == '          ' and id_L == 0: #Read [X, Y, Z]
-                line = line[data_jump_len:]
-                XYZ_temp = []
-                c_start = 0
-                for c_i in range(0,len(line)):
-                    if line[c_i]==' ':
-                        c_end = c_i
-                        XYZ_temp.append(float(line[c_start:c_end]))
-                        if len(XYZ_temp)==3:
-                            L_Work[0].append(XYZ_temp[0])
-                            L_Work[1].append(XYZ_temp[1])
-                            XYZ_temp = []
-                        c_start = c_i+1
-                XYZ_temp.append(float(line[c_start:]))
-                L_Work[0].append(XYZ_temp[0])
-                L_Work[1].append(XYZ_temp[1])
-
-        #Adaptating data and update of solute_M
-        for i in range(len(L_Work[0])):
-            #Interpolation method
-            L_dy = []
-            for y_i in dict_sample['y_L'] :
-                L_dy.append(abs(y_i - L_Work[1][i]))
-            L_dx = []
-            for x_i in dict_sample['x_L'] :
-                L_dx.append(abs(x_i - L_Work[0][i]))
-            dict_sample['solute_M'][-1-list(L_dy).index(min(L_dy))][list(L_dx).index(min(L_dx))] = L_Work[2][i]
+    dict_sample['solute_M'] = Field_on_mesh(dict_data,'c',dict_sample)
 
 #---------------------------------------------------------------------------
 
-def Ed_PFtoDEM_Multi(FileToRead,dict_algorithm,dict_sample):
+def Ed_PFtoDEM_Multi(dict_data,dict_sample):
     '''
-    Read file from MOOSE simulation to follow the external energy used in the phase field formulation.
+    Follow the external energy used in the phase field formulation from the data of MOOSE simulation.
 
         Input :
-            the name of the file to read (a string)
-            an algorithm dictionnary (a dictionnary)
+            the data read by Read_vtu_Multi(), with the fields Ed_mec and Ed_pre (a dictionnary)
             a sample dictionnary (a dictionnary)
         Output :
             Nothing but the sample dictionnary gets updated attributes (three n_y x n_x numpy array)
     '''
-    #---------------------------------------------------------------------------
-    #Global parameters
-    #---------------------------------------------------------------------------
-
-    id_L = None
-    Emec_selector_len = len('        <DataArray type="Float64" Name="Ed_mec')
-    Eche_selector_len = len('        <DataArray type="Float64" Name="Ed_pre')
-    end_len = len('        </DataArray>')
-    XYZ_selector_len = len('        <DataArray type="Float64" Name="Points"')
-    data_jump_len = len('          ')
-
-    for i_proc in range(dict_algorithm['np_proc']):
-
-        L_Work = [[], #X
-                  [], #Y
-                  [], #Emec
-                  []] #Eche
-
-    #---------------------------------------------------------------------------
-    #Reading file
-    #---------------------------------------------------------------------------
-
-        f = open(f'{FileToRead}_{i_proc}.vtu','r')
-        data = f.read()
-        f.close()
-        lines = data.splitlines()
-
-        #iterations on line
-        for line in lines:
-
-            if line[0:Emec_selector_len] == '        <DataArray type="Float64" Name="Ed_mec':
-                id_L = 2
-
-            elif line[0:Eche_selector_len] == '        <DataArray type="Float64" Name="Ed_pre':
-                id_L = 3
-
-            elif line[0:XYZ_selector_len] == '        <DataArray type="Float64" Name="Points"':
-                id_L = 0
-
-            elif (line[0:end_len] == '        </DataArray>' or  line[0:len('          <InformationKey')] == '          <InformationKey') and id_L != None:
-                id_L = None
-
-            elif line[0:data_jump_len] == '          ' and (id_L == 2 or id_L == 3): #Read Ed_mec or Ed_pre
-                line = line[data_jump_len:]
-                c_start = 0
-                for c_i in range(0,len(line)):
-                    if line[c_i]==' ':
-                        c_end = c_i
-                        L_Work[id_L].append(float(line[c_start:c_end]))
-                        c_start = c_i+1
-                L_Work[id_L].append(float(line[c_start:]))
-
-            elif line[0:data_jump_len] == '          ' and id_L == 0: #Read [X, Y, Z]
-                line = line[data_jump_len:]
-                XYZ_temp = []
-                c_start = 0
-                for c_i in range(0,len(line)):
-                    if line[c_i]==' ':
-                        c_end = c_i
-                        XYZ_temp.append(float(line[c_start:c_end]))
-                        if len(XYZ_temp)==3:
-                            L_Work[0].append(XYZ_temp[0])
-                            L_Work[1].append(XYZ_temp[1])
-                            XYZ_temp = []
-                        c_start = c_i+1
-                XYZ_temp.append(float(line[c_start:]))
-                L_Work[0].append(XYZ_temp[0])
-                L_Work[1].append(XYZ_temp[1])
-
-        #Adaptating data and update of Ed_M, Emec_M and Eche_M
-        for i in range(len(L_Work[0])):
-            #Interpolation method
-            L_dy = []
-            for y_i in dict_sample['y_L'] :
-                L_dy.append(abs(y_i - L_Work[1][i]))
-            L_dx = []
-            for x_i in dict_sample['x_L'] :
-                L_dx.append(abs(x_i - L_Work[0][i]))
-            dict_sample['Emec_M'][-1-list(L_dy).index(min(L_dy))][list(L_dx).index(min(L_dx))] = L_Work[2][i]
-            dict_sample['Eche_M'][-1-list(L_dy).index(min(L_dy))][list(L_dx).index(min(L_dx))] = L_Work[3][i]
-            dict_sample['Ed_M'][-1-list(L_dy).index(min(L_dy))][list(L_dx).index(min(L_dx))] = L_Work[2][i] - L_Work[3][i]
+    dict_sample['Emec_M'][dict_data['L_l'], dict_data['L_c']] = dict_data['Ed_mec']
+    dict_sample['Eche_M'][dict_data['L_l'], dict_data['L_c']] = dict_data['Ed_pre']
+    dict_sample['Ed_M'][dict_data['L_l'], dict_data['L_c']] = dict_data['Ed_mec'] - dict_data['Ed_pre']
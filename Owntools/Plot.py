@@ -16,7 +16,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import os
 import imageio
-from Owntools import index_to_str
+from Owntools import Last_Step_vtu
+from Owntools.PFtoDEM_Multi import Read_vtu_Multi, Field_on_mesh
 
 #-------------------------------------------------------------------------------
 
@@ -61,6 +62,10 @@ def Plot_Diffusion_Solute(dict_algorithm, dict_material, dict_sample):
           line = line[:-1] + ' ' + str(dict_algorithm['dt_PF']*dict_algorithm['n_t_PF']) +'\n'
         elif j == 91:
           line = line[:-1] + ' ' + str(dict_algorithm['dt_PF']) +'\n'
+        elif j == 99:
+          line = line[:-1] + ' Debug/Diff_Solute/Ite_'+str(dict_algorithm['i_PFDEM'])+'/Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'_out\n'
+        elif j == 103:
+          line = line[:-1] + ' Debug/Diff_Solute/Ite_'+str(dict_algorithm['i_PFDEM'])+'/Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'_other\n'
         file_to_write.write(line)
 
     file_to_write.close()
@@ -75,87 +80,17 @@ def Plot_Diffusion_Solute(dict_algorithm, dict_material, dict_sample):
     #sort files
     #---------------------------------------------------------------------------
 
-    os.rename('Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'_out.e','Debug/Diff_Solute/Ite_'+str(dict_algorithm['i_PFDEM'])+'/Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'_out.e')
+    #the outputs are written by MOOSE in Debug/Diff_Solute/Ite_i
     os.rename('Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'.i','Debug/Diff_Solute/Ite_'+str(dict_algorithm['i_PFDEM'])+'/Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'.i')
-    j = 0
-    j_str = index_to_str(j)
-    filepath = Path('Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'.pvtu')
-    while filepath.exists():
-        for i_proc in range(dict_algorithm['np_proc']):
-            os.rename('Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'_'+str(i_proc)+'.vtu','Debug/Diff_Solute/Ite_'+str(dict_algorithm['i_PFDEM'])+'/Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'_'+str(i_proc)+'.vtu')
-        os.rename('Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'.pvtu','Debug/Diff_Solute/Ite_'+str(dict_algorithm['i_PFDEM'])+'/Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'.pvtu')
-        j = j + 1
-        j_str = index_to_str(j)
-        filepath = Path('Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'.pvtu')
-    j_str = index_to_str(j-1)
 
     #---------------------------------------------------------------------------
     #read files
     #---------------------------------------------------------------------------
 
-    solute_diff_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
-
-    id_L = None
-    c_selector_len = len('        <DataArray type="Float64" Name="c')
-    end_len = len('        </DataArray>')
-    XYZ_selector_len = len('        <DataArray type="Float64" Name="Points"')
-    data_jump_len = len('          ')
-
-    for i_proc in range(dict_algorithm['np_proc']):
-
-        L_Work = [[], #X
-                  [], #Y
-                  []] #c
-
-        f = open('Debug/Diff_Solute/Ite_'+str(dict_algorithm['i_PFDEM'])+'/Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'_'+str(i_proc)+'.vtu','r')
-        data = f.read()
-        f.close
-        lines = data.splitlines()
-
-        #iterations on line
-        for line in lines:
-            if line[0:c_selector_len] == '        <DataArray type="Float64" Name="c':
-                id_L = 2
-            elif line[0:XYZ_selector_len] == '        <DataArray type="Float64" Name="Points"':
-                id_L = 0
-            elif (line[0:end_len] == '        </DataArray>' or  line[0:len('          <InformationKey')] == '          <InformationKey') and id_L != None:
-                id_L = None
-            elif line[0:data_jump_len] == '          ' and id_L == 2: #Read c
-                line = line[data_jump_len:]
-                c_start = 0
-                for c_i in range(0,len(line)):
-                    if line[c_i]==' ':
-                        c_end = c_i
-                        L_Work[id_L].append(float(line[c_start:c_end]))
-                        c_start = c_i+1
-                L_Work[id_L].append(float(line[c_start:]))
-            elif line[0:data_jump_len] == '          ' and id_L == 0: #Read [X, Y, Z]
-                line = line[data_jump_len:]
-                XYZ_temp = []
-                c_start = 0
-                for c_i in range(0,len(line)):
-                    if line[c_i]==' ':
-                        c_end = c_i
-                        XYZ_temp.append(float(line[c_start:c_end]))
-                        if len(XYZ_temp)==3:
-                            L_Work[0].append(XYZ_temp[0])
-                            L_Work[1].append(XYZ_temp[1])
-                            XYZ_temp = []
-                        c_start = c_i+1
-                XYZ_temp.append(float(line[c_start:]))
-                L_Work[0].append(XYZ_temp[0])
-                L_Work[1].append(XYZ_temp[1])
-
-        #Adaptating data and update of solute_M
-        for i in range(len(L_Work[0])):
-            #Interpolation method
-            L_dy = []
-            for y_i in dict_sample['y_L'] :
-                L_dy.append(abs(y_i - L_Work[1][i]))
-            L_dx = []
-            for x_i in dict_sample['x_L'] :
-                L_dx.append(abs(x_i - L_Work[0][i]))
-            solute_diff_M[-1-list(L_dy).index(min(L_dy))][list(L_dx).index(min(L_dx))] = L_Work[2][i]
+    #the map of the nodes of this simulation is not saved in the sample dictionnary
+    dict_sample_diff = {'x_L' : dict_sample['x_L'], 'y_L' : dict_sample['y_L']}
+    dict_data = Read_vtu_Multi(Last_Step_vtu('Debug/Diff_Solute/Ite_'+str(dict_algorithm['i_PFDEM'])+'/Debug_Diff_Solute_'+str(dict_algorithm['i_PFDEM'])+'_other'),['c'],dict_algorithm,dict_sample_diff)
+    solute_diff_M = Field_on_mesh(dict_data,'c',dict_sample_diff)
 
     #---------------------------------------------------------------------------
     #Compare with initial value
@@ -260,14 +195,14 @@ def Plot_config(dict_algorithm, dict_sample):
 
     #eta1_M
     plt.subplot(223)
-    im = plt.imshow(dict_sample['L_g'][0].etai_M,interpolation='nearest', extent=[min(dict_sample['x_L']),max(dict_sample['x_L']),min(dict_sample['y_L']),max(dict_sample['y_L'])], vmin = 0, vmax = 1)
+    im = plt.imshow(dict_sample['L_g'][0].expand_etai_M(),interpolation='nearest', extent=[min(dict_sample['x_L']),max(dict_sample['x_L']),min(dict_sample['y_L']),max(dict_sample['y_L'])], vmin = 0, vmax = 1)
     plt.colorbar(im)
     plt.plot(dict_sample['L_g'][0].l_border_x,dict_sample['L_g'][0].l_border_y,'r')
     plt.title(r'$\eta$1')
 
     #eta2_M
     plt.subplot(224)
-    im = plt.imshow(dict_sample['L_g'][1].etai_M,interpolation='nearest', extent=[min(dict_sample['x_L']),max(dict_sample['x_L']),min(dict_sample['y_L']),max(dict_sample['y_L'])], vmin = 0, vmax = 1)
+    im = plt.imshow(dict_sample['L_g'][1].expand_etai_M(),interpolation='nearest', extent=[min(dict_sample['x_L']),max(dict_sample['x_L']),min(dict_sample['y_L']),max(dict_sample['y_L'])], vmin = 0, vmax = 1)
     plt.colorbar(im)
     plt.plot(dict_sample['L_g'][1].l_border_x,dict_sample['L_g'][1].l_border_y,'r')
     plt.title(r'$\eta$2')
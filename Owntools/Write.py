@@ -10,13 +10,15 @@ This file contains the different functions to write files used in the simulation
 #Librairy
 #-------------------------------------------------------------------------------
 
+import numpy as np
+
 #-------------------------------------------------------------------------------
 
 def Write_i(dict_algorithm, dict_material, dict_sample, dict_sollicitation):
   '''
   Create the .i file to run MOOSE simulation.
 
-  The file is generated from a template nammed PF_ACS_base.i
+  The file is generated from a template nammed PF_ACS_base.i, the section [Outputs] is generated by Write_Outputs().
 
     Input :
         a algorithm dictionnary (a dictionnary)
@@ -45,6 +47,8 @@ def Write_i(dict_algorithm, dict_material, dict_sample, dict_sollicitation):
       line = line[:-1] + ' ' + str(min(dict_sample['y_L']))+'\n'
     elif j == 10:
       line = line[:-1] + ' ' + str(max(dict_sample['y_L']))+'\n'
+    elif j == 16:
+      line = line[:-1] + " 'out Ed'\n"
     elif j == 116:
       line = line[:-1] + "'"+str(dict_material['M'])+' '+str(dict_material['kappa_eta'])+"'\n"
     elif j == 136:
@@ -58,11 +62,186 @@ def Write_i(dict_algorithm, dict_material, dict_sample, dict_sollicitation):
     elif j == 227:
       line = line[:-1] + ' ' + str(dict_algorithm['dt_PF']) +'\n'
     file_to_write.write(line)
+  file_to_write.write(Write_Outputs(dict_algorithm))
 
   file_to_write.close()
 
 #-------------------------------------------------------------------------------
 
+def Write_Outputs(dict_algorithm):
+  '''
+  Generate the section [Outputs] of the .i file to run MOOSE simulation.
+
+  Only the data needed by the coupling are written, in one format (exodus or vtk), in the directory Output/Ite_i :
+    - out : the phase variables and the solute at the last step (at all steps if dict_algorithm['full_output'])
+    - Ed : the external energies at the first step
+  The material properties are sent to these two outputs in the section [GlobalParams].
+  It is assumed the sample is composed by only two grains.
+
+    Input :
+        a algorithm dictionnary (a dictionnary)
+    Output :
+        the section [Outputs] (a string)
+  '''
+  if dict_algorithm['read_exodus']:
+    type_output = '    type = Exodus\n'
+  else :
+    type_output = '    type = VTK\n    binary = ' + str(dict_algorithm['vtk_binary']).lower() + '\n'
+  #the files are written in the directory of the iteration
+  namefile = 'Output/Ite_'+str(dict_algorithm['i_PFDEM'])+'/'+dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])
+
+  outputs = '[Outputs]\n'
+  #phase variables and solute
+  outputs = outputs + '  [./out]\n' + type_output + '    file_base = ' + namefile + '_out\n'
+  if dict_algorithm['full_output']:
+    outputs = outputs + "    execute_on = 'timestep_end'\n"
+  else :
+    outputs = outputs + "    execute_on = 'final'\n"
+    outputs = outputs + "    show = 'eta1 eta2 c'\n"
+  outputs = outputs + '  [../]\n'
+  #external energies
+  outputs = outputs + '  [./Ed]\n' + type_output + '    file_base = ' + namefile + '_Ed\n'
+  outputs = outputs + "    execute_on = 'timestep_end'\n    end_step = 1\n    show = 'Ed_mec Ed_pre'\n  [../]\n[]\n"
+  return outputs
+
+#-------------------------------------------------------------------------------
+
+def Write_txt_data(dict_algorithm, dict_sample):
+    '''
+    Write the .txt files needed for MOOSE simulation.
+
+    The variables eta1, eta2, c, ep and kc are transmitted to the MOOSE simulation, in one pass on the fields.
+    The header is built once and shared by the files of eta1, eta2 and c, the axis of the files of ep and kc are compressed by Write_txt_compressed().
+    It is assumed the sample is composed by only two grains.
+
+        Input :
+            an algorithm dictionnary (a dict)
+            an sample dictionnary (a dict)
+        Output :
+            Nothing but .txt files are generated (five files)
+    '''
+    header = Header_txt(dict_sample['x_L'], dict_sample['y_L'])
+    L_name_field = [('eta1', dict_sample['L_g'][0].expand_etai_M()), ('eta2', dict_sample['L_g'][1].expand_etai_M()), ('c', dict_sample['solute_M'])]
+    for name, field_M in L_name_field:
+        Write_txt('Data/'+name+'_'+str(dict_algorithm['i_PFDEM'])+'.txt', header, field_M, dict_algorithm['n_digits_txt'])
+    #the fields ep and kc are piecewise constant, their axis are compressed
+    for name, field_M in [('ep', dict_sample['Emec_M']), ('kc', dict_sample['kc_M'])]:
+        Write_txt_compressed('Data/'+name+'_'+str(dict_algorithm['i_PFDEM'])+'.txt', field_M, dict_sample, dict_algorithm['n_digits_txt'])
+
+#-------------------------------------------------------------------------------
+
+def Header_txt(x_L, y_L):
+    '''
+    Build the header of the .txt files needed for MOOSE simulation (PiecewiseMultilinear function).
+
+        Input :
+            the axis x and y (two lists or numpy arrays)
+        Output :
+            the header with the axis X and Y (a string)
+    '''
+    return 'AXIS X\n'+' '.join([str(x) for x in x_L])+' \nAXIS Y\n'+' '.join([str(y) for y in y_L])+' \nDATA\n'
+
+#-------------------------------------------------------------------------------
+
+def Write_txt(FileToWrite, header, field_M, n_digits):
+    '''
+    Write a .txt file needed for MOOSE simulation.
+
+    The values are written one per line, from the line y_L[0] (the last line of the field) to the line y_L[-1].
+    With 17 significant digits, the values are written without loss (the float64 are read back exactly).
+
+        Input :
+            the name of the file (a string)
+            the header (a string)
+            the field (a n_y x n_x numpy array, the line l is at y_L[-1-l])
+            the number of significant digits (an int)
+        Output :
+            Nothing but a .txt file is generated (a file)
+    '''
+    file_to_write = open(FileToWrite,'w')
+    file_to_write.write(header)
+    #one line of the field per call of the format, the values are separated by a new line (same file as field_M[::-1].ravel(), faster)
+    np.savetxt(file_to_write, field_M[::-1], fmt='%.'+str(n_digits)+'g', delimiter='\n')
+    file_to_write.close()
+
+#-------------------------------------------------------------------------------
+
+def Write_txt_compressed(FileToWrite, field_M, dict_sample, n_digits):
+    '''
+    Write a .txt file needed for MOOSE simulation, with compressed axis.
+
+    The PiecewiseMultilinear function of MOOSE accepts non uniform axis.
+    In a run of identical lines (or columns), only the first and the last are kept : the multilinear interpolation gives the same field at the nodes of the mesh.
+    The field interpolated on the mesh is checked, the axis are not compressed if it does not match the field.
+
+        Input :
+            the name of the file (a string)
+            the field (a n_y x n_x numpy array, the line l is at y_L[-1-l])
+            a sample dictionnary (a dictionnary)
+            the number of significant digits (an int)
+        Output :
+            Nothing but a .txt file is generated (a file)
+    '''
+    #the line l is at y_L[l]
+    field_flip_M = field_M[::-1]
+    L_keep_y = Compress_axis(field_flip_M, 0)
+    L_keep_x = Compress_axis(field_flip_M, 1)
+    field_compressed_M = field_flip_M[np.ix_(L_keep_y, L_keep_x)]
+    #check the reconstruction
+    x_L = np.array(dict_sample['x_L'])
+    y_L = np.array(dict_sample['y_L'])
+    if not np.allclose(Interpolate_axis(Interpolate_axis(field_compressed_M, y_L[L_keep_y], y_L, 0), x_L[L_keep_x], x_L, 1), field_flip_M, rtol=1e-12, atol=0):
+        L_keep_y = np.ones(len(y_L), dtype=bool)
+        L_keep_x = np.ones(len(x_L), dtype=bool)
+    Write_txt(FileToWrite, Header_txt(x_L[L_keep_x], y_L[L_keep_y]), field_flip_M[np.ix_(L_keep_y, L_keep_x)][::-1], n_digits)
+
+#-------------------------------------------------------------------------------
+
+def Compress_axis(field_M, axis):
+    '''
+    Select the lines (or the columns) kept in a compressed axis.
+
+    A line is kept if it is at the limit of the mesh or if it is different of one of its neighbors.
+
+        Input :
+            the field (a n_y x n_x numpy array)
+            the axis compressed (an int, 0 for the lines, 1 for the columns)
+        Output :
+            the lines (or the columns) kept (a numpy array of bool)
+    '''
+    field_M = np.moveaxis(field_M, axis, 0)
+    L_diff = np.any(field_M[1:] != field_M[:-1], axis=1)
+    L_keep = np.zeros(field_M.shape[0], dtype=bool)
+    L_keep[0] = True
+    L_keep[-1] = True
+    L_keep[1:] = L_keep[1:] | L_diff
+    L_keep[:-1] = L_keep[:-1] | L_diff
+    return L_keep
+
+#-------------------------------------------------------------------------------
+
+def Interpolate_axis(field_M, L_axis_compressed, L_axis, axis):
+    '''
+    Interpolate linearly a field on a compressed axis, as the PiecewiseMultilinear function of MOOSE.
+
+        Input :
+            the field on the compressed axis (a numpy array)
+            the compressed axis (a numpy array)
+            the axis (a numpy array)
+            the axis interpolated (an int)
+        Output :
+            the field on the axis (a numpy array)
+    '''
+    field_M = np.moveaxis(field_M, axis, 0)
+    if len(L_axis_compressed) == 1:
+        return np.moveaxis(field_M[np.zeros(len(L_axis), dtype=int)], 0, axis)
+    i_1 = np.clip(np.searchsorted(L_axis_compressed, L_axis, side='right'), 1, len(L_axis_compressed)-1)
+    w = (L_axis-L_axis_compressed[i_1-1])/(L_axis_compressed[i_1]-L_axis_compressed[i_1-1])
+    w = w.reshape((-1,)+(1,)*(field_M.ndim-1))
+    return np.moveaxis((1-w)*field_M[i_1-1] + w*field_M[i_1], 0, axis)
+
+#-------------------------------------------------------------------------------
+
 def Write_eta_txt(dict_algorithm, dict_sample):
     '''
     Write a .txt file needed for MOOSE simulation.
@@ -76,41 +255,9 @@ def Write_eta_txt(dict_algorithm, dict_sample):
         Output :
             Nothing but a .txt file is generated (a file)
     '''
-    grain1 = dict_sample['L_g'][0]
-    grain2 = dict_sample['L_g'][1]
-
-    file_to_write_1 = open('Data/eta1_'+str(dict_algorithm['i_PFDEM'])+'.txt','w')
-    file_to_write_2 = open('Data/eta2_'+str(dict_algorithm['i_PFDEM'])+'.txt','w')
-    file_to_write_1.write('AXIS X\n')
-    file_to_write_2.write('AXIS X\n')
-    line = ''
-    for x in dict_sample['x_L']:
-        line = line + str(x)+ ' '
-    line = line + '\n'
-    file_to_write_1.write(line)
-    file_to_write_2.write(line)
-
-    file_to_write_1.write('AXIS Y\n')
-    file_to_write_2.write('AXIS Y\n')
-    line = ''
-    for y in dict_sample['y_L']:
-        line = line + str(y)+ ' '
-    line = line + '\n'
-    file_to_write_1.write(line)
-    file_to_write_2.write(line)
-
-    file_to_write_1.write('DATA\n')
-    file_to_write_2.write('DATA\n')
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-
-            #grain 1
-            file_to_write_1.write(str(grain1.etai_M[-1-l][c])+'\n')
-            #grain 2
-            file_to_write_2.write(str(grain2.etai_M[-1-l][c])+'\n')
-
-    file_to_write_1.close()
-    file_to_write_2.close()
+    header = Header_txt(dict_sample['x_L'], dict_sample['y_L'])
+    Write_txt('Data/eta1_'+str(dict_algorithm['i_PFDEM'])+'.txt', header, dict_sample['L_g'][0].expand_etai_M(), dict_algorithm['n_digits_txt'])
+    Write_txt('Data/eta2_'+str(dict_algorithm['i_PFDEM'])+'.txt', header, dict_sample['L_g'][1].expand_etai_M(), dict_algorithm['n_digits_txt'])
 
 #-------------------------------------------------------------------------------
 
@@ -126,27 +273,7 @@ def Write_solute_txt(dict_algorithm, dict_sample):
         Output :
             Nothing but a .txt file is generated (a file)
     '''
-    file_to_write = open('Data/c_'+str(dict_algorithm['i_PFDEM'])+'.txt','w')
-    file_to_write.write('AXIS X\n')
-    line = ''
-    for x in dict_sample['x_L']:
-        line = line + str(x)+ ' '
-    line = line + '\n'
-    file_to_write.write(line)
-
-    file_to_write.write('AXIS Y\n')
-    line = ''
-    for y in dict_sample['y_L']:
-        line = line + str(y)+ ' '
-    line = line + '\n'
-    file_to_write.write(line)
-
-    file_to_write.write('DATA\n')
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-            file_to_write.write(str(dict_sample['solute_M'][-1-l][c])+'\n')
-
-    file_to_write.close()
+    Write_txt('Data/c_'+str(dict_algorithm['i_PFDEM'])+'.txt', Header_txt(dict_sample['x_L'], dict_sample['y_L']), dict_sample['solute_M'], dict_algorithm['n_digits_txt'])
 
 #-------------------------------------------------------------------------------
 
@@ -164,28 +291,7 @@ def Write_Emec_txt(dict_algorithm, dict_sample):
         Output :
             Nothing but a .txt file is generated (a file)
     '''
-    #write data
-    file_to_write = open('Data/ep_'+str(dict_algorithm['i_PFDEM'])+'.txt','w')
-    file_to_write.write('AXIS X\n')
-    line = ''
-    for x in dict_sample['x_L']:
-        line = line + str(x)+ ' '
-    line = line + '\n'
-    file_to_write.write(line)
-
-    file_to_write.write('AXIS Y\n')
-    line = ''
-    for y in dict_sample['y_L']:
-        line = line + str(y)+ ' '
-    line = line + '\n'
-    file_to_write.write(line)
-
-    file_to_write.write('DATA\n')
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-            file_to_write.write(str(dict_sample['Emec_M'][-1-l][c])+'\n')
-
-    file_to_write.close()
+    Write_txt_compressed('Data/ep_'+str(dict_algorithm['i_PFDEM'])+'.txt', dict_sample['Emec_M'], dict_sample, dict_algorithm['n_digits_txt'])
 
 #-------------------------------------------------------------------------------
 
@@ -205,25 +311,4 @@ def Write_kc_txt(dict_algorithm, dict_sample):
         Output :
             Nothing but a .txt file is generated (a file)
     '''
-
-    file_to_write = open('Data/kc_'+str(dict_algorithm['i_PFDEM'])+'.txt','w')
-    file_to_write.write('AXIS X\n')
-    line = ''
-    for x in dict_sample['x_L']:
-        line = line + str(x)+ ' '
-    line = line + '\n'
-    file_to_write.write(line)
-
-    file_to_write.write('AXIS Y\n')
-    line = ''
-    for y in dict_sample['y_L']:
-        line = line + str(y)+ ' '
-    line = line + '\n'
-    file_to_write.write(line)
-
-    file_to_write.write('DATA\n')
-    for l in range(len(dict_sample['y_L'])):
-        for c in range(len(dict_sample['x_L'])):
-            file_to_write.write(str(dict_sample['kc_M'][-l-1][c])+'\n')
-
-    file_to_write.close()
+    Write_txt_compressed('Data/kc_'+str(dict_algorithm['i_PFDEM'])+'.txt', dict_sample['kc_M'], dict_sample, dict_algorithm['n_digits_txt'])
@@ -10,28 +10,13 @@ This file contains the different functions used in the simulation.
 #Librairy
 #-------------------------------------------------------------------------------
 
-from pathlib import Path
+import numpy as np
 import os
+import re
 import math
 
-#-------------------------------------------------------------------------------
-
-def index_to_str(j):
-  '''
-  An integer is converted to a float with 3 components
-
-    Input :
-        a number (a float)
-    Output :
-        a string with 3 components (a string)
-  '''
-  if j < 10:
-      j_str = '00'+str(j)
-  elif 10 <= j and j < 100:
-      j_str = '0'+str(j)
-  else :
-      j_str = str(j)
-  return j_str
+#work arrays reused by the functions of the simulation (see Get_buffer()), they are not saved with the sample
+dict_buffer = {}
 
 #-------------------------------------------------------------------------------
 
@@ -39,26 +24,38 @@ def Sort_Files(dict_algorithm):
      '''
      Sort files generated by MOOSE to different directories
 
+     The outputs are written by MOOSE directly in Output/Ite_i (file_base in Owntools.Write.Write_Outputs()), only the input file is moved.
+
         Input :
             an algorithm dictionnary (a dict)
         Output :
             Nothing but files are sorted
      '''
-
-     os.rename(dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'_out.e','Output/'+dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'_out.e')
      os.rename(dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'.i','Input/'+dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'.i')
-     j = 0
-     j_str = index_to_str(j)
-     filepath = Path(dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'.pvtu')
-     while filepath.exists():
-         for i_proc in range(dict_algorithm['np_proc']):
-            os.rename(dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'_'+str(i_proc)+'.vtu','Output/Ite_'+str(dict_algorithm['i_PFDEM'])+'/'+dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'_'+str(i_proc)+'.vtu')
-         os.rename(dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'.pvtu','Output/Ite_'+str(dict_algorithm['i_PFDEM'])+'/'+dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'.pvtu')
-         j = j + 1
-         j_str = index_to_str(j)
-         filepath = Path(dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str+'.pvtu')
-
-     return index_to_str(j-1)
+
+#-------------------------------------------------------------------------------
+
+def Last_Step_vtu(FileToRead):
+     '''
+     Look for the last step of a vtk output from MOOSE simulation.
+
+     The steps are found in one listing of the directory, the index of the step is read in the name of the .pvtu (it can have more than 3 digits).
+
+        Input :
+            the name of the output, without _step.pvtu (a string)
+        Output :
+            the name of the last step, without .pvtu (a string)
+            or a FileNotFoundError is raised if no step is found
+     '''
+     folder, name = os.path.split(FileToRead)
+     j_last = None
+     for file in os.listdir(folder if folder != '' else '.'):
+         match = re.fullmatch(re.escape(name)+r'_(\d+)\.pvtu', file)
+         if match is not None and (j_last is None or int(match.group(1)) > int(j_last)):
+             j_last = match.group(1)
+     if j_last is None:
+         raise FileNotFoundError('No vtk output '+FileToRead+'_<step>.pvtu is found, the MOOSE simulation may have failed!')
+     return FileToRead+'_'+j_last
 
 #-------------------------------------------------------------------------------
 
@@ -98,3 +95,94 @@ def Cosine_Profile(R,r,w):
     #inside the interface
     else :
         return 0.5*(1 + math.cos(math.pi*(r-R+w/2)/w))
+
+#-------------------------------------------------------------------------------
+
+def Cosine_Profile_M(R_M,r_M,w):
+    '''
+    Compute the phase field variable at several points.
+
+    This is the vectorized version of Cosine_Profile(), all the points are treated in one call.
+
+    Input :
+        the radius R of the grain in the direction of each point (a numpy array)
+        the distance r between each point and the center (a numpy array, same shape)
+        the width w of the interface (a float)
+    Output :
+        the value of the phase field variable at each point (a numpy array, same shape)
+    '''
+    #inside the interface
+    etai_M = 0.5*(1 + np.cos(math.pi*(r_M-R_M+w/2)/w))
+    #inside the grain
+    etai_M[r_M<R_M-w/2] = 1
+    #outside the grain
+    etai_M[r_M>R_M+w/2] = 0
+    return etai_M
+
+#-------------------------------------------------------------------------------
+
+def Get_buffer(name, shape, dtype = float):
+    '''
+    Give a work array, reused from a call to another.
+
+    The arrays are saved in the module (dict_buffer) and not in the dictionnaries, they are not saved with the simulation.
+    An array is enlarged if a larger shape is asked, else a view of it is given.
+    The content of the array is not initialized.
+
+        Input :
+            the name of the work array (a string)
+            the shape asked (a tuple of int)
+            the type of the array (a numpy dtype, optional)
+        Output :
+            the work array (a numpy array, view of the saved array)
+    '''
+    size = int(np.prod(shape))
+    if name not in dict_buffer or dict_buffer[name].size < size or dict_buffer[name].dtype != np.dtype(dtype):
+        dict_buffer[name] = np.empty(size, dtype = dtype)
+    return dict_buffer[name][:size].reshape(shape)
+
+#-------------------------------------------------------------------------------
+
+def Shift_Field(M, shift, axis, buffer_M):
+    '''
+    Translate a field along one axis by a (non integer) number of nodes.
+
+    The field is translated by the integer part of the shift and a linear interpolation is done for the remainder.
+    The mass is conserved (except the part going out of the domain). No information enters the domain, the nodes uncovered are equal to 0.
+    The field is updated in place, the only work array is the buffer given (no temporary array is created).
+
+        Input :
+            a field (a numpy array)
+            the shift in number of nodes, positive if the field goes to the larger indices (a float)
+            the axis of the translation (an int)
+            a buffer with the same shape than the field (a numpy array, its content is overwritten)
+        Output :
+            Nothing but the field is updated
+    '''
+    #work on the first axis
+    M_view = np.moveaxis(M, axis, 0)
+    buffer_view = np.moveaxis(buffer_M, axis, 0)
+    n = len(M_view)
+    n_shift = math.floor(shift)
+    remainder = shift - n_shift
+
+    #the node c gets (1-remainder) of the node c-n_shift and remainder of the node c-n_shift-1
+    buffer_view[...] = M_view
+    M_view[...] = 0
+    L_term = []
+    for i_shift, weight in [(n_shift, 1-remainder), (n_shift+1, remainder)]:
+        if weight == 0 or abs(i_shift) >= n:
+            continue
+        if i_shift >= 0:
+            L_term.append((M_view[i_shift:], buffer_view[:n-i_shift], weight))
+        else :
+            L_term.append((M_view[:n+i_shift], buffer_view[-i_shift:], weight))
+    #the first term is written directly in the field, the buffer is not modified
+    if len(L_term) > 0:
+        M_dest, buffer_source, weight = L_term[0]
+        np.multiply(buffer_source, weight, out = M_dest)
+    #the buffer is not needed anymore, it is scaled in place for the second term (no temporary array, no division)
+    if len(L_term) > 1:
+        M_dest, buffer_source, weight = L_term[1]
+        buffer_source *= weight
+        M_dest += buffer_source
@@ -13,7 +13,7 @@
 
 [GlobalParams]
   # let's output all material properties for demonstration purposes
-  outputs = exodus
+  outputs =
 []
 
 [Variables]
@@ -228,10 +228,3 @@
   [../]
 []
 
-[Outputs]
-  execute_on = 'timestep_end'
-  exodus = true
-  [./other]
-    type = VTK
-  [../]
-[]
@@ -48,11 +48,14 @@ def All_parameters():
 
     #approximatively the number of vertices for one grain during DEM simulation
     grain_discretisation = 80
+    #method to compute the surface and the center of mass of a grain
+    method_surface_center = 'shoelace' #shoelace (exact) or monte_carlo
 
     dict_sample = {
     'x_L' : x_L,
     'y_L' : y_L,
     'grain_discretisation' : grain_discretisation,
+    'method_surface_center' : method_surface_center,
     'Emec_M' : np.array(np.zeros((len(y_L),len(x_L)))),
     'Eche_M' : np.array(np.zeros((len(y_L),len(x_L)))),
     'Ed_M' : np.array(np.zeros((len(y_L),len(x_L))))
@@ -62,6 +65,11 @@ def All_parameters():
     #Algorithm parameters
 
     np_proc = 4 #number of processor used
+    n_proc_read = 4 #number of processes reading the output of MOOSE (1 to read in serial)
+    read_exodus = True #output of MOOSE in an exodus file (netCDF4 needed, else vtk files are used) or in vtk files
+    vtk_binary = True #output vtk of MOOSE in binary (smaller and faster to read) or in ascii
+    full_output = False #MOOSE writes all the time steps (debug) or only the last one
+    n_digits_txt = 17 #number of significant digits of the fields sent to MOOSE (17 is exact, less gives smaller files)
     n_t_PFDEM = 200 #number of cycle PF-DEM
 
     #Time step for phase field
@@ -80,9 +88,7 @@ def All_parameters():
     c_min = 0
     c_max = 0.1
 
-    #Margin for sphericity study
-    sphericity_margin = 0.05
-    #Discretisation to find the inscribing (number of nodes in one direction)
+    #Grid used to find the inscribing with a distance transform, refined near the best node (number of nodes in one direction)
     n_spatial_inscribing = 100
 
     #structural element for dilation
@@ -111,9 +117,13 @@ def All_parameters():
     'struct_element' : struct_element,
     'c_min' : c_min,
     'c_max' : c_max,
-    'sphericity_margin' : sphericity_margin,
     'n_spatial_inscribing' : n_spatial_inscribing,
     'np_proc' : np_proc,
+    'n_proc_read' : n_proc_read,
+    'read_exodus' : read_exodus,
+    'vtk_binary' : vtk_binary,
+    'full_output' : full_output,
+    'n_digits_txt' : n_digits_txt,
     'SaveData' : SaveData,
     'cleanData' : cleanData,
     'namefile' : namefile,
@@ -154,7 +164,9 @@ def All_parameters():
     Energy_barrier = 20*kappa_eta/(width_int)**2
     #Diffusion of c, the solute generated by the dissolution
     kappa_c = 50
-    method_to_compute_kc = 'dilation' #dilation or interpolation
+    method_to_compute_kc = 'dilation' #dilation, wfd or interpolation
+    #Definition of the width of the water film centered on x = 0 (for wfd)
+    width_wfd = width_int
     #Definition of the evolution of the penalty term inside a grain (for interpolation)
     tau_kappa_c = 5 #kc = kc0 e(-(R_i-d)/R_i/tau_kappa_c)
     #Define the spring value
@@ -169,6 +181,7 @@ def All_parameters():
     'kappa_c' : kappa_c,
     'tau_kappa_c' : tau_kappa_c,
     'method_to_compute_kc' : method_to_compute_kc,
+    'width_wfd' : width_wfd,
     'Energy_barrier' : Energy_barrier,
     'Y' : Y,
     'nu' : nu
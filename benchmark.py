@@ -0,0 +1,1453 @@
+# -*- coding: utf-8 -*-
+"""
+@author: Alexandre Sac--Morane
+alexandre.sac-morane@uclouvain.be
+
+This is the benchmark file to compare the time cost of some functions with their former implementation.
+
+The former implementations are kept here as references.
+Run all benchmarks with python benchmark.py or only some of them with python benchmark.py name1 name2.
+"""
+
+#-------------------------------------------------------------------------------
+#Librairy
+#-------------------------------------------------------------------------------
+
+import numpy as np
+import math
+import random
+import os
+import shutil
+import sys
+import time
+import base64
+import zlib
+import scipy.io
+import scipy.ndimage
+
+#own functions and classes
+import User
+import Owntools
+import Owntools.Compute
+import Owntools.Geometry
+import Owntools.PFtoDEM_Multi
+import Owntools.Write
+import Grain
+
+#-------------------------------------------------------------------------------
+#Tools
+#-------------------------------------------------------------------------------
+
+def Build_dicts(nx, ny):
+    '''
+    Generate the dictionnaries of the simulation with a given spatial discretisation.
+
+        Input :
+            the number of nodes in the x direction (an integer)
+            the number of nodes in the y direction (an integer)
+        Output :
+            an algorithm dictionnary (a dictionnary)
+            a material dictionnary (a dictionnary)
+            a sample dictionnary (a dictionnary)
+            a sollicitation dictionnary (a dictionnary)
+    '''
+    dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+    x_L = np.linspace(min(dict_sample['x_L']),max(dict_sample['x_L']),nx)
+    y_L = np.linspace(min(dict_sample['y_L']),max(dict_sample['y_L']),ny)
+    dict_sample['x_L'] = x_L
+    dict_sample['y_L'] = y_L
+    dict_sample['Emec_M'] = np.array(np.zeros((len(y_L),len(x_L))))
+    dict_sample['Eche_M'] = np.array(np.zeros((len(y_L),len(x_L))))
+    dict_sample['Ed_M'] = np.array(np.zeros((len(y_L),len(x_L))))
+    #the interface width depends on the mesh
+    dict_material['w'] = math.sqrt((x_L[4]-x_L[0])**2+(y_L[4]-y_L[0])**2)
+    return dict_algorithm, dict_material, dict_sample, dict_sollicitation
+
+#-------------------------------------------------------------------------------
+
+def Timer(function, *args):
+    '''
+    Measure the time cost of a function call.
+
+        Input :
+            a function (a function)
+            the arguments of the function
+        Output :
+            the time spent in sec (a float)
+            the output of the function
+    '''
+    tic = time.perf_counter()
+    result = function(*args)
+    tac = time.perf_counter()
+    return tac-tic, result
+
+#-------------------------------------------------------------------------------
+
+def Write_vtu(FileToWrite, dict_sample, dict_field, np_proc, binary=False):
+    '''
+    Write synthetic files with the format of the .vtu files from MOOSE simulation (one per processor) and their .pvtu index.
+
+    The mesh is cut in np_proc bands of lines, the nodes at the limit of two bands are in both files.
+    In binary, the data are appended, compressed by zlib (blocks of 32 kB) and encoded in base64, as the default of VTK.
+
+        Input :
+            the name of the file to write, without .pvtu or _i_proc.vtu (a string)
+            a sample dictionnary (a dictionnary)
+            the fields to write (a dictionnary of n_y x n_x numpy arrays, the line l is at y_L[-1-l])
+            the number of processors (an int)
+            a boolean to write in binary or in ascii (a bool)
+        Output :
+            Nothing but the files are written
+    '''
+    n_y = len(dict_sample['y_L'])
+    L_limit = np.linspace(0, n_y-1, np_proc+1).astype(int)
+    for i_proc in range(np_proc):
+        #nodes of this processor
+        L_l = np.arange(L_limit[i_proc], L_limit[i_proc+1]+1)
+        l_M, c_M = np.meshgrid(L_l, np.arange(len(dict_sample['x_L'])), indexing='ij')
+        L_points = np.column_stack((np.array(dict_sample['x_L'])[c_M.flatten()], np.array(dict_sample['y_L'])[n_y-1-l_M.flatten()], np.zeros(l_M.size)))
+        dict_array = {}
+        for name in dict_field:
+            dict_array[name] = dict_field[name][l_M.flatten(), c_M.flatten()]
+        dict_array['Points'] = L_points.flatten()
+        L_data = []
+        appended = b''
+        for name in dict_array:
+            L_value = dict_array[name]
+            if binary:
+                values = L_value.astype('<f8').tobytes()
+                L_block = [zlib.compress(values[i:i+32768]) for i in range(0, len(values), 32768)]
+                L_header = [len(L_block), 32768, len(values)-32768*(len(L_block)-1)] + [len(block) for block in L_block]
+                L_data.append(f'format="appended" RangeMin="0" RangeMax="1" offset="{len(appended)}">\n')
+                appended = appended + base64.b64encode(np.array(L_header, dtype='<u4').tobytes()) + base64.b64encode(b''.join(L_block))
+            else :
+                L_line = ['          '+' '.join([repr(float(value)) for value in L_value[i:i+6]])+'\n' for i in range(0, len(L_value), 6)]
+                L_data.append('format="ascii" RangeMin="0" RangeMax="1">\n'+''.join(L_line))
+        f = open(f'{FileToWrite}_{i_proc}.vtu','wb')
+        if binary:
+            f.write(b'<?xml version="1.0"?>\n<VTKFile type="UnstructuredGrid" version="0.1" byte_order="LittleEndian" header_type="UInt32" compressor="vtkZLibDataCompressor">\n  <UnstructuredGrid>\n')
+        else :
+            f.write(b'<?xml version="1.0"?>\n<VTKFile type="UnstructuredGrid" version="0.1" byte_order="LittleEndian" header_type="UInt32">\n  <UnstructuredGrid>\n')
+        f.write(f'    <Piece NumberOfPoints="{len(L_points)}" NumberOfCells="0">\n      <PointData>\n'.encode())
+        for i_name, name in enumerate(dict_field):
+            f.write(f'        <DataArray type="Float64" Name="{name}" {L_data[i_name]}        </DataArray>\n'.encode())
+        f.write(f'      </PointData>\n      <Points>\n        <DataArray type="Float64" Name="Points" NumberOfComponents="3" {L_data[-1]}'.encode())
+        f.write(b'          <InformationKey name="L2_NORM_RANGE" location="vtkDataArray" length="2">\n            <Value index="0">\n              0\n            </Value>\n          </InformationKey>\n')
+        f.write(b'        </DataArray>\n      </Points>\n    </Piece>\n  </UnstructuredGrid>\n')
+        if binary:
+            f.write(b'  <AppendedData encoding="base64">\n   _'+appended+b'\n  </AppendedData>\n')
+        f.write(b'</VTKFile>\n')
+        f.close()
+    f = open(f'{FileToWrite}.pvtu','w')
+    f.write('<?xml version="1.0"?>\n<VTKFile type="PUnstructuredGrid" version="0.1" byte_order="LittleEndian" header_type="UInt32">\n  <PUnstructuredGrid GhostLevel="0">\n')
+    for i_proc in range(np_proc):
+        f.write(f'    <Piece Source="{os.path.basename(FileToWrite)}_{i_proc}.vtu"/>\n')
+    f.write('  </PUnstructuredGrid>\n</VTKFile>\n')
+    f.close()
+
+def Write_exodus(FileToWrite, dict_sample, L_dict_field, L_dict_field_elem):
+    '''
+    Write a synthetic exodus file with the format of the exodus file from MOOSE simulation (netCDF classic).
+
+    The mesh is made of quadrangles, the elements are in one block.
+
+        Input :
+            the name of the file to write, with .e (a string)
+            a sample dictionnary (a dictionnary)
+            the nodal fields at each time step (a list of dictionnaries of n_y x n_x numpy arrays, the line l is at y_L[-1-l])
+            the elemental fields at each time step (a list of dictionnaries of n_y-1 x n_x-1 numpy arrays)
+        Output :
+            Nothing but the file is written
+    '''
+    n_x = len(dict_sample['x_L'])
+    n_y = len(dict_sample['y_L'])
+    #nodes numbered from the bottom line, the line l of the fields is at y_L[-1-l]
+    l_M, c_M = np.meshgrid(np.arange(n_y-1, -1, -1), np.arange(n_x), indexing='ij')
+    node_M = np.arange(n_x*n_y).reshape(n_y, n_x) + 1
+    connect = np.column_stack((node_M[:-1,:-1].flatten(), node_M[:-1,1:].flatten(), node_M[1:,1:].flatten(), node_M[1:,:-1].flatten()))
+    exodus = scipy.io.netcdf_file(FileToWrite, 'w')
+    exodus.createDimension('time_step', None)
+    exodus.createDimension('num_nodes', n_x*n_y)
+    exodus.createDimension('num_el_in_blk1', len(connect))
+    exodus.createDimension('num_nod_per_el1', 4)
+    exodus.createDimension('num_nod_var', len(L_dict_field[0]))
+    exodus.createDimension('num_elem_var', len(L_dict_field_elem[0]))
+    exodus.createDimension('len_name', 33)
+    exodus.createVariable('coordx', 'd', ('num_nodes',))[:] = np.array(dict_sample['x_L'])[c_M.flatten()]
+    exodus.createVariable('coordy', 'd', ('num_nodes',))[:] = np.array(dict_sample['y_L'])[n_y-1-l_M.flatten()]
+    exodus.createVariable('connect1', 'i', ('num_el_in_blk1','num_nod_per_el1'))[:] = connect
+    exodus.createVariable('name_nod_var', 'c', ('num_nod_var','len_name'))[:] = np.array([list(name.ljust(33, chr(0))) for name in L_dict_field[0]], dtype='S1')
+    exodus.createVariable('name_elem_var', 'c', ('num_elem_var','len_name'))[:] = np.array([list(name.ljust(33, chr(0))) for name in L_dict_field_elem[0]], dtype='S1')
+    for i_name, name in enumerate(L_dict_field[0]):
+        exodus.createVariable(f'vals_nod_var{i_name+1}', 'd', ('time_step','num_nodes'))[:] = [dict_field[name][l_M.flatten(), c_M.flatten()] for dict_field in L_dict_field]
+    for i_name, name in enumerate(L_dict_field_elem[0]):
+        exodus.createVariable(f'vals_elem_var{i_name+1}eb1', 'd', ('time_step','num_el_in_blk1'))[:] = [dict_field[name][::-1].flatten() for dict_field in L_dict_field_elem]
+    exodus.close()
+
+#-------------------------------------------------------------------------------
+
+#-------------------------------------------------------------------------------
+#Former implementations
+#-------------------------------------------------------------------------------
+
+def build_etai_M_loop(grain,dict_material,dict_sample):
+    '''
+    Former implementation of Grain.build_etai_M() with a loop on the nodes.
+
+        Input :
+            a grain (a grain)
+            a material dictionnary (a dictionnary)
+            a sample dictionnary (a dictionnary)
+        Output :
+            the phase field of the grain (a n_y x n_x numpy array)
+    '''
+    etai_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
+
+    x_min = min(grain.l_border_x)-dict_material['w']
+    x_max = max(grain.l_border_x)+dict_material['w']
+    y_min = min(grain.l_border_y)-dict_material['w']
+    y_max = max(grain.l_border_y)+dict_material['w']
+
+    x_L_search_min = abs(np.array(dict_sample['x_L'])-x_min)
+    x_L_search_max = abs(np.array(dict_sample['x_L'])-x_max)
+    y_L_search_min = abs(np.array(dict_sample['y_L'])-y_min)
+    y_L_search_max = abs(np.array(dict_sample['y_L'])-y_max)
+
+    i_x_min = list(x_L_search_min).index(min(x_L_search_min))
+    i_x_max = list(x_L_search_max).index(min(x_L_search_max))
+    i_y_min = list(y_L_search_min).index(min(y_L_search_min))
+    i_y_max = list(y_L_search_max).index(min(y_L_search_max))
+
+    for l in range(i_y_min,i_y_max+1):
+        for c in range(i_x_min,i_x_max+1):
+            y = dict_sample['y_L'][-1-l]
+            x = dict_sample['x_L'][c]
+            p = np.array([x,y])
+            r = np.linalg.norm(grain.center - p)
+            if p[1]>grain.center[1]:
+                theta = math.acos((p[0]-grain.center[0])/np.linalg.norm(grain.center-p))
+            else :
+                theta= 2*math.pi - math.acos((p[0]-grain.center[0])/np.linalg.norm(grain.center-p))
+            L_theta_R_i = list(abs(np.array(grain.l_theta_r)-theta))
+            R = grain.l_r[L_theta_R_i.index(min(L_theta_R_i))]
+            etai_M[l][c] = Owntools.Cosine_Profile(R,r,dict_material['w'])
+    return etai_M
+
+#-------------------------------------------------------------------------------
+
+def border_scan_loop(grain,dict_sample):
+    '''
+    Former extraction of the grain border in Grain.geometric_study().
+
+    The lines then the columns are scanned, the points are ordered by nearest neighbour, the far points are deleted and the border is decimated.
+
+        Input :
+            a grain (a grain)
+            a sample dictionnary (a dictionnary)
+        Output :
+            the border of the grain (a list of 2 x 1 numpy array)
+    '''
+    n = dict_sample['grain_discretisation']
+    x_L = dict_sample['x_L']
+    y_L = dict_sample['y_L']
+    etai_M = grain.expand_etai_M()
+
+    L_border_old = []
+    for y_i in range(len(y_L)):
+        L_extract_x = etai_M[y_i][:]
+        if max(L_extract_x)>0.5 and min(L_extract_x)<0.5:
+            y_intersect = y_L[len(y_L)-1-y_i]
+            for x_i in range(len(x_L)-1):
+                if (L_extract_x[x_i]-0.5)*(L_extract_x[x_i+1]-0.5)<0:
+                    x_intersect = (0.5-L_extract_x[x_i])/(L_extract_x[x_i+1]-L_extract_x[x_i])*\
+                                (x_L[x_i+1]-x_L[x_i]) + x_L[x_i]
+                    L_border_old.append(np.array([x_intersect,y_intersect]))
+
+    for x_i in range(len(x_L)):
+        L_extract_y = []
+        for y_i in range(len(y_L)):
+            L_extract_y.append(etai_M[y_i][x_i])
+        if max(L_extract_y)>0.5 and min(L_extract_y)<0.5:
+            x_intersect = x_L[x_i]
+            for y_i in range(len(y_L)-1):
+                if (L_extract_y[y_i]-0.5)*(L_extract_y[y_i+1]-0.5)<0:
+                    y_intersect = (0.5-L_extract_y[y_i])/(L_extract_y[y_i+1]-L_extract_y[y_i])*\
+                                (y_L[len(y_L)-1-y_i-1]-y_L[len(y_L)-1-y_i]) + y_L[len(y_L)-1-y_i]
+                    L_border_old.append(np.array([x_intersect,y_intersect]))
+
+    L_id_used = [0]
+    L_border = [L_border_old[0]]
+    HighValue = 100000000
+    current_node = L_border_old[0]
+    for j in range(1,len(L_border_old)):
+        L_d = list(np.zeros(len(L_border_old)))
+        for i in range(0,len(L_border_old)):
+            node = L_border_old[i]
+            if  i not in L_id_used:
+                L_d[i] = np.linalg.norm(node - current_node)
+            else :
+                L_d[i] = HighValue
+        index_nearest_node = L_d.index(min(L_d))
+        nearest_node = L_border_old[index_nearest_node]
+        current_node = nearest_node
+        L_border.append(nearest_node)
+        L_id_used.append(index_nearest_node)
+
+    L_d_final = []
+    for i in range(len(L_border)-1):
+        L_d_final.append(np.linalg.norm(L_border[i+1] - L_border[i]))
+    d_final_mean = np.mean(L_d_final)
+    while np.max(L_d_final) > 5 * d_final_mean :
+        i_error = L_d_final.index(np.max(L_d_final))+1
+        L_border.pop(i_error)
+        L_id_used.pop(i_error)
+        L_d_final = []
+        for i in range(len(L_border)-1):
+            L_d_final.append(np.linalg.norm(L_border[i+1] - L_border[i]))
+
+    Perimeter = 0
+    for i_p in range(len(L_border)-1):
+        Perimeter = Perimeter + np.linalg.norm(L_border[i_p+1]-L_border[i_p])
+    Perimeter = Perimeter + np.linalg.norm(L_border[-1]-L_border[0])
+    distance_min = Perimeter/n
+    L_border_adapted = [L_border[0]]
+    for p in L_border[1:]:
+        distance = np.linalg.norm(p-L_border_adapted[-1])
+        if distance >= distance_min:
+            L_border_adapted.append(p)
+    L_border = L_border_adapted
+    L_border.append(L_border[0])
+    return L_border
+
+#-------------------------------------------------------------------------------
+
+def border_marching_squares(grain,dict_sample):
+    '''
+    Current extraction of the grain border in Grain.geometric_study().
+
+        Input :
+            a grain (a grain)
+            a sample dictionnary (a dictionnary)
+        Output :
+            the border of the grain (a (n+1) x 2 numpy array)
+    '''
+    L_contour = Owntools.Geometry.Marching_Squares(grain.expand_etai_M(), dict_sample['x_L'], dict_sample['y_L'], 0.5)
+    L_border = L_contour[np.argmax([len(contour) for contour in L_contour])]
+    return Owntools.Geometry.Resample_Polygon(L_border, dict_sample['grain_discretisation'])
+
+#-------------------------------------------------------------------------------
+
+def Compute_S_int_loop(dict_sample):
+    '''
+    Former implementation of Owntools.Compute.Compute_S_int() with a loop on the Monte Carlo points.
+
+        Input :
+            a sample dictionnary (a dict)
+        Output :
+            the intersection surface (a float)
+    '''
+    box_min_x = min(dict_sample['L_g'][1].l_border_x)
+    box_max_x = max(dict_sample['L_g'][0].l_border_x)
+    box_min_y = min(dict_sample['L_g'][0].l_border_y)
+    box_max_y = max(dict_sample['L_g'][0].l_border_y)
+    N_MonteCarlo = 5000
+    M_Mass = 0
+    for i in range(N_MonteCarlo):
+        P = np.array([random.uniform(box_min_x,box_max_x),random.uniform(box_min_y,box_max_y)])
+        if dict_sample['L_g'][0].P_is_inside(P) and dict_sample['L_g'][1].P_is_inside(P):
+            M_Mass = M_Mass + 1
+    return (box_max_x-box_min_x)*(box_max_y-box_min_y)/N_MonteCarlo*M_Mass
+
+#-------------------------------------------------------------------------------
+
+def Compute_S_int_monte_carlo(dict_sample, N_MonteCarlo=5000):
+    '''
+    Former implementation of Owntools.Compute.Compute_S_int() with the Monte Carlo points treated together.
+
+        Input :
+            a sample dictionnary (a dict)
+            the number of Monte Carlo points (an int)
+        Output :
+            the intersection surface (a float)
+    '''
+    box_min_x = min(dict_sample['L_g'][1].l_border_x)
+    box_max_x = max(dict_sample['L_g'][0].l_border_x)
+    box_min_y = min(dict_sample['L_g'][0].l_border_y)
+    box_max_y = max(dict_sample['L_g'][0].l_border_y)
+    L_P = np.column_stack((np.random.uniform(box_min_x,box_max_x,N_MonteCarlo),np.random.uniform(box_min_y,box_max_y,N_MonteCarlo)))
+    L_P_inside = dict_sample['L_g'][0].P_is_inside_many(L_P) & dict_sample['L_g'][1].P_is_inside_many(L_P)
+    return (box_max_x-box_min_x)*(box_max_y-box_min_y)/N_MonteCarlo*np.sum(L_P_inside)
+
+#-------------------------------------------------------------------------------
+
+def map_inscribing_loop(grain,n_spatial_inscribing):
+    '''
+    Former computation of the maximum inscribed circle map in Grain.Compute_sphericity().
+
+        Input :
+            a grain (a grain)
+            the discretisation of the map (an int)
+        Output :
+            the distance map to the nearest border vertex (a n_spatial_inscribing x n_spatial_inscribing numpy array)
+    '''
+    l_x_inscribing = np.linspace(min(grain.l_border_x),max(grain.l_border_x),n_spatial_inscribing)
+    l_y_inscribing = np.linspace(min(grain.l_border_y),max(grain.l_border_y),n_spatial_inscribing)
+    map_inscribing = np.zeros((n_spatial_inscribing,n_spatial_inscribing))
+    for i_x in range(n_spatial_inscribing):
+        for i_y in range(n_spatial_inscribing):
+            p = np.array([l_x_inscribing[i_x], l_y_inscribing[-1-i_y]])
+            if grain.P_is_inside(p):
+                MinDistance = None
+                for q in grain.l_border[:-1]:
+                    Distance = np.linalg.norm(p-q)
+                    if MinDistance == None or Distance < MinDistance:
+                        MinDistance = Distance
+                map_inscribing[-1-i_y][i_x] = MinDistance
+    return map_inscribing
+
+#-------------------------------------------------------------------------------
+
+def move_grain_interpolation_loop(grain,displacement,dict_sample):
+    '''
+    Former implementation of Grain.move_grain_interpolation(), the field is only translated over x with loops.
+
+        Input :
+            a grain (a grain)
+            the displacement asked (a 2 x 1 numpy array)
+            a sample dictionnary (a dictionnary)
+        Output :
+            Nothing but the grain gets an updated attribute (a n_y x n_x numpy array)
+    '''
+    dx = dict_sample['x_L'][1]-dict_sample['x_L'][0]
+    n_dx_disp_x = int(abs(displacement[0])//dx)
+    disp_x_remainder = abs(displacement[0])%dx
+    etai_M = grain.expand_etai_M()
+    etai_M_old = etai_M.copy()
+    if np.sign(displacement[0]) > 0 :
+        if n_dx_disp_x > 0:
+            for l in range(len(dict_sample['y_L'])):
+                etai_M[l][:n_dx_disp_x] = 0
+                etai_M[l][n_dx_disp_x:] = etai_M_old[l][:-n_dx_disp_x]
+        etai_M_old = etai_M.copy()
+        for l in range(len(dict_sample['y_L'])):
+            for c in range(1,len(dict_sample['x_L'])):
+                etai_M[l][c] = (etai_M_old[l][c]*(dx-disp_x_remainder) + etai_M_old[l][c-1]*disp_x_remainder)/dx
+            etai_M[l][0] = 0
+    else :
+        if n_dx_disp_x > 0:
+            for l in range(len(dict_sample['y_L'])):
+                etai_M[l][-n_dx_disp_x:] = 0
+                etai_M[l][:-n_dx_disp_x] = etai_M_old[l][n_dx_disp_x:]
+        etai_M_old = etai_M.copy()
+        for l in range(len(dict_sample['y_L'])):
+            for c in range(len(dict_sample['x_L'])-1):
+                etai_M[l][c] = (etai_M_old[l][c]*(dx-disp_x_remainder) + etai_M_old[l][c+1]*disp_x_remainder)/dx
+            #nothing enters from the right (the former loop cleared the column 0 instead)
+            etai_M[l][-1] = etai_M_old[l][-1]*(dx-disp_x_remainder)/dx
+    grain.set_etai_M(etai_M)
+
+def field_PFtoDEM_loop(FileToRead,field,dict_algorithm,dict_sample):
+    '''
+    Former reading of a field in the files from MOOSE simulation (Grain.PFtoDEM_Multi(), solute_PFtoDEM_Multi()).
+
+    The files are parsed character by character and the nearest node is searched in lists.
+
+        Input :
+            the name of the file to read, without _i_proc.vtu (a string)
+            the name of the field (a string)
+            an algorithm dictionnary (a dictionnary)
+            a sample dictionnary (a dictionnary)
+        Output :
+            the field on the mesh (a n_y x n_x numpy array)
+    '''
+    field_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
+    id_L = None
+    selector = '        <DataArray type="Float64" Name="'+field+'"'
+    for i_proc in range(dict_algorithm['np_proc']):
+        L_Work = [[],[],[]]
+        f = open(f'{FileToRead}_{i_proc}.vtu','r')
+        data = f.read()
+        f.close()
+        lines = data.splitlines()
+        for line in lines:
+            if line[0:len(selector)] == selector:
+                id_L = 2
+            elif line[0:len('        <DataArray type="Float64" Name="Points"')] == '        <DataArray type="Float64" Name="Points"':
+                id_L = 0
+            elif (line[0:len('        </DataArray>')] == '        </DataArray>' or  line[0:len('          <InformationKey')] == '          <InformationKey') and id_L != None:
+                id_L = None
+            elif line[0:len('          ')] == '          ' and id_L == 2:
+                line = line[len('          '):]
+                c_start = 0
+                for c_i in range(0,len(line)):
+                    if line[c_i]==' ':
+                        L_Work[id_L].append(float(line[c_start:c_i]))
+                        c_start = c_i+1
+                L_Work[id_L].append(float(line[c_start:]))
+            elif line[0:len('          ')] == '          ' and id_L == 0:
+                line = line[len('          '):]
+                XYZ_temp = []
+                c_start = 0
+                for c_i in range(0,len(line)):
+                    if line[c_i]==' ':
+                        XYZ_temp.append(float(line[c_start:c_i]))
+                        if len(XYZ_temp)==3:
+                            L_Work[0].append(XYZ_temp[0])
+                            L_Work[1].append(XYZ_temp[1])
+                            XYZ_temp = []
+                        c_start = c_i+1
+                XYZ_temp.append(float(line[c_start:]))
+                L_Work[0].append(XYZ_temp[0])
+                L_Work[1].append(XYZ_temp[1])
+        for i in range(len(L_Work[0])):
+            L_dy = []
+            for y_i in dict_sample['y_L'] :
+                L_dy.append(abs(y_i - L_Work[1][i]))
+            L_dx = []
+            for x_i in dict_sample['x_L'] :
+                L_dx.append(abs(x_i - L_Work[0][i]))
+            field_M[-1-list(L_dy).index(min(L_dy))][list(L_dx).index(min(L_dx))] = L_Work[2][i]
+    return field_M
+
+def DataArray_char_loop(FileToRead):
+    '''
+    Former parsing of the field c and of the points in a .vtu file, character by character (in Plot_Diffusion_Solute()).
+
+        Input :
+            the name of the file to read (a string)
+        Output :
+            the field c (a n numpy array)
+            the coordinates of the points (a n x 3 numpy array)
+    '''
+    L_Work = [[],[],[]]
+    id_L = None
+    f = open(FileToRead,'r')
+    data = f.read()
+    f.close()
+    for line in data.splitlines():
+        if line[0:len('        <DataArray type="Float64" Name="c')] == '        <DataArray type="Float64" Name="c':
+            id_L = 2
+        elif line[0:len('        <DataArray type="Float64" Name="Points"')] == '        <DataArray type="Float64" Name="Points"':
+            id_L = 0
+        elif (line[0:len('        </DataArray>')] == '        </DataArray>' or  line[0:len('          <InformationKey')] == '          <InformationKey') and id_L != None:
+            id_L = None
+        elif line[0:len('          ')] == '          ' and id_L != None:
+            line = line[len('          '):]
+            c_start = 0
+            for c_i in range(0,len(line)):
+                if line[c_i]==' ':
+                    L_Work[id_L].append(float(line[c_start:c_i]))
+                    c_start = c_i+1
+            L_Work[id_L].append(float(line[c_start:]))
+    return np.array(L_Work[2]), np.array(L_Work[0]).reshape(-1,3)
+
+#-------------------------------------------------------------------------------
+
+def Write_txt_loop(FileToWrite, field_M, dict_sample):
+    '''
+    Former implementation of the writers of the .txt files needed for MOOSE simulation, one write per node.
+
+        Input :
+            the name of the file (a string)
+            the field (a n_y x n_x numpy array)
+            a sample dictionnary (a dictionnary)
+        Output :
+            Nothing but a .txt file is generated (a file)
+    '''
+    file_to_write = open(FileToWrite,'w')
+    file_to_write.write('AXIS X\n')
+    line = ''
+    for x in dict_sample['x_L']:
+        line = line + str(x)+ ' '
+    line = line + '\n'
+    file_to_write.write(line)
+    file_to_write.write('AXIS Y\n')
+    line = ''
+    for y in dict_sample['y_L']:
+        line = line + str(y)+ ' '
+    line = line + '\n'
+    file_to_write.write(line)
+    file_to_write.write('DATA\n')
+    for l in range(len(dict_sample['y_L'])):
+        for c in range(len(dict_sample['x_L'])):
+            file_to_write.write(str(field_M[-1-l][c])+'\n')
+    file_to_write.close()
+
+#-------------------------------------------------------------------------------
+
+def sum_min_etai_Emec_loop(dict_sample, dict_sollicitation):
+    '''
+    Former implementation of Owntools.Compute.Compute_sum_min_etai_Emec(), one min per node and twice.
+
+    The phase fields are expanded on the mesh once, the loops on the nodes are kept.
+
+        Input :
+            a sample dictionnary (a dictionnary)
+            a sollicitation dictionnary (a dictionnary)
+        Output :
+            the sum of the minimum of etai (a float)
+            the mechanical energy map (a ny x nx numpy array)
+    '''
+    eta1_M = dict_sample['L_g'][0].expand_etai_M()
+    eta2_M = dict_sample['L_g'][1].expand_etai_M()
+    sum_min_etai = 0
+    for l in range(len(dict_sample['y_L'])):
+        for c in range(len(dict_sample['x_L'])):
+            sum_min_etai = sum_min_etai + min(eta1_M[-1-l][c],eta2_M[-1-l][c])
+    e_mec = dict_sollicitation['alpha']/sum_min_etai
+    Emec_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
+    for l in range(len(dict_sample['y_L'])):
+        for c in range(len(dict_sample['x_L'])):
+            Emec_M[-1-l][c] = e_mec*min(eta1_M[-1-l][c],eta2_M[-1-l][c])
+    return sum_min_etai, Emec_M
+
+#-------------------------------------------------------------------------------
+
+def sum_Ed_plus_minus_loop(dict_sample, dict_sollicitation):
+    '''
+    Former computation of the sums of the total energy on the whole sample (now in Owntools.Compute.Compute_sum_Ed()), one evaluation of the energy per node.
+
+        Input :
+            a sample dictionnary (a dict)
+        Output :
+            Nothing but the dictionnary gets an updated value for energy inside the sample (three floats)
+    '''
+    #the phase fields are expanded on the mesh
+    eta1_M = dict_sample['L_g'][0].expand_etai_M()
+    eta2_M = dict_sample['L_g'][1].expand_etai_M()
+
+    sum_ed_plus = 0
+    sum_ed_minus = 0
+    sum_ed = 0
+    sum_Ed_mec = 0
+    sum_Ed_che = 0
+    for l in range(len(dict_sample['y_L'])):
+        for c in range(len(dict_sample['x_L'])):
+
+            #Emec
+            Ed_mec = dict_sample['Emec_M'][-1-l][c]
+
+            #Eche
+            Ed_che = dict_sollicitation['chi']*dict_sample['solute_M'][-1-l][c]*(3*eta1_M[-1-l][c]**2-2*eta1_M[-1-l][c]**3+\
+                                                                                 3*eta2_M[-1-l][c]**2-2*eta2_M[-1-l][c]**3)
+
+            #Ed
+            Ed = Ed_mec - Ed_che
+
+            #sum actualisation
+            sum_ed = sum_ed + Ed
+            sum_Ed_mec = sum_Ed_mec + Ed_mec
+            sum_Ed_che = sum_Ed_che + Ed_che
+            if Ed > 0 :
+                sum_ed_plus = sum_ed_plus + Ed
+            else :
+                sum_ed_minus = sum_ed_minus - Ed
+
+    #update elements in dict
+    dict_sample['sum_ed'] = sum_ed
+    dict_sample['sum_Ed_mec'] = sum_Ed_mec
+    dict_sample['sum_Ed_che'] = sum_Ed_che
+    dict_sample['sum_ed_plus'] = sum_ed_plus
+    dict_sample['sum_ed_minus'] = sum_ed_minus
+
+#-------------------------------------------------------------------------------
+
+def Ed_abs_node_contact_loop(dict_sample, dict_sollicitation):
+    '''
+    Former computation of the sum of the absolute total energy on the contact (now in Owntools.Compute.Compute_sum_Ed()), one evaluation of the energy per node.
+
+    This energy is related to the deformation during the phase-field step.
+
+    Only absolute total energy in the contact zone (eta_i and eta_j > 0.5) is considered for the sum.
+    The sum obtained is divided by the number of nodes in the contact zone.
+
+        Input :
+            a sample dictionnary (a dict)
+        Output :
+            Nothing but the dictionnary gets an updated value for energy inside the sample (three floats)
+    '''
+    #the phase fields are expanded on the mesh
+    eta1_M = dict_sample['L_g'][0].expand_etai_M()
+    eta2_M = dict_sample['L_g'][1].expand_etai_M()
+
+    sum_ed_abs = 0
+    n_node = 0
+    for l in range(len(dict_sample['y_L'])):
+        for c in range(len(dict_sample['x_L'])):
+            if eta1_M[-1-l][c] > 0.5 and eta2_M[-1-l][c] > 0.5:
+                #Emec
+                Ed_mec = dict_sample['Emec_M'][-1-l][c]
+                #Eche
+                Ed_che = dict_sollicitation['chi']*dict_sample['solute_M'][-1-l][c]*(3*eta1_M[-1-l][c]**2-2*eta1_M[-1-l][c]**3+\
+                                                                                     3*eta2_M[-1-l][c]**2-2*eta2_M[-1-l][c]**3)
+                #Ed
+                Ed = Ed_mec - Ed_che
+                #sum
+                sum_ed_abs = sum_ed_abs + abs(Ed)
+                n_node = n_node + 1
+
+    #update elements in dict
+    dict_sample['sum_ed_abs'] = sum_ed_abs
+    dict_sample['n_node'] = n_node
+    dict_sample['sum_ed_abs_node'] = sum_ed_abs/n_node
+
+#-------------------------------------------------------------------------------
+
+def kc_dil_loop(dict_algorithm, dict_material, dict_sample):
+    '''
+    Former implementation of Owntools.Compute.Compute_kc_dil(), with loops on the nodes.
+
+    Here, a dilation method is applied. For all node, a Boolean variable is defined.
+    This variable is True if eta_i and eta_j are greater than 0.5 (in the contact zone).
+                  is True if eta_i and eta_j are lower than 0.5 (in the pore zone).
+                  is False else.
+
+    A dilation method is applied, the size of the structural element is the main case.
+
+    The diffusion map is built on the Boolean map. If the variable is True, the diffusion is kc, else 0.
+
+        Input :
+            an algorithm dictionnary (a dict)
+            a material dictionnary (a dict)
+            a sample dictionnary (a dict)
+        Output :
+            Nothing but the dictionnary gets an updated value for the solute diffusion coefficient map (a nx x ny numpy array)
+    '''
+    #the phase fields are expanded on the mesh
+    eta1_M = dict_sample['L_g'][0].expand_etai_M()
+    eta2_M = dict_sample['L_g'][1].expand_etai_M()
+
+    #Initialisation
+    on_off_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))), dtype = bool)
+
+    #compute the on off map
+    for l in range(len(dict_sample['y_L'])):
+        for c in range(len(dict_sample['x_L'])):
+            #at the contact
+            if eta1_M[-1-l][c] > 0.5 and eta2_M[-1-l][c] > 0.5:
+                on_off_M[-l-1][c] = True
+            #in the pore space
+            elif eta1_M[-1-l][c] < 0.5 and eta2_M[-1-l][c] < 0.5:
+                on_off_M[-l-1][c] = True
+
+    #dilatation
+    struct_element = dict_algorithm['struct_element']
+    dilated_M = scipy.ndimage.binary_dilation(on_off_M, struct_element)
+
+    #compute the map of the solute diffusion coefficient
+    kc_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
+    for l in range(len(dict_sample['y_L'])):
+        for c in range(len(dict_sample['x_L'])):
+            if dilated_M[-1-l][c] :
+                kc_M[-1-l][c] = dict_material['kappa_c']
+
+    #Update element in dictionnary
+    dict_sample['kc_M'] = kc_M
+
+#-------------------------------------------------------------------------------
+
+def kc_int_loop(dict_material, dict_sample):
+    '''
+    Former implementation of Owntools.Compute.Compute_kc_int(), with loops on the nodes.
+
+    For all nodes in the mesh a diffusion coefficient is computed.
+    If eta_i and eta_j are greater than 0.5 (in the contact zone), the diffusion is kc0.
+    If eta_i and eta_j are lower than 0.5 (in the pore zone), the diffusion is kc0.
+    If eta_i (resp. eta_j) is greater than 0.5 and eta_j (resp. eta_i) is lower than 0.5 (in one grain but not the other), an interpolated diffusion is used.
+
+    This interpolated diffusion is kc = kc0*exp(tau*(d_to_center_i-radius_i)/radius_i).
+
+        Input :
+            a material dictionnary (a dict)
+            a sample dictionnary (a dict)
+        Output :
+            Nothing but the dictionnary gets an updated value for the solute diffusion coefficient map (a nx x ny numpy array)
+    '''
+    #the phase fields are expanded on the mesh
+    eta1_M = dict_sample['L_g'][0].expand_etai_M()
+    eta2_M = dict_sample['L_g'][1].expand_etai_M()
+
+    #Initialisation
+    kc_M = np.array(np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L']))))
+
+    #compute the distribution of the solute diffusion coefficient
+    for l in range(len(dict_sample['y_L'])):
+        for c in range(len(dict_sample['x_L'])):
+            #at the contact
+            if eta1_M[-1-l][c] > 0.5 and eta2_M[-1-l][c] > 0.5:
+                kc_M[-l-1][c] = dict_material['kappa_c']
+            #inside g1 and not g2
+            elif eta1_M[-1-l][c] > 0.5 and eta2_M[-1-l][c] < 0.5:
+                P = np.array([dict_sample['x_L'][c], dict_sample['y_L'][-1-l]])
+                Distance = np.linalg.norm(P - dict_sample['L_g'][0].center)
+                #exponential decrease
+                kappa_c_trans = dict_material['kappa_c']*math.exp(-(dict_sample['L_g'][0].r_mean-Distance)/(dict_sample['L_g'][0].r_mean/dict_material['tau_kappa_c']))
+                kc_M[-l-1][c] = kappa_c_trans
+            #inside g2 and not g1
+            elif eta1_M[-1-l][c] < 0.5 and eta2_M[-1-l][c] > 0.5:
+                #compute the distance to g1
+                P = np.array([dict_sample['x_L'][c], dict_sample['y_L'][-1-l]])
+                Distance = np.linalg.norm(P - dict_sample['L_g'][1].center)
+                #exponential decrease
+                kappa_c_trans = dict_material['kappa_c']*math.exp(-(dict_sample['L_g'][1].r_mean-Distance)/(dict_sample['L_g'][1].r_mean/dict_material['tau_kappa_c']))
+                kc_M[-l-1][c] = kappa_c_trans
+            #outside
+            else :
+                kc_M[-l-1][c] = dict_material['kappa_c']
+
+    #Update element in dictionnary
+    dict_sample['kc_M'] = kc_M
+
+#-------------------------------------------------------------------------------
+
+#-------------------------------------------------------------------------------
+#Benchmarks
+#-------------------------------------------------------------------------------
+
+def Benchmark_build_etai_M():
+    '''
+    Compare the vectorized Grain.build_etai_M() with the former loop.
+
+    The grain 1 of the sample is considered at two spatial discretisations (180x100 and 2000x1200).
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nbuild_etai_M')
+    for nx, ny in [(180,100),(2000,1200)]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+        User.Add_2grains(dict_material,dict_sample)
+        grain = dict_sample['L_g'][0]
+        dt_loop, etai_M_loop = Timer(build_etai_M_loop, grain, dict_material, dict_sample)
+        dt_vect, _ = Timer(grain.build_etai_M, dict_material, dict_sample)
+        print(f'  {nx}x{ny} : loop {dt_loop:.3f} s, vectorized {dt_vect:.4f} s, speedup x{dt_loop/dt_vect:.0f}, max difference {np.max(abs(grain.expand_etai_M()-etai_M_loop)):.1e}')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_border():
+    '''
+    Compare the marching squares extraction of the grain border with the former scan and ordering.
+
+    The grain 1 of the sample is considered at several spatial discretisations.
+    The error is the maximum distance between the border vertices and the analytical circle.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nborder extraction (geometric_study)')
+    for nx, ny in [(180,100),(360,200),(720,400)]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+        User.Add_2grains(dict_material,dict_sample)
+        grain = dict_sample['L_g'][0]
+        dt_loop, L_border_loop = Timer(border_scan_loop, grain, dict_sample)
+        dt_ms, L_border_ms = Timer(border_marching_squares, grain, dict_sample)
+        error_loop = np.max(abs(np.linalg.norm(np.array(L_border_loop)-grain.center, axis = 1)-grain.r_mean))
+        error_ms = np.max(abs(np.linalg.norm(L_border_ms-grain.center, axis = 1)-grain.r_mean))
+        print(f'  {nx}x{ny} : scan and ordering {dt_loop:.3f} s (error {error_loop:.2f}), marching squares {dt_ms:.4f} s (error {error_ms:.2f}), speedup x{dt_loop/dt_ms:.0f}')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_surface_center():
+    '''
+    Compare the shoelace formula and the Monte Carlo method in Grain.geometric_study().
+
+    The grain 1 of the sample is studied several times with each method.
+    The errors are computed with the analytical disk, the standard deviation shows the noise between calls.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nsurface and center (geometric_study)')
+    n_call = 20
+    dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(180, 100)
+    User.Add_2grains(dict_material,dict_sample)
+    grain = dict_sample['L_g'][0]
+    center_ref = grain.center.copy()
+    surface_ref = math.pi*grain.r_mean**2
+    for method in ['monte_carlo','shoelace']:
+        dict_sample['method_surface_center'] = method
+        L_dt = []
+        L_error_surface = []
+        L_error_center = []
+        for i in range(n_call):
+            dt, _ = Timer(grain.geometric_study, dict_sample)
+            L_dt.append(dt)
+            L_error_surface.append((grain.surface-surface_ref)/surface_ref)
+            L_error_center.append(np.linalg.norm(grain.center-center_ref))
+        print(f'  {method} : {np.mean(L_dt):.4f} s per call, surface error {100*np.mean(L_error_surface):.2f} % (std {100*np.std(L_error_surface):.2f} %), center error {np.mean(L_error_center):.3f} (std {np.std(L_error_center):.3f})')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_P_is_inside():
+    '''
+    Compare Grain.P_is_inside_many() with a loop on Grain.P_is_inside().
+
+    The points tested are the ones of Owntools.Compute.Compute_S_int() (5000 points x 2 grains).
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\npoint in polygon')
+    dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(180, 100)
+    User.Add_2grains(dict_material,dict_sample)
+    Grain.Compute_overlap_2_grains(dict_sample)
+    Grain.Apply_overlap_target(dict_material,dict_sample,dict_sollicitation,{'L_displacement': [0], 'L_int_displacement' : [0]})
+    grain = dict_sample['L_g'][0]
+    L_P = np.column_stack((np.random.uniform(-210,210,5000),np.random.uniform(-130,130,5000)))
+    dt_loop, L_inside_loop = Timer(lambda : [grain.P_is_inside(P) for P in L_P])
+    dt_vect, L_inside_vect = Timer(grain.P_is_inside_many, L_P)
+    print(f'  5000 points : loop {dt_loop:.4f} s, vectorized {dt_vect:.5f} s, speedup x{dt_loop/dt_vect:.0f}, same result {np.array_equal(L_inside_loop,L_inside_vect)}')
+    dt_loop, S_int_loop = Timer(Compute_S_int_loop, dict_sample)
+    dt_vect, _ = Timer(Compute_S_int_monte_carlo, dict_sample)
+    print(f'  Compute_S_int : loop {dt_loop:.4f} s, vectorized {dt_vect:.5f} s, speedup x{dt_loop/dt_vect:.0f}')
+
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_inscribing():
+    '''
+    Compare the maximum inscribed circle of Grain.Compute_sphericity() with the former map loop.
+
+    The former map uses the distance to the nearest vertex (not to the edges), its radius is limited by the resolution of the map.
+    The reference is Owntools.Geometry.Maximum_Inscribed_Circle() on a fine grid with a tolerance of 1e-12.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nmaximum inscribed circle')
+    dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(180, 100)
+    User.Add_2grains(dict_material,dict_sample)
+    grain = dict_sample['L_g'][0]
+    grain.geometric_study(dict_sample)
+    radius_ref = Owntools.Geometry.Maximum_Inscribed_Circle(grain.l_border, 400, 1e-12)[1]
+    print(f'  reference radius {radius_ref:.6f}')
+    for n_spatial_inscribing in [50, 100, 200]:
+        dt_loop, map_loop = Timer(map_inscribing_loop, grain, n_spatial_inscribing)
+        print(f'  former map {n_spatial_inscribing}x{n_spatial_inscribing} : {dt_loop:.3f} s, radius error {np.max(map_loop)-radius_ref:+.1e}')
+    for n_spatial_inscribing in [10, 50, 100]:
+        dict_algorithm['n_spatial_inscribing'] = n_spatial_inscribing
+        dt_search, (center, radius) = Timer(Owntools.Geometry.Maximum_Inscribed_Circle, grain.l_border, n_spatial_inscribing)
+        dt_vect, _ = Timer(grain.Compute_sphericity, dict_algorithm)
+        print(f'  grid {n_spatial_inscribing}x{n_spatial_inscribing} distance transform and refinement : {dt_search:.4f} s (whole Compute_sphericity {dt_vect:.4f} s), radius error {radius-radius_ref:+.1e}')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_move_grain_interpolation():
+    '''
+    Compare the in place translation of Grain.move_grain_interpolation() with the former loops.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nmove grain by interpolation')
+    for nx, ny in [(180, 100), (1000, 600)]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+        User.Add_2grains(dict_material,dict_sample)
+        grain = dict_sample['L_g'][0]
+        dx = dict_sample['x_L'][1]-dict_sample['x_L'][0]
+        for displacement in [np.array([2.3*dx,0]), np.array([-2.3*dx,0])]:
+            etai_M_init = grain.expand_etai_M()
+            dt_loop, _ = Timer(move_grain_interpolation_loop, grain, displacement, dict_sample)
+            etai_M_loop = grain.expand_etai_M()
+            grain.set_etai_M(etai_M_init.copy())
+            dt_vect, _ = Timer(grain.move_grain_interpolation, displacement, dict_sample)
+            print(f'  {nx}x{ny}, displacement {displacement[0]/dx:+.1f} dx : loop {dt_loop:.4f} s, in place {dt_vect:.5f} s, speedup x{dt_loop/dt_vect:.0f}, max difference {np.max(np.abs(etai_M_loop-grain.expand_etai_M())):.1e}')
+            grain.set_etai_M(etai_M_init)
+        dt_vect, _ = Timer(grain.move_grain_interpolation, np.array([2.3*dx,-1.7*dx]), dict_sample)
+        print(f'  {nx}x{ny}, displacement (+2.3 dx, -1.7 dy) : in place {dt_vect:.5f} s')
+
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_etai_window():
+    '''
+    Compare the phase field stored on a window with the phase field stored on the full mesh.
+
+    The memory used and the cost of the sums of Owntools.Compute are compared for larger and larger domains (same grains).
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nphase field stored on a window')
+    for factor in [1, 2, 4]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(180*factor, 100*factor)
+        dict_sample['x_L'] = dict_sample['x_L']*factor
+        dict_sample['y_L'] = dict_sample['y_L']*factor
+        User.Add_2grains(dict_material,dict_sample)
+        Grain.Compute_overlap_2_grains(dict_sample)
+        L_etai_M = [grain.expand_etai_M() for grain in dict_sample['L_g']]
+        memory_full = sum([etai_M.nbytes for etai_M in L_etai_M])
+        memory_window = sum([grain.etai_window_M.nbytes for grain in dict_sample['L_g']])
+        dt_full, _ = Timer(lambda : (np.sum(np.minimum(L_etai_M[0],L_etai_M[1])), sum([np.sum(etai_M) for etai_M in L_etai_M])))
+        dt_window, _ = Timer(lambda : (Owntools.Compute.Compute_sum_min_etai_Emec(dict_sample, dict_sollicitation), Owntools.Compute.Compute_sum_eta(dict_sample)))
+        print(f'  {180*factor}x{100*factor} : memory full {memory_full/1e6:.2f} MB, window {memory_window/1e6:.3f} MB, sums full {dt_full:.5f} s, window {dt_window:.5f} s')
+
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_radius_at_theta():
+    '''
+    Compare the uniform angle table of Grain.radius_at_theta() with the former search of the nearest angle.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nradius in a direction')
+    dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(180, 100)
+    User.Add_2grains(dict_material,dict_sample)
+    grain = dict_sample['L_g'][0]
+    grain.geometric_study(dict_sample)
+    #the former table is the radius of the vertices
+    L_u = grain.l_border[:-1]-grain.center
+    L_r_vertices = np.linalg.norm(L_u, axis = 1)
+    L_theta_r_vertices = np.mod(np.arctan2(L_u[:,1], L_u[:,0]), 2*math.pi)
+    L_theta = np.random.uniform(0, 2*math.pi, 10000)
+    #search of the nearest angle for each direction (list and linear scan)
+    def radius_nearest(L_theta):
+        L_R = []
+        for theta in L_theta:
+            L_theta_R_i = list(abs(np.array(L_theta_r_vertices)-theta))
+            L_R.append(L_r_vertices[L_theta_R_i.index(min(L_theta_R_i))])
+        return np.array(L_R)
+    dt_loop, L_R_loop = Timer(radius_nearest, L_theta)
+    dt_table, L_R_table = Timer(grain.radius_at_theta, L_theta)
+    print(f'  10000 directions : nearest angle {dt_loop:.4f} s, table {dt_table:.6f} s, speedup x{dt_loop/dt_table:.0f}, max difference {np.max(np.abs(L_R_loop-L_R_table)):.2e} (r_mean {grain.r_mean:.1f})')
+
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_PFtoDEM():
+    '''
+    Compare the reading of the files from MOOSE simulation in one pass with the former reading field by field.
+
+    The fields eta1, eta2 and c are read in the last step, Ed_mec and Ed_pre in the first step.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nPF to DEM')
+    if os.path.exists('Benchmark_vtu'):
+        shutil.rmtree('Benchmark_vtu')
+    os.mkdir('Benchmark_vtu')
+    for nx, ny in [(180, 100), (360, 200)]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+        dict_algorithm['np_proc'] = 4
+        dict_algorithm['n_proc_read'] = 1
+        dict_field = {}
+        for name in ['eta1', 'eta2', 'c', 'Ed_mec', 'Ed_pre']:
+            dict_field[name] = np.random.rand(ny, nx)
+        Write_vtu('Benchmark_vtu/last', dict_sample, dict_field, dict_algorithm['np_proc'])
+        def read_loop():
+            L_field_M = [field_PFtoDEM_loop('Benchmark_vtu/last', field, dict_algorithm, dict_sample) for field in ['eta1', 'eta2', 'c']]
+            return L_field_M + [field_PFtoDEM_loop('Benchmark_vtu/last', 'Ed_mec', dict_algorithm, dict_sample)]
+        def read_one_pass():
+            dict_data = Owntools.PFtoDEM_Multi.Read_vtu_Multi('Benchmark_vtu/last', ['eta1', 'eta2', 'c'], dict_algorithm, dict_sample)
+            L_field_M = [Owntools.PFtoDEM_Multi.Field_on_mesh(dict_data, field, dict_sample) for field in ['eta1', 'eta2', 'c']]
+            dict_data = Owntools.PFtoDEM_Multi.Read_vtu_Multi('Benchmark_vtu/last', ['Ed_mec', 'Ed_pre'], dict_algorithm, dict_sample)
+            return L_field_M + [Owntools.PFtoDEM_Multi.Field_on_mesh(dict_data, 'Ed_mec', dict_sample)]
+        dt_loop, L_field_M_loop = Timer(read_loop)
+        #the first reading computes the map of the nodes, the next ones use it
+        dt_one_pass, L_field_M = Timer(read_one_pass)
+        dt_one_pass_map, L_field_M_map = Timer(read_one_pass)
+        same = all([np.array_equal(L_field_M_loop[i], L_field_M[i]) and np.array_equal(L_field_M_loop[i], L_field_M_map[i]) for i in range(4)])
+        print(f'  {nx}x{ny}, {dict_algorithm["np_proc"]} files : field by field {dt_loop:.3f} s, one pass {dt_one_pass:.4f} s, one pass with the map saved {dt_one_pass_map:.4f} s, speedup x{dt_loop/dt_one_pass_map:.0f}, same result {same}')
+    shutil.rmtree('Benchmark_vtu')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_PFtoDEM_pool():
+    '''
+    Compare the reading of the files from MOOSE simulation in serial and in a pool of processes.
+
+    The pool is created by the first reading, the time of the next readings is given.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nPF to DEM in a pool of processes')
+    if os.path.exists('Benchmark_vtu'):
+        shutil.rmtree('Benchmark_vtu')
+    os.mkdir('Benchmark_vtu')
+    nx, ny = 720, 400
+    for np_proc in [4, 16, 32]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+        dict_algorithm['np_proc'] = np_proc
+        dict_field = {}
+        for name in ['eta1', 'eta2', 'c']:
+            dict_field[name] = np.random.rand(ny, nx)
+        Write_vtu('Benchmark_vtu/last', dict_sample, dict_field, np_proc)
+        L_dt = []
+        L_dict_data = []
+        for n_proc_read in [1, min(np_proc, max(2, os.cpu_count()))]:
+            dict_algorithm['n_proc_read'] = n_proc_read
+            Owntools.PFtoDEM_Multi.Read_vtu_Multi('Benchmark_vtu/last', ['eta1', 'eta2', 'c'], dict_algorithm, dict_sample)
+            dt, dict_data = Timer(Owntools.PFtoDEM_Multi.Read_vtu_Multi, 'Benchmark_vtu/last', ['eta1', 'eta2', 'c'], dict_algorithm, dict_sample)
+            L_dt.append(dt)
+            L_dict_data.append(dict_data)
+        Owntools.PFtoDEM_Multi.Close_pool()
+        same = all([np.array_equal(L_dict_data[0][name], L_dict_data[1][name]) for name in L_dict_data[0]])
+        print(f'  {nx}x{ny}, {np_proc} files : serial {L_dt[0]:.3f} s, pool of {n_proc_read} processes {L_dt[1]:.3f} s, speedup x{L_dt[0]/L_dt[1]:.1f}, same result {same}')
+        for i_proc in range(np_proc):
+            os.remove(f'Benchmark_vtu/last_{i_proc}.vtu')
+    shutil.rmtree('Benchmark_vtu')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_vtu_binary():
+    '''
+    Compare the size and the reading of the files from MOOSE simulation written in ascii and in binary.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nvtu binary')
+    if os.path.exists('Benchmark_vtu'):
+        shutil.rmtree('Benchmark_vtu')
+    os.mkdir('Benchmark_vtu')
+    for nx, ny in [(180, 100), (720, 400)]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+        dict_algorithm['np_proc'] = 4
+        dict_algorithm['n_proc_read'] = 1
+        dict_field = {}
+        for name in ['eta1', 'eta2', 'c']:
+            dict_field[name] = np.random.rand(ny, nx)
+        L_size = []
+        L_dt = []
+        L_dict_data = []
+        for binary in [False, True]:
+            Write_vtu('Benchmark_vtu/last', dict_sample, dict_field, dict_algorithm['np_proc'], binary)
+            L_size.append(sum([os.path.getsize(f'Benchmark_vtu/last_{i_proc}.vtu') for i_proc in range(dict_algorithm['np_proc'])])/1e6)
+            #the map of the nodes is computed before
+            Owntools.PFtoDEM_Multi.Read_vtu_Multi('Benchmark_vtu/last', ['eta1', 'eta2', 'c'], dict_algorithm, dict_sample)
+            dt, dict_data = Timer(Owntools.PFtoDEM_Multi.Read_vtu_Multi, 'Benchmark_vtu/last', ['eta1', 'eta2', 'c'], dict_algorithm, dict_sample)
+            L_dt.append(dt)
+            L_dict_data.append(dict_data)
+        same = all([np.array_equal(L_dict_data[0][name], L_dict_data[1][name]) for name in L_dict_data[0]])
+        print(f'  {nx}x{ny} : ascii {L_size[0]:.1f} MB read in {L_dt[0]:.4f} s, binary {L_size[1]:.1f} MB read in {L_dt[1]:.4f} s, speedup x{L_dt[0]/L_dt[1]:.0f}, same result {same}')
+    shutil.rmtree('Benchmark_vtu')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_exodus():
+    '''
+    Compare the reading of one time step in the exodus file with the reading of the whole history and of the vtu files.
+
+    The fields eta1, eta2 and c are read at the last step, Ed_mec and Ed_pre (elemental) at the first step.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nexodus')
+    if os.path.exists('Benchmark_exodus'):
+        shutil.rmtree('Benchmark_exodus')
+    os.mkdir('Benchmark_exodus')
+    nx, ny = 720, 400
+    n_step = 12
+    dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+    dict_algorithm['n_proc_read'] = 1
+    L_dict_field = [{'eta1' : np.random.rand(ny, nx), 'eta2' : np.random.rand(ny, nx), 'c' : np.random.rand(ny, nx)} for i_step in range(n_step)]
+    L_dict_field_elem = [{'Ed_mec' : np.random.rand(ny-1, nx-1), 'Ed_pre' : np.random.rand(ny-1, nx-1)} for i_step in range(n_step)]
+    Write_exodus('Benchmark_exodus/last_out.e', dict_sample, L_dict_field, L_dict_field_elem)
+    Write_vtu('Benchmark_exodus/last', dict_sample, L_dict_field[-1], dict_algorithm['np_proc'], True)
+    def read_exodus():
+        dict_data = Owntools.PFtoDEM_Multi.Read_exodus('Benchmark_exodus/last_out.e', ['eta1', 'eta2', 'c'], -1, dict_sample)
+        dict_data_Ed = Owntools.PFtoDEM_Multi.Read_exodus('Benchmark_exodus/last_out.e', ['Ed_mec', 'Ed_pre'], 0, dict_sample)
+        return dict_data, dict_data_Ed
+    def read_history():
+        exodus = scipy.io.netcdf_file('Benchmark_exodus/last_out.e', 'r', mmap=False)
+        L_history = [np.array(exodus.variables[name][:]) for name in exodus.variables]
+        exodus.close()
+        return L_history
+    #the maps of the nodes are computed before
+    read_exodus()
+    Owntools.PFtoDEM_Multi.Read_vtu_Multi('Benchmark_exodus/last', ['eta1', 'eta2', 'c'], dict_algorithm, dict_sample)
+    dt_exodus, (dict_data, dict_data_Ed) = Timer(read_exodus)
+    dt_history, L_history = Timer(read_history)
+    dt_vtu, dict_data_vtu = Timer(Owntools.PFtoDEM_Multi.Read_vtu_Multi, 'Benchmark_exodus/last', ['eta1', 'eta2', 'c'], dict_algorithm, dict_sample)
+    same = all([np.array_equal(Owntools.PFtoDEM_Multi.Field_on_mesh(dict_data, name, dict_sample), L_dict_field[-1][name]) for name in ['eta1', 'eta2', 'c']])
+    size_exodus = os.path.getsize('Benchmark_exodus/last_out.e')/1e6
+    size_vtu = sum([os.path.getsize(f'Benchmark_exodus/last_{i_proc}.vtu') for i_proc in range(dict_algorithm['np_proc'])])/1e6
+    print(f'  {nx}x{ny}, {n_step} steps : exodus {size_exodus:.1f} MB, one step {dt_exodus:.4f} s, whole history {dt_history:.4f} s, same result {same}')
+    print(f'  the vtu output would add {n_step*size_vtu:.1f} MB (binary) on the disk, reading its last step {dt_vtu:.4f} s')
+    shutil.rmtree('Benchmark_exodus')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_DataArray():
+    '''
+    Compare the parsing of the ascii data arrays of a .vtu file with 1 million points.
+
+    The former parsing character by character, the conversion of the split text and the conversion in one call are compared.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nDataArray')
+    if os.path.exists('Benchmark_vtu'):
+        shutil.rmtree('Benchmark_vtu')
+    os.mkdir('Benchmark_vtu')
+    nx, ny = 1000, 1000
+    dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+    Write_vtu('Benchmark_vtu/last', dict_sample, {'c' : np.random.rand(ny, nx)}, 1)
+    dt_loop, (L_c_loop, L_XYZ_loop) = Timer(DataArray_char_loop, 'Benchmark_vtu/last_0.vtu')
+    dt_piece, (n_points, dict_L_piece) = Timer(Owntools.PFtoDEM_Multi.Read_vtu_piece, 'Benchmark_vtu/last_0.vtu', ['c'], None)
+    same = np.array_equal(L_c_loop, dict_L_piece['c']) and np.array_equal(L_XYZ_loop, dict_L_piece['Points'])
+    #conversion of the content only
+    f = open('Benchmark_vtu/last_0.vtu','r')
+    data = f.read()
+    f.close()
+    i_content = data.find('>', data.find('Name="c"'))+1
+    content = data[i_content:data.find('<', i_content)]
+    dt_split, L_c_split = Timer(lambda text : np.array(text.split(), dtype=float), content)
+    dt_parse, L_c_parse = Timer(Owntools.PFtoDEM_Multi.Parse_DataArray, content)
+    print(f'  {n_points} points (c and Points) : char by char {dt_loop:.2f} s, Read_vtu_piece {dt_piece:.3f} s, speedup x{dt_loop/dt_piece:.0f}, same result {same}')
+    print(f'  field c only : split {dt_split:.3f} s, Parse_DataArray {dt_parse:.3f} s, same result {np.array_equal(L_c_split, L_c_parse)}')
+    shutil.rmtree('Benchmark_vtu')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_Write_txt():
+    '''
+    Compare the writing of the five .txt files needed for MOOSE simulation with the former writing node by node.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nWrite txt')
+    if os.path.exists('Data'):
+        shutil.rmtree('Data')
+    os.mkdir('Data')
+    for nx, ny in [(180, 100), (720, 400)]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+        dict_algorithm['i_PFDEM'] = 0
+        User.Add_2grains(dict_material, dict_sample)
+        dict_sample['solute_M'] = np.random.rand(ny, nx)
+        dict_sample['Emec_M'] = np.random.rand(ny, nx)
+        dict_sample['kc_M'] = np.random.rand(ny, nx)
+        def write_loop():
+            for name, field_M in [('eta1', dict_sample['L_g'][0].expand_etai_M()), ('eta2', dict_sample['L_g'][1].expand_etai_M()), ('c', dict_sample['solute_M']), ('ep', dict_sample['Emec_M']), ('kc', dict_sample['kc_M'])]:
+                Write_txt_loop('Data/'+name+'_loop.txt', field_M, dict_sample)
+        dt_loop, result = Timer(write_loop)
+        dt_data, result = Timer(Owntools.Write.Write_txt_data, dict_algorithm, dict_sample)
+        size_loop = sum([os.path.getsize('Data/'+name+'_loop.txt') for name in ['eta1', 'eta2', 'c', 'ep', 'kc']])/1e6
+        size_data = sum([os.path.getsize('Data/'+name+'_0.txt') for name in ['eta1', 'eta2', 'c', 'ep', 'kc']])/1e6
+        error = max([np.max(np.abs(np.loadtxt('Data/'+name+'_loop.txt', skiprows=5)-np.loadtxt('Data/'+name+'_0.txt', skiprows=5))) for name in ['c', 'kc']])
+        print(f'  {nx}x{ny} : node by node {dt_loop:.3f} s ({size_loop:.1f} MB), one call per file {dt_data:.3f} s ({size_data:.1f} MB, {dict_algorithm["n_digits_txt"]} digits), speedup x{dt_loop/dt_data:.1f}, max difference {error:.1e}')
+    shutil.rmtree('Data')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_Write_txt_compressed():
+    '''
+    Compare the writing of the kc and ep .txt files on the full grid and on the compressed axis.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nWrite txt compressed')
+    if os.path.exists('Data'):
+        shutil.rmtree('Data')
+    os.mkdir('Data')
+    for nx, ny in [(180, 100), (720, 400)]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+        User.Add_2grains(dict_material, dict_sample)
+        Grain.Compute_overlap_2_grains(dict_sample)
+        Grain.Apply_overlap_target(dict_material,dict_sample,dict_sollicitation,{'L_displacement': [0], 'L_int_displacement' : [0]})
+        Owntools.Compute.Compute_sum_min_etai_Emec(dict_sample, dict_sollicitation)
+        Owntools.Compute.Compute_kc_dil(dict_algorithm, dict_material, dict_sample)
+        header = Owntools.Write.Header_txt(dict_sample['x_L'], dict_sample['y_L'])
+        for name, field_M in [('ep', dict_sample['Emec_M']), ('kc', dict_sample['kc_M'])]:
+            dt_full, _ = Timer(Owntools.Write.Write_txt, 'Data/'+name+'_full.txt', header, field_M, dict_algorithm['n_digits_txt'])
+            dt_comp, _ = Timer(Owntools.Write.Write_txt_compressed, 'Data/'+name+'_comp.txt', field_M, dict_sample, dict_algorithm['n_digits_txt'])
+            with open('Data/'+name+'_comp.txt') as file:
+                L_line = file.readlines()
+            n_x = len(L_line[1].split())
+            n_y = len(L_line[3].split())
+            size_full = os.path.getsize('Data/'+name+'_full.txt')/1e3
+            size_comp = os.path.getsize('Data/'+name+'_comp.txt')/1e3
+            print(f'  {nx}x{ny}, {name} : full grid {dt_full:.4f} s ({size_full:.0f} kB), compressed {n_x}x{n_y} axis {dt_comp:.4f} s ({size_comp:.0f} kB), size x{size_full/size_comp:.1f} smaller')
+    shutil.rmtree('Data')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_Emec():
+    '''
+    Compare Owntools.Compute.Compute_sum_min_etai_Emec() with the former loops.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nsum of the minimum of etai and mechanical energy')
+    for nx, ny in [(180, 100), (720, 400)]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+        User.Add_2grains(dict_material,dict_sample)
+        Grain.Compute_overlap_2_grains(dict_sample)
+        Grain.Apply_overlap_target(dict_material,dict_sample,dict_sollicitation,{'L_displacement': [0], 'L_int_displacement' : [0]})
+        Owntools.Compute.Compute_sum_min_etai_Emec(dict_sample, dict_sollicitation)
+        dt_loop, (sum_loop, Emec_M_loop) = Timer(sum_min_etai_Emec_loop, dict_sample, dict_sollicitation)
+        n_call = 20
+        dt_fused = min([Timer(Owntools.Compute.Compute_sum_min_etai_Emec, dict_sample, dict_sollicitation)[0] for i in range(n_call)])
+        error = max(abs(dict_sample['sum_min_etai']-sum_loop)/sum_loop, np.max(np.abs(dict_sample['Emec_M']-Emec_M_loop)))
+        print(f'  {nx}x{ny} : loops {dt_loop:.3f} s, one pass {dt_fused*1e3:.3f} ms, speedup x{dt_loop/dt_fused:.0f}, max difference {error:.1e}')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_S_int():
+    '''
+    Compare the exact intersection surface of Owntools.Compute.Compute_S_int() with the former Monte Carlo estimations.
+
+    The reference is the Monte Carlo estimation with 10^6 points, the std is computed on 20 calls.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nintersection surface')
+    dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(180, 100)
+    User.Add_2grains(dict_material,dict_sample)
+    Grain.Compute_overlap_2_grains(dict_sample)
+    Grain.Apply_overlap_target(dict_material,dict_sample,dict_sollicitation,{'L_displacement': [0], 'L_int_displacement' : [0]})
+    S_int_ref = Compute_S_int_monte_carlo(dict_sample, 1000000)
+    n_call = 20
+    dt_loop, S_int_loop = Timer(Compute_S_int_loop, dict_sample)
+    L_dt_mc, L_S_int_mc = zip(*[Timer(Compute_S_int_monte_carlo, dict_sample) for i in range(n_call)])
+    L_dt_exact = [Timer(Owntools.Compute.Compute_S_int, dict_sample)[0] for i in range(n_call)]
+    S_int_exact = dict_sample['S_int']
+    print(f'  reference {S_int_ref:.2f} ({len(dict_sample["L_P_int"])-1} vertices in the intersection)')
+    print(f'  loop Monte Carlo : {dt_loop:.4f} s, error {100*(S_int_loop-S_int_ref)/S_int_ref:+.2f} %')
+    print(f'  vectorized Monte Carlo : {np.mean(L_dt_mc):.5f} s, error {100*(np.mean(L_S_int_mc)-S_int_ref)/S_int_ref:+.2f} % (std {100*np.std(L_S_int_mc)/S_int_ref:.2f} %)')
+    print(f'  polygon clipping : {np.mean(L_dt_exact):.5f} s, error {100*(S_int_exact-S_int_ref)/S_int_ref:+.2f} % (std 0), speedup x{dt_loop/np.mean(L_dt_exact):.0f} on the loop, x{np.mean(L_dt_mc)/np.mean(L_dt_exact):.1f} on the vectorized Monte Carlo')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_Ed():
+    '''
+    Compare Owntools.Compute.Compute_sum_Ed() with the former loops on the nodes.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nsums of the total energy')
+    for nx, ny in [(180, 100), (720, 400)]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+        User.Add_2grains(dict_material,dict_sample)
+        Grain.Compute_overlap_2_grains(dict_sample)
+        Grain.Apply_overlap_target(dict_material,dict_sample,dict_sollicitation,{'L_displacement': [0], 'L_int_displacement' : [0]})
+        dict_sample['solute_M'] = np.random.rand(ny, nx)
+        Owntools.Compute.Compute_sum_min_etai_Emec(dict_sample, dict_sollicitation)
+        dt_loop, _ = Timer(lambda : (sum_Ed_plus_minus_loop(dict_sample, dict_sollicitation), Ed_abs_node_contact_loop(dict_sample, dict_sollicitation)))
+        L_key = ['sum_ed', 'sum_Ed_mec', 'sum_Ed_che', 'sum_ed_plus', 'sum_ed_minus', 'sum_ed_abs', 'n_node', 'sum_ed_abs_node']
+        dict_loop = {key : dict_sample[key] for key in L_key}
+        dt_first, _ = Timer(Owntools.Compute.Compute_sum_Ed, dict_sample, dict_sollicitation)
+        dt_kernel = min([Timer(Owntools.Compute.Compute_sum_Ed, dict_sample, dict_sollicitation)[0] for i in range(20)])
+        error = max([abs(dict_sample[key]-dict_loop[key])/max(abs(dict_loop[key]),1) for key in L_key])
+        print(f'  {nx}x{ny} : loops {dt_loop:.3f} s, one kernel {dt_kernel*1e3:.3f} ms ({dt_first*1e3:.3f} ms with the buffers allocation), speedup x{dt_loop/dt_kernel:.0f}, max relative difference {error:.1e}')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_kc():
+    '''
+    Compare the vectorized Owntools.Compute.Compute_kc_dil() and Compute_kc_int() with the former loops.
+
+    The separable dilation of Owntools.Compute.Binary_dilation() is compared with scipy.ndimage.binary_dilation() for larger and larger structural elements.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nsolute diffusion coefficient map')
+    for nx, ny in [(180, 100), (720, 400)]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(nx, ny)
+        User.Add_2grains(dict_material,dict_sample)
+        Grain.Compute_overlap_2_grains(dict_sample)
+        Grain.Apply_overlap_target(dict_material,dict_sample,dict_sollicitation,{'L_displacement': [0], 'L_int_displacement' : [0]})
+        for method, function_loop, function_vect, L_arg in [('dil', kc_dil_loop, Owntools.Compute.Compute_kc_dil, [dict_algorithm, dict_material, dict_sample]),
+                                                             ('int', kc_int_loop, Owntools.Compute.Compute_kc_int, [dict_material, dict_sample])]:
+            dt_loop, _ = Timer(function_loop, *L_arg)
+            kc_M_loop = dict_sample['kc_M']
+            dt_vect, _ = Timer(function_vect, *L_arg)
+            print(f'  {nx}x{ny}, kc_{method} : loops {dt_loop:.3f} s, vectorized {dt_vect:.4f} s, speedup x{dt_loop/dt_vect:.0f}, max difference {np.max(np.abs(kc_M_loop-dict_sample["kc_M"])):.1e}')
+    on_off_M = np.random.rand(1000, 1000) > 0.99
+    for n in [6, 20, 60]:
+        struct_element = np.ones((n,n), dtype = bool)
+        dt_scipy, dilated_M_scipy = Timer(scipy.ndimage.binary_dilation, on_off_M, struct_element)
+        dt_sep, dilated_M_sep = Timer(Owntools.Compute.Binary_dilation, on_off_M, struct_element)
+        print(f'  dilation 1000x1000, {n}x{n} element : scipy {dt_scipy:.4f} s, separable {dt_sep:.4f} s, speedup x{dt_scipy/dt_sep:.0f}, same result {np.array_equal(dilated_M_scipy, dilated_M_sep)}')
+
+#-------------------------------------------------------------------------------
+
+def Benchmark_kc_incremental():
+    '''
+    Compare the incremental update of Owntools.Compute.Compute_kc_dil() with the computation on the whole mesh.
+
+    The same grains are considered in larger and larger domains, the first grain is moved by 1.5 dx between two calls.
+
+        Input :
+            Nothing
+        Output :
+            Nothing but the results are printed (an user interface)
+    '''
+    print('\nincremental dilation')
+    for factor in [1, 2, 4]:
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = Build_dicts(180*factor, 100*factor)
+        dict_sample['x_L'] = dict_sample['x_L']*factor
+        dict_sample['y_L'] = dict_sample['y_L']*factor
+        User.Add_2grains(dict_material,dict_sample)
+        Grain.Compute_overlap_2_grains(dict_sample)
+        dx = dict_sample['x_L'][1]-dict_sample['x_L'][0]
+        Owntools.Compute.Compute_kc_dil(dict_algorithm, dict_material, dict_sample)
+        L_dt_full = []
+        L_dt_incremental = []
+        for i in range(10):
+            dict_sample['L_g'][0].move_grain_interpolation(np.array([1.5*dx,0]), dict_sample)
+            dt_incremental, _ = Timer(Owntools.Compute.Compute_kc_dil, dict_algorithm, dict_material, dict_sample)
+            L_dt_incremental.append(dt_incremental)
+            dt_full, kc_M_full = Timer(lambda : dict_material['kappa_c']*Owntools.Compute.Binary_dilation(Owntools.Compute.On_off_map(dict_sample), dict_algorithm['struct_element']))
+            L_dt_full.append(dt_full)
+        print(f'  {180*factor}x{100*factor} : whole mesh {np.mean(L_dt_full)*1e3:.2f} ms, incremental {np.mean(L_dt_incremental)*1e3:.2f} ms, speedup x{np.mean(L_dt_full)/np.mean(L_dt_incremental):.1f}, same result {np.array_equal(kc_M_full, dict_sample["kc_M"])}')
+
+#-------------------------------------------------------------------------------
+#main
+#-------------------------------------------------------------------------------
+
+if '__main__' == __name__:
+    L_benchmark = [Benchmark_build_etai_M, Benchmark_border, Benchmark_surface_center, Benchmark_P_is_inside, Benchmark_inscribing, Benchmark_move_grain_interpolation, Benchmark_etai_window, Benchmark_radius_at_theta, Benchmark_PFtoDEM, Benchmark_PFtoDEM_pool, Benchmark_vtu_binary, Benchmark_exodus, Benchmark_DataArray, Benchmark_Write_txt, Benchmark_Write_txt_compressed, Benchmark_Emec, Benchmark_S_int, Benchmark_Ed, Benchmark_kc, Benchmark_kc_incremental]
+    for benchmark in L_benchmark:
+        if len(sys.argv) == 1 or benchmark.__name__[len('Benchmark_'):] in sys.argv[1:]:
+            benchmark()
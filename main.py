@@ -67,8 +67,7 @@ def iteration_main_until_pf(dict_algorithm, dict_material, dict_sample, dict_sol
 
     #Compute parameters needed
     Owntools.Compute.Compute_S_int(dict_sample) #the intersection surface
-    Owntools.Compute.Compute_sum_min_etai(dict_sample, dict_sollicitation) #the sum of the minimum of etai
-    Owntools.Compute.Compute_Emec(dict_sample, dict_sollicitation) #the mechanical energy
+    Owntools.Compute.Compute_sum_min_etai_Emec(dict_sample, dict_sollicitation) #the sum of the minimum of etai and the mechanical energy
     if dict_material['method_to_compute_kc'] == 'dilation':
         Owntools.Compute.Compute_kc_dil(dict_algorithm, dict_material, dict_sample) #the solute diffusion
     elif dict_material['method_to_compute_kc'] == 'wfd':
@@ -79,16 +78,14 @@ def iteration_main_until_pf(dict_algorithm, dict_material, dict_sample, dict_sol
     dict_tracker['sum_min_etai_L'].append(dict_sample['sum_min_etai'])
 
     #compute for total energy in the sample and track the value
-    Owntools.Compute.Compute_sum_Ed_plus_minus(dict_sample, dict_sollicitation)
+    #the absolute total energy by contact node (related to the deformation in PF) is computed too
+    Owntools.Compute.Compute_sum_Ed(dict_sample, dict_sollicitation)
     dict_tracker['sum_ed_L'].append(dict_sample['sum_ed'])
     dict_tracker['sum_Ed_che_L'].append(dict_sample['sum_Ed_che'])
     dict_tracker['sum_Ed_mec_L'].append(dict_sample['sum_Ed_mec'])
     dict_tracker['sum_ed_plus_L'].append(dict_sample['sum_ed_plus'])
     dict_tracker['sum_ed_minus_L'].append(dict_sample['sum_ed_minus'])
 
-    #compute the absolute total energy by contact node (related to the deformation in PF)
-    Owntools.Compute.Compute_Ed_abs_node_contact(dict_sample, dict_sollicitation)
-
     #Adaptative time step
     if abs(dict_sample['sum_ed_abs']) < dict_algorithm['Ed_level1']:
         dict_algorithm['dt_PF'] = dict_algorithm['dt_PF_init']
@@ -106,10 +103,7 @@ def iteration_main_until_pf(dict_algorithm, dict_material, dict_sample, dict_sol
         Owntools.Plot.Plot_kc(dict_sample)
 
     #write data
-    Owntools.Write.Write_eta_txt(dict_algorithm, dict_sample)
-    Owntools.Write.Write_solute_txt(dict_algorithm, dict_sample)
-    Owntools.Write.Write_kc_txt(dict_algorithm, dict_sample)
-    Owntools.Write.Write_Emec_txt(dict_algorithm, dict_sample)
+    Owntools.Write.Write_txt_data(dict_algorithm, dict_sample)
 
     #plot the difference of solute conentration in the case of a pure diffusion problem
     if 'Diff_Solute' in dict_algorithm['L_flag_plot']:
@@ -148,21 +142,31 @@ def iteration_main_from_pf(dict_algorithm, dict_material, dict_sample, dict_soll
     simulation_report.tac_tempo(datetime.now(),f"Iteration {dict_algorithm['i_PFDEM']}: pf simulation")
     simulation_report.tic_tempo(datetime.now())
 
-    #sorting files
-    j_str = Owntools.Sort_Files(dict_algorithm)
+    #sorting files, the outputs are already in Output/Ite_i
+    Owntools.Sort_Files(dict_algorithm)
 
     #---------------------------------------------------------------------------
     #PF to DEM
     #---------------------------------------------------------------------------
 
+    #read the last step, all the fields are extracted in one pass
+    namefile = 'Output/Ite_'+str(dict_algorithm['i_PFDEM'])+'/'+dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])
+    if dict_algorithm['read_exodus']:
+        dict_data = Owntools.PFtoDEM_Multi.Read_exodus(namefile+'_out.e',['eta'+str(grain.id) for grain in dict_sample['L_g']]+['c'],-1,dict_sample)
+    else :
+        dict_data = Owntools.PFtoDEM_Multi.Read_vtu_Multi(Owntools.Last_Step_vtu(namefile+'_out'),['eta'+str(grain.id) for grain in dict_sample['L_g']]+['c'],dict_algorithm,dict_sample)
     #look for the new grains shape
     for grain in dict_sample['L_g']:
-        grain.PFtoDEM_Multi('Output/Ite_'+str(dict_algorithm['i_PFDEM'])+'/'+dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str,dict_algorithm,dict_sample)
+        grain.PFtoDEM_Multi(dict_data,dict_sample)
         grain.geometric_study(dict_sample)
     #look for the new solute shape
-    Owntools.PFtoDEM_Multi.solute_PFtoDEM_Multi('Output/Ite_'+str(dict_algorithm['i_PFDEM'])+'/'+dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'_other_'+j_str,dict_algorithm,dict_sample)
-    #look for the initial external energy sources
-    Owntools.PFtoDEM_Multi.Ed_PFtoDEM_Multi('Output/Ite_'+str(dict_algorithm['i_PFDEM'])+'/'+dict_algorithm['namefile']+'_'+str(dict_algorithm['i_PFDEM'])+'_other_000',dict_algorithm,dict_sample)
+    Owntools.PFtoDEM_Multi.solute_PFtoDEM_Multi(dict_data,dict_sample)
+    #look for the initial external energy sources (first step, the only one of the output Ed)
+    if dict_algorithm['read_exodus']:
+        dict_data = Owntools.PFtoDEM_Multi.Read_exodus(namefile+'_Ed.e',['Ed_mec','Ed_pre'],0,dict_sample)
+    else :
+        dict_data = Owntools.PFtoDEM_Multi.Read_vtu_Multi(Owntools.Last_Step_vtu(namefile+'_Ed'),['Ed_mec','Ed_pre'],dict_algorithm,dict_sample)
+    Owntools.PFtoDEM_Multi.Ed_PFtoDEM_Multi(dict_data,dict_sample)
 
     #plot
     if 'Config' in dict_algorithm['L_flag_plot']:
@@ -253,6 +257,9 @@ def close_main(dict_algorithm, dict_material, dict_sample, dict_sollicitation, d
     if 'Movie' in dict_algorithm['L_flag_plot'] and 'Config' in dict_algorithm['L_flag_plot']:
         Owntools.Plot.Plot_mp4('Debug/Configuration/Configuration_','Debug/Configuration.mp4')
 
+    #close the processes reading the output of MOOSE
+    Owntools.PFtoDEM_Multi.Close_pool()
+
     simulation_report.end(datetime.now())
 
     if dict_algorithm['cleanData'] :
@@ -304,6 +311,10 @@ if '__main__' == __name__:
 
     #general parameters
     dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+    #MOOSE writes the exodus files in netCDF-4, they can not be read without netCDF4
+    if dict_algorithm['read_exodus'] and Owntools.PFtoDEM_Multi.netCDF4 is None:
+        simulation_report.write_and_print('The package netCDF4 is not installed, the output of MOOSE is written in vtk files (read_exodus = False)\n\n','The package netCDF4 is not installed, the output of MOOSE is written in vtk files (read_exodus = False)\n')
+        dict_algorithm['read_exodus'] = False
     if dict_algorithm['SaveData']:
         if not Path('../'+dict_algorithm['foldername']).exists():
             os.mkdir('../'+dict_algorithm['foldername'])
@@ -18,11 +18,18 @@ import unittest
 import os
 import shutil
 import math
+import base64
+import zlib
+import pickle
+import scipy.io
+from scipy.ndimage import binary_dilation
 
 #own functions and classes
 import User
 import Owntools
 import Owntools.Compute
+import Owntools.Geometry
+import Owntools.PFtoDEM_Multi
 import Owntools.Plot
 import Owntools.Write
 import Grain
@@ -64,6 +71,7 @@ class TestGlobal(unittest.TestCase):
                    'main.py',
                    'Owntools/__init__.py',
                    'Owntools/Debug_Diff_Solute_base.i',
+                   'Owntools/Geometry.py',
                    'Owntools/PFtoDEM_Multi.py',
                    'Owntools/Plot.py',
                    'Owntools/Save.py',
@@ -306,19 +314,48 @@ class TestOwntools(unittest.TestCase):
 
     #---------------------------------------------------------------------------
 
-    def test_index_to_str(self):
+    def test_Write_Outputs(self):
         '''
-        Try to convert an integer into a string with Owntools.index_to_str().
+        Try to generate the section [Outputs] of a MOOSE simulation input file with Owntools.Write.Write_Outputs().
 
-        The string is composed by three elements.
+            Output :
+                The result depends on the fact if only the data needed are written or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        dict_algorithm['i_PFDEM'] = 0
+        #exodus, last step only
+        dict_algorithm['read_exodus'] = True
+        dict_algorithm['full_output'] = False
+        outputs = Owntools.Write.Write_Outputs(dict_algorithm)
+        self.assertTrue('type = VTK' not in outputs and outputs.count('type = Exodus') == 2,'Only one format should be written!')
+        self.assertTrue("execute_on = 'final'" in outputs and "show = 'eta1 eta2 c'" in outputs and "show = 'Ed_mec Ed_pre'" in outputs,'The output is not restricted to the data needed!')
+        #vtk, all the steps
+        dict_algorithm['read_exodus'] = False
+        dict_algorithm['full_output'] = True
+        outputs = Owntools.Write.Write_Outputs(dict_algorithm)
+        self.assertTrue('type = Exodus' not in outputs and outputs.count('type = VTK') == 2,'Only one format should be written!')
+        self.assertTrue("execute_on = 'final'" not in outputs and "show = 'eta1 eta2 c'" not in outputs,'All the steps should be written in debug!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Last_Step_vtu(self):
+        '''
+        Try to find the last step of a vtk output with Owntools.Last_Step_vtu().
 
             Output :
-                The result depends on the fact if the conversions are well done or not (a bool)
+                The result depends on the fact if the last step is found or not (a bool)
         '''
-        #check if the function works well in different configurations
-        self.assertTrue(Owntools.index_to_str(7)=='007','The conversion index_to_str() seems to do not for 00x...')
-        self.assertTrue(Owntools.index_to_str(26)=='026','The conversion index_to_str() seems to do not for 0xx...')
-        self.assertTrue(Owntools.index_to_str(666)=='666','The conversion index_to_str() seems to do not for xxx...')
+        os.mkdir('Test_last_step')
+        #more than 1000 steps, and an other output in the same directory
+        for file in ['Test_out_000.pvtu', 'Test_out_999.pvtu', 'Test_out_1000.pvtu', 'Test_out_1000_0.vtu', 'Test_Ed_2000.pvtu']:
+            open('Test_last_step/'+file,'w').close()
+        last_step = Owntools.Last_Step_vtu('Test_last_step/Test_out')
+        #no step of this output, the pattern is given in the error
+        with self.assertRaisesRegex(FileNotFoundError, 'Test_last_step/Test_other_<step>.pvtu'):
+            Owntools.Last_Step_vtu('Test_last_step/Test_other')
+        shutil.rmtree('Test_last_step')
+        self.assertTrue(last_step=='Test_last_step/Test_out_1000','The last step is not found!')
 
     #---------------------------------------------------------------------------
 
@@ -364,6 +401,23 @@ class TestOwntools(unittest.TestCase):
 
     #---------------------------------------------------------------------------
 
+    def test_Cosine_Profile_M(self):
+        '''
+        Try to compute a phase variable at several points with Owntools.Cosine_Profile_M().
+
+        The vectorized profile is compared to Owntools.Cosine_Profile().
+
+            Output :
+                The result depends on the fact if the phase variables are well computed or not (a bool)
+        '''
+        R_M = np.array([[1, 1, 1],[1, 1, 1]])
+        r_M = np.array([[0, 0.8, 0.9],[1, 1.2, 2]])
+        etai_M = Owntools.Cosine_Profile_M(R_M,r_M,0.5)
+        L_etai = [Owntools.Cosine_Profile(1,r,0.5) for r in r_M.flatten()]
+        self.assertTrue(np.allclose(etai_M.flatten(),L_etai),'The Owntools.Cosine_Profile_M() does not match Owntools.Cosine_Profile()...')
+
+    #---------------------------------------------------------------------------
+
     def test_Write_eta_txt(self):
         '''
         Try to create file needed for MOOSE simulation with Owntools.Write_eta_txt().
@@ -470,6 +524,632 @@ class TestOwntools(unittest.TestCase):
         self.assertTrue(Path('Data/kc_0.txt').is_file(),"The file Data/kc_0.txt has not been created!")
         shutil.rmtree('Data')
 
+    #---------------------------------------------------------------------------
+
+    def test_Write_txt_data(self):
+        '''
+        Try to create the files needed for MOOSE simulation with Owntools.Write.Write_txt_data().
+
+        The values are checked : one per line, from the line y_L[0] to the line y_L[-1].
+
+            Output :
+                The result depends on the fact if the files are well created or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        dict_algorithm['i_PFDEM'] = 0
+        User.Add_2grains(dict_material,dict_sample)
+        User.Add_solute(dict_sample)
+        dict_sample['solute_M'] = np.random.rand(len(dict_sample['y_L']),len(dict_sample['x_L']))
+        Owntools.Compute.Compute_kc_dil(dict_algorithm, dict_material, dict_sample)
+        #create a folder
+        if Path('Data').exists():
+            shutil.rmtree('Data')
+        os.mkdir('Data')
+        #try to create .txt files
+        Owntools.Write.Write_txt_data(dict_algorithm, dict_sample)
+        for name in ['eta1','eta2','c','ep','kc']:
+            self.assertTrue(Path('Data/'+name+'_0.txt').is_file(),'The file Data/'+name+'_0.txt has not been created!')
+        file_to_read = open('Data/c_0.txt','r')
+        lines = file_to_read.read().splitlines()
+        file_to_read.close()
+        shutil.rmtree('Data')
+        self.assertTrue(lines[0]=='AXIS X' and np.allclose(np.array(lines[1].split(),dtype=float),dict_sample['x_L']) and lines[4]=='DATA','The header is not well written!')
+        L_value = np.array(lines[5:],dtype=float)
+        self.assertTrue(np.allclose(L_value,dict_sample['solute_M'][::-1].flatten(),rtol=10**(1-dict_algorithm['n_digits_txt']),atol=0),'The values are not well written!')
+        #with 17 digits, the values are written without rounding
+        dict_sample['solute_M'] = np.random.rand(3,4)
+        Owntools.Write.Write_txt('Test_c.txt', 'DATA\n', dict_sample['solute_M'], 17)
+        L_value = np.loadtxt('Test_c.txt', skiprows=1)
+        os.remove('Test_c.txt')
+        self.assertTrue(np.array_equal(L_value,dict_sample['solute_M'][::-1].flatten()),'The values are rounded with 17 digits!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Write_txt_compressed(self):
+        '''
+        Try to create a file needed for MOOSE simulation with compressed axis with Owntools.Write.Write_txt_compressed().
+
+        The field is piecewise constant, the field interpolated from the file must be the field on the mesh.
+
+            Output :
+                The result depends on the fact if the axis are compressed and the field reproduced or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        field_M = np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L'])))
+        field_M[10:30,50:120] = 2.5
+        field_M[40:45,:] = 1
+        #try to create the .txt file
+        Owntools.Write.Write_txt_compressed('Test_compressed.txt', field_M, dict_sample, 8)
+        file_to_read = open('Test_compressed.txt','r')
+        lines = file_to_read.read().splitlines()
+        file_to_read.close()
+        os.remove('Test_compressed.txt')
+        x_L = np.array(lines[1].split(),dtype=float)
+        y_L = np.array(lines[3].split(),dtype=float)
+        self.assertTrue(len(x_L) < len(dict_sample['x_L']) and len(y_L) < len(dict_sample['y_L']),'The axis are not compressed!')
+        #interpolation on the mesh, the line l is at y_L[l] in the file
+        field_file_M = np.array(lines[5:],dtype=float).reshape(len(y_L),len(x_L))
+        field_file_M = Owntools.Write.Interpolate_axis(Owntools.Write.Interpolate_axis(field_file_M, y_L, dict_sample['y_L'], 0), x_L, dict_sample['x_L'], 1)
+        self.assertTrue(np.allclose(field_file_M[::-1],field_M,rtol=1e-7,atol=0),'The field is not reproduced on the mesh!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Compute_S_int(self):
+        '''
+        Try to compute the intersection surface between two grains with Owntools.Compute.Compute_S_int().
+
+        The surface is compared with the intersection of two disks computed by User.Add_S0().
+
+            Output :
+                The result depends on the fact if the intersection surface is well computed or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create two grains in contact
+        User.Add_2grains(dict_material,dict_sample)
+        Grain.Compute_overlap_2_grains(dict_sample)
+        Grain.Apply_overlap_target(dict_material,dict_sample,dict_sollicitation,{'L_displacement': [0], 'L_int_displacement' : [0]})
+        User.Add_S0(dict_sample, dict_sollicitation)
+        #try to compute the intersection surface
+        Owntools.Compute.Compute_S_int(dict_sample)
+        self.assertTrue(len(dict_sample['L_P_int'])>3,'The intersection polygon is not computed!')
+        self.assertTrue(abs(dict_sample['S_int']-dict_sample['S_int_0'])<0.05*dict_sample['S_int_0'],'The intersection surface is not the one of two disks!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Binary_dilation(self):
+        '''
+        Try to dilate a Boolean map with Owntools.Compute.Binary_dilation().
+
+        The results are compared with scipy.ndimage.binary_dilation() for rectangles of even and odd sizes and for a cross.
+
+            Output :
+                The result depends on the fact if the dilation is the same or not (a bool)
+        '''
+        on_off_M = np.random.rand(80,70) > 0.97
+        for struct_element in [np.ones((10,6), dtype = bool), np.ones((5,7), dtype = bool), np.ones((1,2), dtype = bool), np.array([[0,1,0],[1,1,1],[0,1,0]], dtype = bool)]:
+            dilated_M = Owntools.Compute.Binary_dilation(on_off_M, struct_element)
+            self.assertTrue(np.array_equal(dilated_M,binary_dilation(on_off_M, struct_element)),'The dilation with a '+str(struct_element.shape)+' structural element is not the one of scipy!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Compute_kc(self):
+        '''
+        Try to compute the solute diffusion coefficient map with Owntools.Compute.Compute_kc_dil(), Compute_kc_wfd() and Compute_kc_int().
+
+            Output :
+                The result depends on the fact if the maps are well computed or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create two grains in contact
+        User.Add_2grains(dict_material,dict_sample)
+        Grain.Compute_overlap_2_grains(dict_sample)
+        Grain.Apply_overlap_target(dict_material,dict_sample,dict_sollicitation,{'L_displacement': [0], 'L_int_displacement' : [0]})
+        eta1_M = dict_sample['L_g'][0].expand_etai_M()
+        eta2_M = dict_sample['L_g'][1].expand_etai_M()
+        on_off_M = ((eta1_M > 0.5) & (eta2_M > 0.5)) | ((eta1_M < 0.5) & (eta2_M < 0.5))
+        #dilation
+        Owntools.Compute.Compute_kc_dil(dict_algorithm, dict_material, dict_sample)
+        kc_M = dict_material['kappa_c']*binary_dilation(on_off_M, dict_algorithm['struct_element'])
+        self.assertTrue(np.array_equal(dict_sample['kc_M'],kc_M),'The map of Compute_kc_dil() is not well computed!')
+        #water film diffusion
+        Owntools.Compute.Compute_kc_wfd(dict_material, dict_sample)
+        L_c_film = np.where(abs(dict_sample['x_L']) < dict_material['width_wfd']/2)[0]
+        self.assertTrue(np.all(dict_sample['kc_M'][:,L_c_film]==dict_material['kappa_c']),'The water film is not in the map of Compute_kc_wfd()!')
+        self.assertTrue(np.array_equal(dict_sample['kc_M']>0,on_off_M|(dict_sample['kc_M']>0)),'The map of Compute_kc_wfd() is not well computed!')
+        #water film thinner than the mesh, the nearest column of x = 0 is in the film
+        dx = dict_sample['x_L'][1]-dict_sample['x_L'][0]
+        for width_wfd in [dx/10, 0]:
+            dict_material['width_wfd'] = width_wfd
+            Owntools.Compute.Compute_kc_wfd(dict_material, dict_sample)
+            c_nearest = np.argmin(np.abs(dict_sample['x_L']))
+            self.assertTrue(np.all(dict_sample['kc_M'][:,c_nearest]==dict_material['kappa_c']),'The water film thinner than the mesh is not in the map of Compute_kc_wfd()!')
+        #interpolation, a node inside the first grain only is checked
+        Owntools.Compute.Compute_kc_int(dict_material, dict_sample)
+        l, c = np.argwhere((eta1_M > 0.5) & (eta2_M < 0.5))[0]
+        grain = dict_sample['L_g'][0]
+        Distance = np.linalg.norm(np.array([dict_sample['x_L'][c], dict_sample['y_L'][-1-l]]) - grain.center)
+        kc = dict_material['kappa_c']*math.exp(-(grain.r_mean-Distance)/(grain.r_mean/dict_material['tau_kappa_c']))
+        self.assertTrue(abs(dict_sample['kc_M'][l,c]-kc)<1e-12*kc,'The map of Compute_kc_int() is not well computed!')
+        self.assertTrue(np.all(dict_sample['kc_M'][on_off_M]==dict_material['kappa_c']),'The map of Compute_kc_int() is not kc in the contact and the pore!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Compute_kc_dil_incremental(self):
+        '''
+        Try to update the solute diffusion coefficient map with Owntools.Compute.Compute_kc_dil() after moves of a grain.
+
+        The map updated on the box of the changes is compared with the map computed on the whole mesh.
+
+            Output :
+                The result depends on the fact if the updated map is the one of the whole mesh or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create two grains in contact
+        User.Add_2grains(dict_material,dict_sample)
+        Grain.Compute_overlap_2_grains(dict_sample)
+        Grain.Apply_overlap_target(dict_material,dict_sample,dict_sollicitation,{'L_displacement': [0], 'L_int_displacement' : [0]})
+        Owntools.Compute.Compute_kc_dil(dict_algorithm, dict_material, dict_sample)
+        kc_M = dict_sample['kc_M']
+        dx = dict_sample['x_L'][1]-dict_sample['x_L'][0]
+        for displacement in [np.array([1.5*dx,0]), np.array([2.5*dx,-dx]), np.array([0,0])]:
+            #move the first grain and update the map
+            dict_sample['L_g'][0].move_grain_interpolation(displacement, dict_sample)
+            Owntools.Compute.Compute_kc_dil(dict_algorithm, dict_material, dict_sample)
+            self.assertTrue(dict_sample['kc_M'] is kc_M,'The map is not updated in place!')
+            #reference on the whole mesh
+            on_off_M = Owntools.Compute.On_off_map(dict_sample)
+            kc_M_ref = dict_material['kappa_c']*binary_dilation(on_off_M, dict_algorithm['struct_element'])
+            self.assertTrue(np.array_equal(kc_M,kc_M_ref),'The updated map is not the one of the whole mesh!')
+        self.assertTrue('dict_kc_dil' not in dict_sample.keys(),'The state of the update is saved with the sample!')
+        #the sample is saved and reloaded, the map of the sample is not the one known
+        dict_sample = pickle.loads(pickle.dumps(dict_sample))
+        dict_sample['L_g'][0].move_grain_interpolation(np.array([-1.5*dx,0]), dict_sample)
+        Owntools.Compute.Compute_kc_dil(dict_algorithm, dict_material, dict_sample)
+        self.assertTrue(Owntools.Compute.dict_kc_dil['kc_M'] is dict_sample['kc_M'],'The map of the reloaded sample is not the one updated!')
+        kc_M_ref = dict_material['kappa_c']*binary_dilation(Owntools.Compute.On_off_map(dict_sample), dict_algorithm['struct_element'])
+        self.assertTrue(np.array_equal(dict_sample['kc_M'],kc_M_ref),'The map of the reloaded sample is not the one of the whole mesh!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Compute_sum_Ed(self):
+        '''
+        Try to compute the sums of the total energy with Owntools.Compute.Compute_sum_Ed().
+
+        The results are compared with the sums computed on the full maps and the buffers must be reused at the second call.
+
+            Output :
+                The result depends on the fact if the sums are well computed or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create two grains in contact, the solute and the mechanical energy
+        User.Add_2grains(dict_material,dict_sample)
+        Grain.Compute_overlap_2_grains(dict_sample)
+        Grain.Apply_overlap_target(dict_material,dict_sample,dict_sollicitation,{'L_displacement': [0], 'L_int_displacement' : [0]})
+        User.Add_solute(dict_sample)
+        dict_sample['solute_M'] = dict_sample['solute_M'] + np.random.rand(len(dict_sample['y_L']),len(dict_sample['x_L']))
+        Owntools.Compute.Compute_sum_min_etai_Emec(dict_sample, dict_sollicitation)
+        #reference on the full maps
+        eta1_M = dict_sample['L_g'][0].expand_etai_M()
+        eta2_M = dict_sample['L_g'][1].expand_etai_M()
+        Ed_che_M = dict_sollicitation['chi']*dict_sample['solute_M']*(3*eta1_M**2-2*eta1_M**3+3*eta2_M**2-2*eta2_M**3)
+        Ed_M = dict_sample['Emec_M'] - Ed_che_M
+        contact_M = (eta1_M > 0.5) & (eta2_M > 0.5)
+        dict_ref = {'sum_ed' : np.sum(Ed_M), 'sum_Ed_mec' : np.sum(dict_sample['Emec_M']), 'sum_Ed_che' : np.sum(Ed_che_M),
+                    'sum_ed_plus' : np.sum(Ed_M[Ed_M > 0]), 'sum_ed_minus' : -np.sum(Ed_M[Ed_M <= 0]),
+                    'sum_ed_abs' : np.sum(np.abs(Ed_M[contact_M])), 'n_node' : np.sum(contact_M)}
+        dict_ref['sum_ed_abs_node'] = dict_ref['sum_ed_abs']/dict_ref['n_node']
+        #try to compute the sums, twice
+        Owntools.Compute.Compute_sum_Ed(dict_sample, dict_sollicitation)
+        Ed_M = Owntools.dict_buffer['Ed_M']
+        Owntools.Compute.Compute_sum_Ed(dict_sample, dict_sollicitation)
+        self.assertTrue(Owntools.dict_buffer['Ed_M'] is Ed_M,'The buffers are not reused!')
+        self.assertTrue(not any([isinstance(value, np.ndarray) and np.may_share_memory(value, Ed_M) for value in dict_sample.values()]),'A buffer is saved with the sample!')
+        self.assertTrue(dict_sample['n_node']==dict_ref['n_node'] and dict_ref['n_node']>0,'The contact zone is not well computed!')
+        for key in dict_ref.keys():
+            self.assertTrue(np.isclose(dict_sample[key],dict_ref[key],rtol=1e-9,atol=1e-9),'The sum '+key+' is not well computed!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Compute_sum_min_etai_Emec(self):
+        '''
+        Try to compute the sum of the minimum of etai and the mechanical energy in one pass with Owntools.Compute.Compute_sum_min_etai_Emec().
+
+        The results must be the ones computed on the phase fields expanded on the mesh.
+
+            Output :
+                The result depends on the fact if the results are the same and the map is updated in place or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create two grains in contact
+        User.Add_2grains(dict_material,dict_sample)
+        Grain.Compute_overlap_2_grains(dict_sample)
+        Grain.Apply_overlap_target(dict_material,dict_sample,dict_sollicitation,{'L_displacement': [0], 'L_int_displacement' : [0]})
+        #reference, on the mesh
+        min_etai_M = np.minimum(dict_sample['L_g'][0].expand_etai_M(),dict_sample['L_g'][1].expand_etai_M())
+        sum_min_etai_ref = np.sum(min_etai_M)
+        #first call, alpha is initialized
+        Owntools.Compute.Compute_sum_min_etai_Emec(dict_sample, dict_sollicitation)
+        self.assertTrue(np.isclose(dict_sollicitation['alpha'],0.2*sum_min_etai_ref),'The parameter alpha is not well initialized!')
+        Emec_M_ref = dict_sollicitation['alpha']/sum_min_etai_ref*min_etai_M
+        #try the one pass computation
+        Emec_M = dict_sample['Emec_M']
+        Owntools.Compute.Compute_sum_min_etai_Emec(dict_sample, dict_sollicitation)
+        self.assertTrue(dict_sample['Emec_M'] is Emec_M,'The mechanical energy map is not updated in place!')
+        self.assertTrue(np.isclose(dict_sample['sum_min_etai'],sum_min_etai_ref),'The sum of the minimum of etai is not well computed!')
+        self.assertTrue(np.allclose(dict_sample['Emec_M'],Emec_M_ref),'The mechanical energy is not well computed!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Read_vtu_Multi(self):
+        '''
+        Try to read files from MOOSE simulation with Owntools.PFtoDEM_Multi.Read_vtu_Multi().
+
+        Two small files (two processors) are written, the fields are projected on the mesh with Owntools.PFtoDEM_Multi.Field_on_mesh().
+
+            Output :
+                The result depends on the fact if the fields are well read or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        dict_algorithm['np_proc'] = 2
+        dict_sample['x_L'] = np.array([0.,1.,2.])
+        dict_sample['y_L'] = np.array([0.,1.])
+        #write the files, each processor has 3 nodes
+        for i_proc in range(2):
+            y = 1-i_proc
+            file_to_write = open('Test_vtu_'+str(i_proc)+'.vtu','w')
+            file_to_write.write('    <Piece NumberOfPoints="3" NumberOfCells="0">\n      <PointData>\n')
+            file_to_write.write('        <DataArray type="Float64" Name="c" format="ascii" RangeMin="0" RangeMax="1">\n')
+            file_to_write.write('          '+str(10*y)+' '+str(10*y+1)+'\n          '+str(10*y+2)+'\n')
+            file_to_write.write('        </DataArray>\n')
+            file_to_write.write('        <DataArray type="Float64" Name="eta1" format="ascii" RangeMin="0" RangeMax="1">\n')
+            file_to_write.write('          '+str(y)+' '+str(y)+' '+str(y)+'\n')
+            file_to_write.write('        </DataArray>\n')
+            file_to_write.write('      </PointData>\n      <Points>\n')
+            file_to_write.write('        <DataArray type="Float64" Name="Points" NumberOfComponents="3" format="ascii" RangeMin="0" RangeMax="2">\n')
+            file_to_write.write('          0 '+str(y)+' 0 1 '+str(y)+' 0\n          2 '+str(y)+' 0\n')
+            file_to_write.write('          <InformationKey name="L2_NORM_RANGE" location="vtkDataArray" length="2">\n')
+            file_to_write.write('            <Value index="0">\n              0\n            </Value>\n          </InformationKey>\n')
+            file_to_write.write('        </DataArray>\n      </Points>\n')
+            file_to_write.close()
+        #try to read the files
+        dict_data = Owntools.PFtoDEM_Multi.Read_vtu_Multi('Test_vtu',['c'],dict_algorithm,dict_sample)
+        self.assertTrue(list(dict_data.keys())==['L_l','L_c','c'] and len(dict_data['c'])==6,'The fields read are not the fields asked!')
+        #the line l is at y_L[-1-l]
+        solute_M = Owntools.PFtoDEM_Multi.Field_on_mesh(dict_data,'c',dict_sample)
+        self.assertTrue(np.array_equal(solute_M,[[10,11,12],[0,1,2]]),'The field is not well projected on the mesh!')
+        #the map of the nodes is known, the coordinates are not needed anymore
+        self.assertTrue(0 in dict_sample['dict_node_index'] and 1 in dict_sample['dict_node_index'],'The map of the nodes has not been saved!')
+        dict_data = Owntools.PFtoDEM_Multi.Read_vtu_Multi('Test_vtu',['eta1'],dict_algorithm,dict_sample)
+        for i_proc in range(2):
+            os.remove('Test_vtu_'+str(i_proc)+'.vtu')
+        self.assertTrue(np.array_equal(Owntools.PFtoDEM_Multi.Field_on_mesh(dict_data,'eta1',dict_sample),[[1,1,1],[0,0,0]]),'The field is not well projected with the map saved!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Read_vtu_Multi_pool(self):
+        '''
+        Try to read files from MOOSE simulation with Owntools.PFtoDEM_Multi.Read_vtu_Multi() in a pool of processes.
+
+        The files are listed in a .pvtu index, their number is not the number of processors np_proc.
+
+            Output :
+                The result depends on the fact if the fields are well read or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        dict_algorithm['np_proc'] = 4
+        dict_algorithm['n_proc_read'] = 2
+        dict_sample['x_L'] = np.array([0.,1.])
+        dict_sample['y_L'] = np.array([0.,1.,2.])
+        #write the files, each file has the 2 nodes of one line
+        os.mkdir('Test_pvtu')
+        file_to_write = open('Test_pvtu/last.pvtu','w')
+        file_to_write.write('<VTKFile type="PUnstructuredGrid">\n  <PUnstructuredGrid GhostLevel="0">\n')
+        for i_proc in range(3):
+            file_to_write.write('    <Piece Source="last_'+str(i_proc)+'.vtu"/>\n')
+        file_to_write.write('  </PUnstructuredGrid>\n</VTKFile>\n')
+        file_to_write.close()
+        for i_proc in range(3):
+            file_to_write = open('Test_pvtu/last_'+str(i_proc)+'.vtu','w')
+            file_to_write.write('    <Piece NumberOfPoints="2" NumberOfCells="0">\n      <PointData>\n')
+            file_to_write.write('        <DataArray type="Float64" Name="c" format="ascii" RangeMin="0" RangeMax="1">\n')
+            file_to_write.write('          '+str(10*i_proc)+' '+str(10*i_proc+1)+'\n')
+            file_to_write.write('        </DataArray>\n      </PointData>\n      <Points>\n')
+            file_to_write.write('        <DataArray type="Float64" Name="Points" NumberOfComponents="3" format="ascii" RangeMin="0" RangeMax="2">\n')
+            file_to_write.write('          0 '+str(i_proc)+' 0 1 '+str(i_proc)+' 0\n')
+            file_to_write.write('        </DataArray>\n      </Points>\n')
+            file_to_write.close()
+        #try to read the files, two times to use the map of the nodes
+        L_solute_M = []
+        for i in range(2):
+            dict_data = Owntools.PFtoDEM_Multi.Read_vtu_Multi('Test_pvtu/last',['c'],dict_algorithm,dict_sample)
+            L_solute_M.append(Owntools.PFtoDEM_Multi.Field_on_mesh(dict_data,'c',dict_sample))
+        Owntools.PFtoDEM_Multi.Close_pool()
+        shutil.rmtree('Test_pvtu')
+        self.assertTrue(list(dict_sample['dict_node_index'].keys())==['mesh',0,1,2],'The files are not the ones of the .pvtu!')
+        for solute_M in L_solute_M:
+            self.assertTrue(np.array_equal(solute_M,[[20,21],[10,11],[0,1]]),'The field is not well projected on the mesh!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Read_vtu_binary(self):
+        '''
+        Try to read binary files from MOOSE simulation with Owntools.PFtoDEM_Multi.Read_vtu_Multi().
+
+        Three files are written : inline binary compressed with zlib, appended base64 and appended raw.
+
+            Output :
+                The result depends on the fact if the fields are well decoded or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        dict_algorithm['np_proc'] = 3
+        dict_algorithm['n_proc_read'] = 1
+        dict_sample['x_L'] = np.array([0.,1.])
+        dict_sample['y_L'] = np.array([0.,1.,2.])
+        #write the files, each file has the 2 nodes of one line
+        for i_proc in range(3):
+            dict_array = {'c' : np.array([10.*i_proc, 10.*i_proc+1]), 'Points' : np.array([0., i_proc, 0., 1., i_proc, 0.])}
+            L_tag = []
+            appended = b''
+            for name in dict_array:
+                values = dict_array[name].tobytes()
+                if i_proc == 0:
+                    #one block compressed, the header and the values are encoded separately
+                    compressed = zlib.compress(values)
+                    L_tag.append((name, 'format="binary">'+base64.b64encode(np.array([1, len(values), len(values), len(compressed)], dtype='<u4').tobytes()).decode()+base64.b64encode(compressed).decode()))
+                elif i_proc == 1:
+                    L_tag.append((name, 'format="appended" offset="'+str(len(appended))+'">'))
+                    appended = appended + base64.b64encode(np.array([len(values)], dtype='<u4').tobytes()) + base64.b64encode(values)
+                else :
+                    L_tag.append((name, 'format="appended" offset="'+str(len(appended))+'">'))
+                    appended = appended + np.array([len(values)], dtype='<u4').tobytes() + values
+            file_to_write = open('Test_vtu_'+str(i_proc)+'.vtu','wb')
+            if i_proc == 0:
+                file_to_write.write(b'<VTKFile type="UnstructuredGrid" header_type="UInt32" compressor="vtkZLibDataCompressor">\n')
+            else :
+                file_to_write.write(b'<VTKFile type="UnstructuredGrid" header_type="UInt32">\n')
+            file_to_write.write(b'    <Piece NumberOfPoints="2" NumberOfCells="0">\n      <PointData>\n')
+            file_to_write.write(('        <DataArray type="Float64" Name="c" '+L_tag[0][1]+'\n        </DataArray>\n      </PointData>\n      <Points>\n').encode())
+            file_to_write.write(('        <DataArray type="Float64" Name="Points" NumberOfComponents="3" '+L_tag[1][1]+'\n        </DataArray>\n      </Points>\n    </Piece>\n').encode())
+            if i_proc == 1:
+                file_to_write.write(b'  <AppendedData encoding="base64">\n   _'+appended+b'\n  </AppendedData>\n')
+            elif i_proc == 2:
+                file_to_write.write(b'  <AppendedData encoding="raw">\n   _'+appended+b'\n  </AppendedData>\n')
+            file_to_write.write(b'</VTKFile>\n')
+            file_to_write.close()
+        #try to read the files
+        dict_data = Owntools.PFtoDEM_Multi.Read_vtu_Multi('Test_vtu',['c'],dict_algorithm,dict_sample)
+        for i_proc in range(3):
+            os.remove('Test_vtu_'+str(i_proc)+'.vtu')
+        self.assertTrue(np.array_equal(Owntools.PFtoDEM_Multi.Field_on_mesh(dict_data,'c',dict_sample),[[20,21],[10,11],[0,1]]),'The binary data are not well decoded!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Read_exodus(self):
+        '''
+        Try to read an exodus file from MOOSE simulation with Owntools.PFtoDEM_Multi.Read_exodus().
+
+        A small file is written (3 x 2 nodes, 2 elements, 2 time steps), with a nodal variable and an elemental variable.
+
+            Output :
+                The result depends on the fact if the fields are well read or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        dict_sample['x_L'] = np.array([0.,1.,2.])
+        dict_sample['y_L'] = np.array([0.,1.])
+        #write the file
+        exodus = scipy.io.netcdf_file('Test_exodus.e','w')
+        exodus.createDimension('time_step', None)
+        exodus.createDimension('num_nodes', 6)
+        exodus.createDimension('num_el_in_blk1', 2)
+        exodus.createDimension('num_nod_per_el1', 4)
+        exodus.createDimension('num_nod_var', 1)
+        exodus.createDimension('num_elem_var', 1)
+        exodus.createDimension('len_name', 8)
+        exodus.createVariable('coordx', 'd', ('num_nodes',))[:] = [0,1,2,0,1,2]
+        exodus.createVariable('coordy', 'd', ('num_nodes',))[:] = [0,0,0,1,1,1]
+        exodus.createVariable('connect1', 'i', ('num_el_in_blk1','num_nod_per_el1'))[:] = [[1,2,5,4],[2,3,6,5]]
+        exodus.createVariable('name_nod_var', 'c', ('num_nod_var','len_name'))[:] = np.array([list('c'+7*chr(0))], dtype='S1')
+        exodus.createVariable('name_elem_var', 'c', ('num_elem_var','len_name'))[:] = np.array([list('Ed_mec'+2*chr(0))], dtype='S1')
+        exodus.createVariable('vals_nod_var1', 'd', ('time_step','num_nodes'))[:] = [[0,0,0,0,0,0],[0,1,2,10,11,12]]
+        exodus.createVariable('vals_elem_var1eb1', 'd', ('time_step','num_el_in_blk1'))[:] = [[2,4],[0,0]]
+        exodus.close()
+        #try to read the file
+        dict_data = Owntools.PFtoDEM_Multi.Read_exodus('Test_exodus.e',['c'],-1,dict_sample)
+        self.assertTrue(np.array_equal(Owntools.PFtoDEM_Multi.Field_on_mesh(dict_data,'c',dict_sample),[[10,11,12],[0,1,2]]),'The nodal field is not well read at the last step!')
+        #the elemental field is averaged on the nodes
+        dict_data = Owntools.PFtoDEM_Multi.Read_exodus('Test_exodus.e',['Ed_mec'],0,dict_sample)
+        os.remove('Test_exodus.e')
+        self.assertTrue(np.array_equal(Owntools.PFtoDEM_Multi.Field_on_mesh(dict_data,'Ed_mec',dict_sample),[[2,3,4],[2,3,4]]),'The elemental field is not well read at the first step!')
+        #a netCDF-4 file (HDF5 signature) needs netCDF4, a clear error is raised without it
+        if Owntools.PFtoDEM_Multi.netCDF4 is None:
+            f = open('Test_exodus.e','wb')
+            f.write(b'\x89HDF\r\n\x1a\n')
+            f.close()
+            with self.assertRaisesRegex(ImportError, 'netCDF4'):
+                Owntools.PFtoDEM_Multi.Read_exodus('Test_exodus.e',['c'],-1,dict_sample)
+            os.remove('Test_exodus.e')
+
+#-------------------------------------------------------------------------------
+
+class TestGeometry(unittest.TestCase):
+    '''Test functions from Owntools/Geometry.py.'''
+    def test_Marching_Squares(self):
+        '''
+        Try to extract the border of a grain with Owntools.Geometry.Marching_Squares().
+
+        The contour must be closed, counterclockwise and near the analytical circle.
+
+            Output :
+                The result depends on the fact if the contour is well extracted or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create one grain
+        grain = Grain.Grain(0,50,np.array([np.mean(dict_sample['x_L']),np.mean(dict_sample['y_L'])]),dict_material,dict_sample)
+        #try to extract the contour
+        L_contour = Owntools.Geometry.Marching_Squares(grain.expand_etai_M(),dict_sample['x_L'],dict_sample['y_L'],0.5)
+        self.assertTrue(len(L_contour)==1,'Owntools.Geometry.Marching_Squares() does not find one contour!')
+        contour = L_contour[0]
+        self.assertTrue(np.array_equal(contour[0],contour[-1]),'The contour is not closed!')
+        #the signed area is positive for a counterclockwise contour
+        signed_area = 0.5*np.sum(contour[:-1,0]*contour[1:,1]-contour[1:,0]*contour[:-1,1])
+        self.assertTrue(signed_area>0,'The contour is not counterclockwise!')
+        self.assertTrue(np.max(abs(np.linalg.norm(contour-grain.center,axis=1)-50))<0.1,'The contour is not near the analytical circle!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Resample_Polygon(self):
+        '''
+        Try to resample a polygon with Owntools.Geometry.Resample_Polygon().
+
+            Output :
+                The result depends on the fact if the vertices are uniformly distributed or not (a bool)
+        '''
+        #a square of perimeter 4 with unequal edges discretisation
+        L_border = np.array([[0,0],[0.5,0],[1,0],[1,1],[0,1],[0,0]])
+        L_border_new = Owntools.Geometry.Resample_Polygon(L_border,8)
+        self.assertTrue(len(L_border_new)==9,'The number of vertices is not the one asked!')
+        self.assertTrue(np.allclose(np.linalg.norm(np.diff(L_border_new,axis=0),axis=1)[[0,2,4,6]],0.5),'The vertices are not uniformly distributed!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Polygon_Area_Center(self):
+        '''
+        Try to compute the area and the center of a polygon with Owntools.Geometry.Polygon_Area_Center().
+
+        A rectangle is considered in both orientations.
+
+            Output :
+                The result depends on the fact if the area and the center are well computed or not (a bool)
+        '''
+        L_border = np.array([[1,1],[3,1],[3,2],[1,2],[1,1]])
+        for border in [L_border, L_border[::-1]]:
+            Area, Center = Owntools.Geometry.Polygon_Area_Center(border)
+            self.assertTrue(abs(Area-2)<1e-12,'The area of the rectangle is not well computed!')
+            self.assertTrue(np.allclose(Center,[2,1.5]),'The center of the rectangle is not well computed!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Maximum_Inscribed_Circle(self):
+        '''
+        Try to compute the maximum inscribed circle with Owntools.Geometry.Maximum_Inscribed_Circle().
+
+        A square, a regular polygon near a disk and triangles (sharp corners) are considered, the inscribed circles are known.
+
+            Output :
+                The result depends on the fact if the circles are well computed or not (a bool)
+        '''
+        #a square of side 2
+        L_border = np.array([[0,0],[2,0],[2,2],[0,2],[0,0]])
+        center, radius = Owntools.Geometry.Maximum_Inscribed_Circle(L_border, 10)
+        self.assertTrue(np.allclose(center,[1,1],atol=1e-4) and abs(radius-1)<1e-5,'The inscribed circle of a square is not well computed!')
+        #a regular polygon with 80 vertices, the inscribed radius is the apothem
+        L_theta = np.linspace(0,2*math.pi,81)
+        L_border = np.column_stack((3+50*np.cos(L_theta),-2+50*np.sin(L_theta)))
+        center, radius = Owntools.Geometry.Maximum_Inscribed_Circle(L_border, 10)
+        self.assertTrue(np.allclose(center,[3,-2],atol=1e-2) and abs(radius-50*math.cos(math.pi/80))<1e-4,'The inscribed circle of a disk is not well computed!')
+        #a flat triangle and random triangles, the inscribed radius is 2*area/perimeter
+        generator = np.random.default_rng(0)
+        L_triangle = [np.array([[0,0],[100,0],[50,3]])] + [generator.uniform(0,100,(3,2)) for i in range(50)]
+        for triangle in L_triangle:
+            L_border = np.vstack((triangle,triangle[:1]))
+            area = abs(np.cross(triangle[1]-triangle[0],triangle[2]-triangle[0]))/2
+            perimeter = np.sum(np.linalg.norm(L_border[1:]-L_border[:-1],axis=1))
+            for n_spatial in [10, 100]:
+                center, radius = Owntools.Geometry.Maximum_Inscribed_Circle(L_border, n_spatial)
+                self.assertTrue(abs(radius-2*area/perimeter)<1e-6*(2*area/perimeter),'The inscribed circle of a triangle is not well computed!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Polygon_Intersection(self):
+        '''
+        Try to compute the intersection of two polygons with Owntools.Geometry.Polygon_Intersection().
+
+        Two squares shifted by half a side and two squares without contact are considered.
+
+            Output :
+                The result depends on the fact if the intersection is well computed or not (a bool)
+        '''
+        L_border = np.array([[0,0],[2,0],[2,2],[0,2],[0,0]])
+        L_hull = np.array([[1,1],[3,1],[3,3],[1,3]])
+        L_P_int = Owntools.Geometry.Polygon_Intersection(L_border, L_hull)
+        self.assertTrue(np.array_equal(L_P_int[0],L_P_int[-1]),'The intersection is not closed!')
+        Area, Center = Owntools.Geometry.Polygon_Area_Center(L_P_int)
+        self.assertTrue(abs(Area-1)<1e-12,'The area of the intersection is not well computed!')
+        self.assertTrue(np.allclose(Center,[1.5,1.5]),'The center of the intersection is not well computed!')
+        L_P_int = Owntools.Geometry.Polygon_Intersection(L_border, L_hull+5)
+        self.assertTrue(len(L_P_int)==0,'The intersection of two polygons without contact is not empty!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Convex_Hull(self):
+        '''
+        Try to compute the convex hull of points with Owntools.Geometry.Convex_Hull().
+
+        The corners of a square are mixed with points inside it.
+
+            Output :
+                The result depends on the fact if the hull is well computed or not (a bool)
+        '''
+        L_P = np.concatenate((np.random.uniform(0.1,0.9,(50,2)),np.array([[0,0],[1,0],[1,1],[0,1],[0.5,0]])))
+        L_hull = Owntools.Geometry.Convex_Hull(L_P)
+        self.assertTrue(len(L_hull)==4,'The convex hull of a square must have 4 vertices!')
+        self.assertTrue(abs(Owntools.Geometry.Polygon_Area_Center(np.concatenate((L_hull,L_hull[:1])))[0]-1)<1e-12,'The convex hull is not the square!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Rotating_Calipers(self):
+        '''
+        Try to compute the diameter and the minimum width of a convex polygon with Owntools.Geometry.Rotating_Calipers().
+
+        A rectangle 4 x 3 is considered.
+
+            Output :
+                The result depends on the fact if the diameter and the width are well computed or not (a bool)
+        '''
+        L_hull = np.array([[0,0],[4,0],[4,3],[0,3]])
+        diameter, ij_diameter, width_min = Owntools.Geometry.Rotating_Calipers(L_hull)
+        self.assertTrue(abs(diameter-5)<1e-12,'The diameter of the rectangle is not well computed!')
+        self.assertTrue(abs(np.linalg.norm(L_hull[ij_diameter[0]]-L_hull[ij_diameter[1]])-5)<1e-12,'The vertices of the diameter are not well found!')
+        self.assertTrue(abs(width_min-3)<1e-12,'The minimum width of the rectangle is not well computed!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Minimum_Enclosing_Circle(self):
+        '''
+        Try to compute the minimum circumscribing circle with Owntools.Geometry.Minimum_Enclosing_Circle().
+
+        Two cases are considered : the circle is defined by two points, the circle is defined by three points.
+
+            Output :
+                The result depends on the fact if the circles are well computed or not (a bool)
+        '''
+        #two points on a diameter, the others inside
+        center, radius = Owntools.Geometry.Minimum_Enclosing_Circle(np.array([[-1,0],[1,0],[0,0.5],[0.2,-0.3]]))
+        self.assertTrue(np.allclose(center,[0,0]) and abs(radius-1)<1e-12,'The circle defined by two points is not well computed!')
+        #equilateral triangle
+        L_P = np.array([[math.cos(theta),math.sin(theta)] for theta in [0,2*math.pi/3,4*math.pi/3]])+np.array([2,3])
+        center, radius = Owntools.Geometry.Minimum_Enclosing_Circle(L_P)
+        self.assertTrue(np.allclose(center,[2,3]) and abs(radius-1)<1e-12,'The circle defined by three points is not well computed!')
+        #the result is reproducible and the points given are not shuffled
+        L_P = [np.array([math.cos(theta),2*math.sin(theta)]) for theta in np.linspace(0,2*math.pi,50,endpoint=False)]
+        L_P_copy = [P.copy() for P in L_P]
+        circle_1 = Owntools.Geometry.Minimum_Enclosing_Circle(L_P)
+        circle_2 = Owntools.Geometry.Minimum_Enclosing_Circle(L_P)
+        self.assertTrue(np.array_equal(circle_1[0],circle_2[0]) and circle_1[1]==circle_2[1],'The circle is not reproducible!')
+        self.assertTrue(all([np.array_equal(P,P_copy) for P, P_copy in zip(L_P, L_P_copy)]),'The points given are shuffled!')
+
 #-------------------------------------------------------------------------------
 
 class TestGrain(unittest.TestCase):
@@ -500,6 +1180,89 @@ class TestGrain(unittest.TestCase):
 
     #---------------------------------------------------------------------------
 
+    def test_geometric_study_dissolved(self):
+        '''
+        Try to study the geometry of a dissolved grain with Grain.geometric_study().
+
+            Output :
+                The result depends on the fact if a clear error is raised or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create one grain and dissolve it
+        grain = Grain.Grain(0,10,np.array([np.mean(dict_sample['x_L']),np.mean(dict_sample['y_L'])]),dict_material,dict_sample)
+        for window_M in [0.4*grain.etai_window_M, np.zeros((0,0))]:
+            grain.etai_window_M = window_M
+            with self.assertRaisesRegex(ValueError, 'dissolved'):
+                grain.geometric_study(dict_sample)
+
+    #---------------------------------------------------------------------------
+
+    def test_etai_window(self):
+        '''
+        Try to save the phase field of a grain on a window with Grain.set_etai_window().
+
+        The phase field expanded on the mesh must be the phase field given. The window must be smaller than the mesh.
+
+            Output :
+                The result depends on the fact if the window is well defined or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create one grain
+        grain = Grain.Grain(0,10,np.array([np.mean(dict_sample['x_L']),np.mean(dict_sample['y_L'])]),dict_material,dict_sample)
+        #try to save a phase field touching the side of the mesh
+        etai_M = np.zeros((len(dict_sample['y_L']),len(dict_sample['x_L'])))
+        etai_M[2:7,0:4] = 1
+        etai_M[5,8] = 0.5
+        grain.set_etai_M(etai_M)
+        self.assertTrue(np.array_equal(grain.expand_etai_M(),etai_M),'The phase field is not well saved on the window!')
+        self.assertTrue(grain.etai_box()==(1,8,0,10),'The window of the phase field is not well defined!')
+        self.assertTrue(grain.etai_on_box((2,4,1,3)).shape==(2,2) and np.all(grain.etai_on_box((2,4,1,3))==1),'The part of the window is not well extracted!')
+
+    #---------------------------------------------------------------------------
+
+    def test_border_storage(self):
+        '''
+        Try to store the border of a grain in one array with Grain.l_border_x and Grain.l_border_y as views.
+
+            Output :
+                The result depends on the fact if the border is well stored or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create one grain
+        grain = Grain.Grain(0,10,np.array([np.mean(dict_sample['x_L']),np.mean(dict_sample['y_L'])]),dict_material,dict_sample)
+        self.assertTrue(grain.l_border.shape==(dict_sample['grain_discretisation']+1,2),'The border is not stored in a n+1 x 2 array!')
+        self.assertTrue(np.shares_memory(grain.l_border_x,grain.l_border) and np.shares_memory(grain.l_border_y,grain.l_border),'The coordinates x and y are not views of the border!')
+        #try to move the grain, the initial border must not be moved
+        grain.move_grain_interpolation(np.array([1,2]),dict_sample)
+        self.assertTrue(np.allclose(grain.l_border-grain.l_border_init,[1,2]),'The border has not been well moved!')
+        self.assertFalse(hasattr(grain,'__dict__'),'The attributes of a grain must be defined by __slots__!')
+
+    #---------------------------------------------------------------------------
+
+    def test_radius_at_theta(self):
+        '''
+        Try to compute the radius of a grain in some directions with Grain.radius_at_theta().
+
+        The table of the radius is given. The radius is checked on the table, between two angles and around 0 (periodicity).
+
+            Output :
+                The result depends on the fact if the radius are well interpolated or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create one grain
+        grain = Grain.Grain(0,10,np.array([np.mean(dict_sample['x_L']),np.mean(dict_sample['y_L'])]),dict_material,dict_sample)
+        grain.l_r = np.array([1.,2.,3.,4.])
+        grain.l_theta_r = 2*math.pi*np.arange(4)/4
+        #try to interpolate the radius
+        L_R = grain.radius_at_theta(np.array([0,math.pi/2,math.pi/4,7*math.pi/4,2*math.pi,-math.pi/4]))
+        self.assertTrue(np.allclose(L_R,[1,2,1.5,2.5,1,2.5]),'The radius are not well interpolated!')
+
+    #---------------------------------------------------------------------------
+
     def test_P_is_inside(self):
         '''
         Try to determine if a point is inside a grain geometry with Grain.P_is_inside().
@@ -519,6 +1282,47 @@ class TestGrain(unittest.TestCase):
 
     #---------------------------------------------------------------------------
 
+    def test_P_is_inside_many(self):
+        '''
+        Try to determine if several points are inside a grain geometry with Grain.P_is_inside_many().
+
+        The result is compared with Grain.P_is_inside().
+
+            Output :
+                The result depends on the fact if points are well located or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create one grain
+        grain = Grain.Grain(0,10,np.array([np.mean(dict_sample['x_L']),np.mean(dict_sample['y_L'])]),dict_material,dict_sample)
+        #check if the function works well with random points
+        L_P = np.column_stack((np.random.uniform(-12,12,200),np.random.uniform(-12,12,200)))+grain.center
+        L_inside = grain.P_is_inside_many(L_P)
+        self.assertTrue(np.array_equal(L_inside,[grain.P_is_inside(P) for P in L_P]),'Grain.P_is_inside_many() does not match Grain.P_is_inside()...')
+
+    #---------------------------------------------------------------------------
+
+    def test_Compute_sphericity(self):
+        '''
+        Try to compute the sphericity of a grain with Grain.Compute_sphericity().
+
+        A disk grain is considered, all the sphericity parameters must be near 1.
+
+            Output :
+                The result depends on the fact if the sphericity parameters are well computed or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create one grain
+        grain = Grain.Grain(0,50,np.array([np.mean(dict_sample['x_L']),np.mean(dict_sample['y_L'])]),dict_material,dict_sample)
+        grain.geometric_study(dict_sample)
+        #try to compute the sphericity
+        grain.Compute_sphericity(dict_algorithm)
+        for sphericity in [grain.area_sphericity, grain.diameter_sphericity, grain.circle_ratio_sphericity, grain.perimeter_sphericity, grain.width_to_length_ratio_sphericity]:
+            self.assertTrue(abs(sphericity-1)<0.05,'The sphericity of a disk is not well computed!')
+
+    #---------------------------------------------------------------------------
+
     def test_move_grain_rebuild(self):
         '''
         Try to move a grain by deconstruction and rebuild with Grain.move_grain_rebuild().
@@ -568,6 +1372,55 @@ class TestGrain(unittest.TestCase):
         margin_center = 0.03*10 #10 is the radius see line upper
         #check if the center computed is near the analytical one
         self.assertTrue(np.linalg.norm(np.array([np.mean(dict_sample['x_L'])+5,np.mean(dict_sample['y_L'])])-grain.center)<margin_center,'The displacement of the grain seems false after the etai_M rebuild (because of the Monte Carlo Method try to rerun or increase the margin)...')
+        #the work arrays are not saved in the sample dictionnary
+        self.assertTrue(not any([isinstance(value, np.ndarray) and value.size > 1000 for key, value in dict_sample.items() if 'buffer' in key]),'A work array is saved in the sample dictionnary!')
+        #the window has been enlarged in advance, the next move is done in place
+        window_M = grain.etai_window_M
+        grain.move_grain_interpolation(np.array([0.5,0]),dict_sample)
+        self.assertTrue(np.shares_memory(grain.etai_window_M, window_M),'The window is not updated in place!')
+
+    #---------------------------------------------------------------------------
+
+    def test_Shift_Field(self):
+        '''
+        Try to translate a field with Owntools.Shift_Field().
+
+        The remainder of the shift is close to 1 and the field is small, the interpolation must not lose precision.
+
+            Output :
+                The result depends on the fact if the field is well translated or not (a bool)
+        '''
+        field_M = np.array([1e-300, 3e-300, 2e-300, 0])
+        shift = 1-1e-16
+        remainder = shift - math.floor(shift)
+        field_ref_M = np.array([(1-remainder)*field_M[0], (1-remainder)*field_M[1]+remainder*field_M[0], (1-remainder)*field_M[2]+remainder*field_M[1], remainder*field_M[2]])
+        Owntools.Shift_Field(field_M, shift, 0, np.empty(4))
+        self.assertTrue(np.allclose(field_M[1:],field_ref_M[1:],rtol=1e-12,atol=0),'The field is not well translated!')
+        self.assertTrue(abs(np.sum(field_M)-6e-300)<1e-12*6e-300,'The mass is not conserved!')
+
+    #---------------------------------------------------------------------------
+
+    def test_move_grain_interpolation_2D(self):
+        '''
+        Try to move a grain along x and y by interpolation with Grain.move_grain_interpolation().
+
+        The phase field moved is compared with the phase field built at the new position, and the mass must be conserved.
+
+            Output :
+                The result depends on the fact if the grain is well moved or not (a bool)
+        '''
+        #Acquire data
+        dict_algorithm, dict_material, dict_sample, dict_sollicitation = User.All_parameters()
+        #Create two grains, the second is at the final position of the first
+        displacement = np.array([-3.7,2.4])
+        grain = Grain.Grain(0,30,np.array([np.mean(dict_sample['x_L']),np.mean(dict_sample['y_L'])]),dict_material,dict_sample)
+        grain_ref = Grain.Grain(1,30,np.array([np.mean(dict_sample['x_L']),np.mean(dict_sample['y_L'])])+displacement,dict_material,dict_sample)
+        mass_init = np.sum(grain.expand_etai_M())
+        #try to move the grain
+        grain.move_grain_interpolation(displacement,dict_sample)
+        #check the mass conservation and the new phase field
+        self.assertTrue(abs(np.sum(grain.expand_etai_M())-mass_init)<1e-9*mass_init,'The mass is not conserved by the interpolation!')
+        self.assertTrue(np.max(np.abs(grain.expand_etai_M()-grain_ref.expand_etai_M()))<0.1,'The phase field has not been well moved!')
 
     #---------------------------------------------------------------------------
 